@@ -0,0 +1,122 @@
+"""
+Download History Benchmark on a Synthetic Task Database
+Fills a TaskStorage with N finished tasks whose `track.raw_metadata` looks like a yt-dlp info dict (a list of
+formats with long signed URLs and headers), then reports database size and history latencies for plain
+payloads, after `compact` (raw metadata projected + VACUUM), with the zlib payload codec, and for the default
+storage, which projects raw metadata as rows are saved.
+
+Usage: python benchmarks/bench_history.py [--rows 100000] [--formats 24] [--repeat 20]
+"""
+
+import argparse
+import random
+import statistics
+import string
+import tempfile
+import time
+from pathlib import Path
+
+from groovegrab.core.models import DownloadOptions, DownloadStatus, DownloadTask, TrackInfo
+from groovegrab.queue.storage import TaskStorage
+
+BATCH_ROWS = 2000
+
+
+def fake_info_dict(rng: random.Random, video_id: str, formats: int) -> dict:
+    def token(n: int) -> str:
+        return "".join(rng.choices(string.ascii_letters + string.digits + "-_", k=n))
+
+    return {
+        "id": video_id,
+        "title": f"Video {video_id}",
+        "channel": "Some Channel",
+        "description": " ".join(rng.choices(["music", "official", "video", "lyrics", "live", "remix"], k=60)),
+        "tags": rng.choices(["pop", "rock", "indie", "2024", "hd", "audio"], k=12),
+        "thumbnails": [{"url": f"https://i.ytimg.com/vi/{video_id}/{i}.jpg", "width": 120 * i} for i in range(1, 9)],
+        "formats": [
+            {
+                "format_id": str(200 + i),
+                "ext": rng.choice(["webm", "m4a", "mp4"]),
+                "abr": rng.choice([48, 70, 128, 160]),
+                "filesize": rng.randint(10**6, 10**7),
+                "url": f"https://rr{i}---sn-{token(8)}.googlevideo.com/videoplayback?expire=1767225600&ei={token(24)}"
+                       f"&id=o-{token(43)}&itag={200 + i}&source=youtube&sig={token(88)}",
+                "http_headers": {"User-Agent": "Mozilla/5.0", "Accept": "*/*", "Accept-Language": "en-us,en;q=0.5"},
+            }
+            for i in range(formats)
+        ],
+    }
+
+
+def fill(storage: TaskStorage, rows: int, formats: int, seed: int = 7):
+    rng = random.Random(seed)
+    options = DownloadOptions(output_dir="/music/GrooveGrab")
+    batch = []
+    for i in range(rows):
+        video_id = f"v{i:010d}"
+        batch.append(DownloadTask(
+            id=f"task-{i:08d}",
+            track=TrackInfo(
+                title=f"Song {i}", artist=f"Artist {i % 997}", provider_name="YouTube",
+                webpage_url=f"https://www.youtube.com/watch?v={video_id}",
+                raw_metadata=fake_info_dict(rng, video_id, formats),
+            ),
+            options=options,
+            status=DownloadStatus.COMPLETED if i % 10 else DownloadStatus.FAILED,
+            output_path=f"/music/GrooveGrab/Artist {i % 997} - Song {i}.mp3",
+        ))
+        if len(batch) == BATCH_ROWS:
+            storage.save_tasks(batch)
+            batch = []
+    if batch:
+        storage.save_tasks(batch)
+
+
+def latency_ms(fn, repeat: int) -> float:
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def measure(label: str, storage: TaskStorage, repeat: int):
+    list_ms = latency_ms(lambda: storage.list_tasks(50), repeat)
+    rows_ms = latency_ms(lambda: storage.query_rows(limit=50), repeat)
+    print(f"{label:<34} {storage.size_bytes() / 2**20:>10.1f} MiB {list_ms:>12.2f} ms {rows_ms:>14.2f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--formats", type=int, default=24, help="yt-dlp formats per fake info dict")
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    print(f"{args.rows} tasks, {args.formats} formats per raw_metadata\n")
+    print(f"{'':<34} {'db + wal':>14} {'list_tasks(50)':>15} {'query_rows(50)':>17}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for compress in (False, True):
+            codec = "zlib" if compress else "plain"
+            storage = TaskStorage(Path(tmp) / f"{codec}.db", compress=compress, keep_raw_metadata=True)
+            start = time.perf_counter()
+            fill(storage, args.rows, args.formats)
+            fill_sec = time.perf_counter() - start
+            measure(f"{codec}: full payloads", storage, args.repeat)
+
+            start = time.perf_counter()
+            result = storage.compact()
+            compact_sec = time.perf_counter() - start
+            measure(f"{codec}: after compact", storage, args.repeat)
+            print(f"{'':<34} (fill {fill_sec:.1f} s, compact {compact_sec:.1f} s, {result.slimmed} rows slimmed)\n")
+
+        storage = TaskStorage(Path(tmp) / "projected.db", compress=False, keep_raw_metadata=False)
+        start = time.perf_counter()
+        fill(storage, args.rows, args.formats)
+        measure("plain: projected at save", storage, args.repeat)
+        print(f"{'':<34} (fill {time.perf_counter() - start:.1f} s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+"""
+LrcParser Benchmark on a Synthetic Corpus of .lrc Files
+Generates N files (plain and enhanced LRC, with metadata tags and repeated timestamps), then times
+parse_file() over the whole corpus against the previous regex-based implementation.
+
+Usage: python benchmarks/bench_lrc_parser.py [--files 3000] [--lines 70]
+"""
+
+import argparse
+import random
+import re
+import tempfile
+import time
+from pathlib import Path
+from typing import List
+
+from groovegrab.player.lrc_parser import LrcLine, LrcParser
+
+WORDS = "love night light heart fire baby dance forever dream tonight falling rain city stars".split()
+
+
+class LegacyRegexLrcParser:
+    """The pre-single-pass implementation: two scans, three regexes per line, a pydantic model per timestamp."""
+
+    TIMESTAMP_REGEX = re.compile(r'\[(\d{1,2}):(\d{2})(?:\.(\d{2,3}))?\]')
+    OFFSET_REGEX = re.compile(r'\[offset:\s*([+-]?\d+)\s*\]', re.IGNORECASE)
+    METADATA_TAG_REGEX = re.compile(r'\[[a-zA-Z]{1,8}:.*?\]')
+
+    def parse_text(self, text: str) -> List[LrcLine]:
+        raw_lines = text.splitlines()
+        parsed: List[LrcLine] = []
+        offset = 0.0
+        for line in raw_lines:
+            match = self.OFFSET_REGEX.search(line)
+            if match:
+                offset = float(match.group(1)) / 1000.0
+        for line in raw_lines:
+            line_str = line.strip()
+            if not line_str:
+                continue
+            matches = list(self.TIMESTAMP_REGEX.finditer(line_str))
+            if not matches:
+                continue
+            clean_text = self.TIMESTAMP_REGEX.sub('', line_str)
+            clean_text = self.METADATA_TAG_REGEX.sub('', clean_text).strip()
+            if not clean_text:
+                continue
+            for match in matches:
+                frac_str = match.group(3) or "0"
+                frac = int(frac_str) / (100.0 if len(frac_str) == 2 else 1000.0) if len(frac_str) in (2, 3) else 0.0
+                total = max(0.0, int(match.group(1)) * 60.0 + int(match.group(2)) + frac + offset)
+                parsed.append(LrcLine(timestamp_sec=total, text=clean_text))
+        parsed.sort(key=lambda x: x.timestamp_sec)
+        unique: List[LrcLine] = []
+        for line in parsed:
+            if not unique or abs(line.timestamp_sec - unique[-1].timestamp_sec) > 0.05 or line.text != unique[-1].text:
+                unique.append(line)
+        for i in range(len(unique)):
+            unique[i].end_sec = unique[i + 1].timestamp_sec if i + 1 < len(unique) else unique[i].timestamp_sec + 5.0
+        return unique
+
+
+def _stamp(sec: float, bracket: str = "[]") -> str:
+    return f"{bracket[0]}{int(sec) // 60:02d}:{sec % 60:05.2f}{bracket[1]}"
+
+
+def make_lrc(rng: random.Random, num_lines: int, enhanced: bool) -> str:
+    out = ["[ar:Synthetic Artist]", "[ti:Synthetic Title]", "[al:Bench]", "[by:groovegrab]", "[offset:+120]"]
+    t = rng.uniform(5.0, 15.0)
+    for i in range(num_lines):
+        words = rng.choices(WORDS, k=rng.randint(4, 9))
+        if enhanced:
+            wt, body = t, []
+            for w in words:
+                body.append(f"{_stamp(wt, '<>')}{w} ")
+                wt += rng.uniform(0.2, 0.5)
+            text = "".join(body) + _stamp(wt, "<>")
+        else:
+            text = " ".join(words)
+        stamps = _stamp(t)
+        if i % 17 == 0:
+            stamps += _stamp(t + 60.0)  # repeated chorus line
+        out.append(stamps + text)
+        t += rng.uniform(2.0, 5.0)
+    return "\n".join(out) + "\n"
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--files", type=int, default=3000)
+    ap.add_argument("--lines", type=int, default=70)
+    ap.add_argument("--seed", type=int, default=1234)
+    args = ap.parse_args()
+
+    rng = random.Random(args.seed)
+    with tempfile.TemporaryDirectory(prefix="gg-lrc-bench-") as tmp:
+        corpus = []
+        for i in range(args.files):
+            path = Path(tmp) / f"track_{i:05d}.lrc"
+            path.write_text(make_lrc(rng, args.lines, enhanced=(i % 4 == 0)), encoding="utf-8")
+            corpus.append(path)
+        texts = [p.read_text(encoding="utf-8") for p in corpus]
+        total_mb = sum(len(t) for t in texts) / 1e6
+        print(f"corpus: {len(corpus)} files, {total_mb:.1f} MB, {args.lines} lines/file (25% enhanced)")
+
+        parser, legacy = LrcParser(), LegacyRegexLrcParser()
+        for label, fn in (
+            ("legacy regex + pydantic", lambda: [legacy.parse_text(t) for t in texts]),
+            ("single-pass records", lambda: [parser.parse_text(t) for t in texts]),
+            ("single-pass + to_models", lambda: [LrcParser.to_models(parser.parse_text(t)) for t in texts]),
+            ("parse_file (incl. I/O)", lambda: [parser.parse_file(p) for p in corpus]),
+        ):
+            best = float("inf")
+            for _ in range(3):
+                started = time.perf_counter()
+                fn()
+                best = min(best, time.perf_counter() - started)
+            print(f"  {label:<26} {best * 1000:8.1f} ms total  {best / len(texts) * 1e6:8.1f} us/file  {total_mb / best:6.1f} MB/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,3 @@
+"""
+GrooveGrab Benchmark Harnesses
+"""
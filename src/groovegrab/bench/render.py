@@ -0,0 +1,250 @@
+"""
+Headless Render Benchmark Harness
+Drives AudioSpectrumVisualizer.render and TerminalPlayer._build_screen over a synthetic track for every
+visualizer mode, theme and terminal size without a TTY, reporting p50/p99 frame time, allocations and output bytes.
+"""
+
+import io
+import json
+import os
+import random
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+from pydantic import BaseModel
+from rich.console import Console
+
+from groovegrab.core.models import AudioEngine, TrackInfo
+from groovegrab.player.lrc_parser import LrcLineRecord
+from groovegrab.player.lyric_timeline import LyricTimeline
+from groovegrab.player.particles import ParticleSystem
+from groovegrab.player.terminal_player import FRAME_INTERVAL, TerminalPlayer
+from groovegrab.player.themes import THEME_ORDER
+from groovegrab.player.visualizer import VISUALIZER_MODES, VisualizerMode
+
+SAMPLE_RATE = 22050
+TRACK_DURATION_SEC = 30.0
+
+TARGETS = ("visualizer", "screen")
+DEFAULT_SIZES: List[Tuple[int, int]] = [(80, 24), (120, 40), (200, 60)]
+
+# A case regresses when p50 > baseline * TIME_TOLERANCE + TIME_SLACK_MS (the slack absorbs scheduler noise on
+# millisecond-scale cases); the summed p50 of a whole run must also stay within TIME_TOLERANCE of the baseline sum.
+TIME_TOLERANCE = float(os.environ.get("GROOVEGRAB_BENCH_TIME_TOLERANCE", "3.0"))
+TIME_SLACK_MS = 5.0
+BYTES_TOLERANCE = 1.10
+
+
+class RenderBenchResult(BaseModel):
+    target: str
+    mode: str
+    theme: str
+    width: int
+    height: int
+    frames: int
+    p50_ms: float
+    p99_ms: float
+    alloc_peak_kib: float
+    output_bytes: float
+
+    @property
+    def key(self) -> str:
+        return f"{self.target}/{self.mode}/{self.theme}/{self.width}x{self.height}"
+
+
+def synthetic_pcm(duration_sec: float = TRACK_DURATION_SEC, sample_rate: int = SAMPLE_RATE, seed: int = 0) -> np.ndarray:
+    """Deterministic mono 'song': 128 BPM kick, bass line, a chord pad and a little noise."""
+    rng = np.random.default_rng(seed)
+    t = np.arange(int(duration_sec * sample_rate), dtype=np.float32) / sample_rate
+    beat = (t * (128.0 / 60.0)) % 1.0
+    kick = np.sin(2 * np.pi * 55.0 * t) * np.exp(-beat * 9.0)
+    bass = 0.35 * np.sin(2 * np.pi * (82.4 + 27.5 * (np.floor(t / 1.875) % 3)) * t)
+    pad = 0.15 * sum(np.sin(2 * np.pi * f * t) for f in (261.6, 329.6, 392.0, 523.3))
+    noise = 0.03 * rng.standard_normal(len(t))
+    pcm = 0.45 * kick + bass + pad + noise
+    return (pcm / np.max(np.abs(pcm)) * 0.8).astype(np.float32)
+
+
+def synthetic_lyrics(duration_sec: float = TRACK_DURATION_SEC, interval_sec: float = 2.5) -> List[LrcLineRecord]:
+    words = "never gonna stop the groove tonight under neon city lights we keep on moving".split()
+    lines: List[LrcLineRecord] = []
+    ts = 1.0
+    idx = 0
+    while ts < duration_sec:
+        text = " ".join(words[(idx + k) % len(words)] for k in range(4 + idx % 4))
+        lines.append(LrcLineRecord(ts, text, end_sec=ts + interval_sec))
+        ts += interval_sec
+        idx += 1
+    return lines
+
+
+def make_headless_player(
+    theme: str,
+    mode: VisualizerMode,
+    pcm: np.ndarray,
+    lyrics: Sequence[LrcLineRecord],
+) -> TerminalPlayer:
+    """A TerminalPlayer with a synthetic track loaded in memory: nothing is decoded, fetched or played."""
+    player = TerminalPlayer(theme_name=theme, initial_mode=mode, audio_engine=AudioEngine.EXTERNAL)
+    player.track_info = TrackInfo(title="Synthetic Benchmark Track", artist="GrooveGrab", duration=int(len(pcm) / SAMPLE_RATE))
+    player.lyrics = list(lyrics)
+    player.timeline = LyricTimeline(player.lyrics, player.typewriter)
+
+    engine = player.visualizer.engine
+    engine.pcm_data = pcm
+    engine.sample_rate = SAMPLE_RATE
+    engine.audio_loaded = True
+    player.visualizer.particles = ParticleSystem(capacity=player.visualizer.particles.capacity, seed=0)
+    # The benchmark console is truecolor; pin the gradient choice so results do not depend on the host terminal
+    player.visualizer.truecolor = True
+    return player
+
+
+def _percentile(samples: List[float], q: float) -> float:
+    return float(np.percentile(np.asarray(samples), q)) if samples else 0.0
+
+
+def _bench_case(
+    target: str,
+    mode: VisualizerMode,
+    theme: str,
+    width: int,
+    height: int,
+    frames: int,
+    warmup: int,
+    pcm: np.ndarray,
+    lyrics: Sequence[LrcLineRecord],
+    track_alloc: bool,
+) -> RenderBenchResult:
+    random.seed(0)
+    player = make_headless_player(theme, mode, pcm, lyrics)
+    sink = io.StringIO()
+    console = Console(
+        file=sink, width=width, height=height, force_terminal=True,
+        color_system="truecolor", legacy_windows=False, _environ={},
+    )
+
+    def frame(idx: int) -> int:
+        current_time = 0.5 + idx * FRAME_INTERVAL
+        if target == "screen":
+            renderable = player._build_screen(current_time, width=width, height=height, frame_dt=FRAME_INTERVAL)
+        else:
+            renderable = player.visualizer.render(
+                current_time_sec=current_time, width=width, height=height, mode=mode,
+                theme_name=theme, is_playing=True, frame_dt=FRAME_INTERVAL,
+            )
+        sink.seek(0)
+        sink.truncate(0)
+        console.print(renderable, end="")
+        return len(sink.getvalue().encode("utf-8"))
+
+    for idx in range(warmup):
+        frame(idx)
+
+    times_ms: List[float] = []
+    output_bytes: List[int] = []
+    for idx in range(warmup, warmup + frames):
+        start = time.perf_counter_ns()
+        output_bytes.append(frame(idx))
+        times_ms.append((time.perf_counter_ns() - start) / 1e6)
+
+    # Allocation pass is separate: tracemalloc would inflate the timings above
+    alloc_peaks: List[float] = []
+    if track_alloc:
+        tracemalloc.start()
+        try:
+            for idx in range(warmup + frames, warmup + 2 * frames):
+                baseline, _ = tracemalloc.get_traced_memory()
+                tracemalloc.reset_peak()
+                frame(idx)
+                alloc_peaks.append((tracemalloc.get_traced_memory()[1] - baseline) / 1024.0)
+        finally:
+            tracemalloc.stop()
+
+    return RenderBenchResult(
+        target=target,
+        mode=mode.value,
+        theme=theme,
+        width=width,
+        height=height,
+        frames=frames,
+        p50_ms=round(_percentile(times_ms, 50), 3),
+        p99_ms=round(_percentile(times_ms, 99), 3),
+        alloc_peak_kib=round(float(np.mean(alloc_peaks)) if alloc_peaks else 0.0, 1),
+        output_bytes=round(float(np.mean(output_bytes)), 1),
+    )
+
+
+def run_render_bench(
+    modes: Optional[Iterable[VisualizerMode]] = None,
+    themes: Optional[Iterable[str]] = None,
+    sizes: Optional[Iterable[Tuple[int, int]]] = None,
+    targets: Iterable[str] = TARGETS,
+    frames: int = 120,
+    warmup: int = 10,
+    track_alloc: bool = True,
+) -> List[RenderBenchResult]:
+    pcm = synthetic_pcm()
+    lyrics = synthetic_lyrics()
+    results: List[RenderBenchResult] = []
+    for target in targets:
+        for mode in (modes or VISUALIZER_MODES):
+            for theme in (themes or THEME_ORDER):
+                for width, height in (sizes or DEFAULT_SIZES):
+                    results.append(
+                        _bench_case(target, mode, theme, width, height, frames, warmup, pcm, lyrics, track_alloc)
+                    )
+    return results
+
+
+def parse_size(value: str) -> Tuple[int, int]:
+    """`120x40` -> (120, 40)."""
+    width, _, height = value.lower().partition("x")
+    return int(width), int(height)
+
+
+def load_baseline(path: Path) -> Dict[str, RenderBenchResult]:
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    results = [RenderBenchResult.model_validate(item) for item in data.get("results", [])]
+    return {r.key: r for r in results}
+
+
+def write_baseline(results: Sequence[RenderBenchResult], path: Path) -> None:
+    """Merge `results` into the baseline file at `path` (cases with the same key are replaced)."""
+    merged = load_baseline(path) if path.exists() else {}
+    merged.update({r.key: r for r in results})
+    path.parent.mkdir(parents=True, exist_ok=True)
+    payload = {"results": [merged[key].model_dump() for key in sorted(merged)]}
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(payload, f, indent=1)
+        f.write("\n")
+
+
+def find_regressions(
+    results: Sequence[RenderBenchResult],
+    baseline: Dict[str, RenderBenchResult],
+    time_tolerance: float = TIME_TOLERANCE,
+    bytes_tolerance: float = BYTES_TOLERANCE,
+) -> List[str]:
+    """Human-readable regressions of `results` against `baseline` (cases missing from the baseline are skipped)."""
+    regressions: List[str] = []
+    total_ms = total_base_ms = 0.0
+    for result in results:
+        base = baseline.get(result.key)
+        if base is None:
+            continue
+        total_ms += result.p50_ms
+        total_base_ms += base.p50_ms
+        time_limit = base.p50_ms * time_tolerance + TIME_SLACK_MS
+        if result.p50_ms > time_limit:
+            regressions.append(f"{result.key}: p50 {result.p50_ms:.2f} ms > {time_limit:.2f} ms (baseline {base.p50_ms:.2f} ms)")
+        bytes_limit = base.output_bytes * bytes_tolerance
+        if result.output_bytes > bytes_limit:
+            regressions.append(f"{result.key}: {result.output_bytes:.0f} B/frame > {bytes_limit:.0f} B (baseline {base.output_bytes:.0f} B)")
+    if total_base_ms > 0 and total_ms > total_base_ms * time_tolerance:
+        regressions.append(f"total: p50 sum {total_ms:.1f} ms > {total_base_ms * time_tolerance:.1f} ms (baseline {total_base_ms:.1f} ms)")
+    return regressions
@@ -0,0 +1,79 @@
+"""
+Benchmark Subcommand Handler (`groovegrab bench`)
+Headless performance harnesses; nothing here needs a TTY or audio output.
+"""
+
+from pathlib import Path
+from typing import List, Optional
+import typer
+from rich.console import Console
+from rich.table import Table
+
+from groovegrab.bench.render import (
+    DEFAULT_SIZES, TARGETS, find_regressions, load_baseline, parse_size, run_render_bench, write_baseline,
+)
+from groovegrab.player.themes import THEME_ORDER
+from groovegrab.player.visualizer import VISUALIZER_MODES, VisualizerMode
+from groovegrab.ui.banner import print_error, print_success, print_info
+
+console = Console()
+app = typer.Typer(help="Run headless performance benchmarks")
+
+
+@app.command("render")
+def render_command(
+    mode: Optional[List[str]] = typer.Option(None, "--mode", "-m", help="Visualizer mode(s) to measure (default: all)"),
+    theme: Optional[List[str]] = typer.Option(None, "--theme", "-t", help="Theme(s) to measure (default: all)"),
+    size: Optional[List[str]] = typer.Option(None, "--size", "-s", help="Terminal size(s) as WIDTHxHEIGHT (default: 80x24, 120x40, 200x60)"),
+    target: Optional[List[str]] = typer.Option(None, "--target", help="What to render per frame: visualizer, screen (default: both)"),
+    frames: int = typer.Option(120, "--frames", "-n", min=1, help="Measured frames per case"),
+    warmup: int = typer.Option(10, "--warmup", min=0, help="Unmeasured warm-up frames per case"),
+    no_alloc: bool = typer.Option(False, "--no-alloc", help="Skip the tracemalloc allocation pass"),
+    baseline: Optional[Path] = typer.Option(None, "--baseline", help="Compare against a baseline file and exit 1 on regressions"),
+    save_baseline: Optional[Path] = typer.Option(None, "--save-baseline", help="Merge these results into a baseline file"),
+):
+    """Measure per-frame render cost of the visualizer and full player screen for a synthetic track."""
+    try:
+        modes = [VisualizerMode(m.lower()) for m in mode] if mode else VISUALIZER_MODES
+        sizes = [parse_size(s) for s in size] if size else DEFAULT_SIZES
+    except ValueError as e:
+        print_error(f"Invalid benchmark option: {e}")
+        raise typer.Exit(1)
+    themes = [t.lower() for t in theme] if theme else THEME_ORDER
+    unknown = [t for t in themes if t not in THEME_ORDER]
+    targets = [t.lower() for t in target] if target else list(TARGETS)
+    unknown += [t for t in targets if t not in TARGETS]
+    if unknown:
+        print_error(f"Unknown theme/target: {', '.join(unknown)}")
+        raise typer.Exit(1)
+
+    print_info(f"Rendering {len(targets) * len(modes) * len(themes) * len(sizes)} cases x {frames} frames...")
+    results = run_render_bench(modes, themes, sizes, targets, frames=frames, warmup=warmup, track_alloc=not no_alloc)
+
+    table = Table(title="Headless Render Benchmark", header_style="bold magenta")
+    table.add_column("Target", style="cyan")
+    table.add_column("Mode", style="cyan")
+    table.add_column("Theme", style="green")
+    table.add_column("Size", style="white")
+    table.add_column("p50 ms", justify="right", style="bold white")
+    table.add_column("p99 ms", justify="right")
+    table.add_column("Alloc KiB", justify="right")
+    table.add_column("Bytes/frame", justify="right")
+    for r in results:
+        table.add_row(
+            r.target, r.mode, r.theme, f"{r.width}x{r.height}",
+            f"{r.p50_ms:.2f}", f"{r.p99_ms:.2f}", f"{r.alloc_peak_kib:.0f}", f"{r.output_bytes:.0f}",
+        )
+    console.print(table)
+
+    if save_baseline:
+        write_baseline(results, save_baseline)
+        print_success(f"Baseline saved to {save_baseline}")
+
+    if baseline:
+        regressions = find_regressions(results, load_baseline(baseline))
+        if regressions:
+            for line in regressions:
+                print_error(line)
+            raise typer.Exit(1)
+        print_success("No render regressions against baseline.")
@@ -9,7 +9,7 @@ from rich.console import Console
 from rich.table import Table
 
 from groovegrab.core.config import ConfigManager, GrooveGrabConfig
-from groovegrab.core.models import AudioFormat, AudioBitrate
+from groovegrab.core.models import AudioEngine, AudioFormat, AudioBitrate
 from groovegrab.ui.banner import print_success, print_info
 
 console = Console()
@@ -117,8 +117,14 @@ def config_command(
     concurrent: Optional[int] = typer.Option(
         None, "--concurrent", "-c", min=1, max=16, help="Set concurrent download limit"
     ),
+    engine: Optional[AudioEngine] = typer.Option(None, "--engine", "-e", help="Set playback engine (auto, pcm, external)"),
     lyrics: Optional[bool] = typer.Option(None, "--lyrics/--no-lyrics", help="Enable or disable fetching synced lyrics (.lrc)"),
     cover: Optional[bool] = typer.Option(None, "--cover/--no-cover", help="Enable or disable embedding cover artwork"),
+    history_compression: Optional[bool] = typer.Option(None, "--history-compression/--no-history-compression", help="Store download history payloads zlib-compressed"),
+    history_max_age: Optional[int] = typer.Option(None, "--history-max-age", min=1, help="Days of finished history `queue compact` keeps"),
+    history_max_rows: Optional[int] = typer.Option(None, "--history-max-rows", min=1, help="History rows `queue compact` keeps"),
+    keep_raw_metadata: Optional[bool] = typer.Option(None, "--keep-raw-metadata/--no-keep-raw-metadata", help="Keep whole provider payloads on tracks and in history rows (debugging)"),
+    unavailable_ttl: Optional[int] = typer.Option(None, "--unavailable-ttl", min=0, help="Days a permanently unavailable source is skipped without retrying (0: always retry)"),
     interactive: bool = typer.Option(False, "--interactive", "-i", help="Run interactive configuration setup wizard"),
 ):
     """View or update user configuration settings."""
@@ -146,12 +152,30 @@ def config_command(
     if concurrent:
         cfg.concurrent_downloads = concurrent
         updated = True
+    if engine:
+        cfg.audio_engine = engine
+        updated = True
     if lyrics is not None:
         cfg.fetch_lyrics = lyrics
         updated = True
     if cover is not None:
         cfg.embed_cover = cover
         updated = True
+    if history_compression is not None:
+        cfg.history_compression = history_compression
+        updated = True
+    if history_max_age:
+        cfg.history_max_age_days = history_max_age
+        updated = True
+    if history_max_rows:
+        cfg.history_max_rows = history_max_rows
+        updated = True
+    if keep_raw_metadata is not None:
+        cfg.keep_raw_metadata = keep_raw_metadata
+        updated = True
+    if unavailable_ttl is not None:
+        cfg.unavailable_ttl_days = unavailable_ttl
+        updated = True
 
     if updated:
         config_mgr.save_config(cfg)
@@ -166,9 +190,25 @@ def config_command(
         table.add_row("Audio Format", cfg.audio_format.value)
         table.add_row("Audio Bitrate", cfg.audio_bitrate.value)
         table.add_row("Player Theme", cfg.player_theme)
+        table.add_row("Playback Engine", cfg.audio_engine.value)
         table.add_row("Fetch Lyrics (.lrc)", str(cfg.fetch_lyrics))
         table.add_row("Embed Cover Art", str(cfg.embed_cover))
         table.add_row("Concurrent Downloads", str(cfg.concurrent_downloads))
+        table.add_row("History Compression", str(cfg.history_compression))
+        table.add_row("History Retention", " / ".join(filter(None, [
+            f"{cfg.history_max_age_days} days" if cfg.history_max_age_days else None,
+            f"{cfg.history_max_rows} rows" if cfg.history_max_rows else None,
+        ])) or "keep everything")
+        table.add_row("Keep Raw Provider Metadata", str(cfg.keep_raw_metadata))
+        table.add_row("Unavailable Source Memo", f"{cfg.unavailable_ttl_days} days" if cfg.unavailable_ttl_days else "off")
 
         console.print(table)
         print_info("Run [bold cyan]groovegrab setup[/bold cyan] to change settings interactively.\n")
+
+
+def setup_command():
+    """Run the interactive configuration setup wizard."""
+    config_mgr = ConfigManager()
+    cfg = run_interactive_wizard(config_mgr.get())
+    config_mgr.save_config(cfg)
+    print_success("Saved new configuration!")
@@ -2,6 +2,7 @@
 Download Subcommand Handler (`groovegrab get`)
 """
 
+import asyncio
 import re
 from pathlib import Path
 from typing import Optional
@@ -10,7 +11,8 @@ from rich.console import Console
 
 from groovegrab.core.config import ConfigManager
 from groovegrab.core.models import DownloadOptions, AudioFormat, AudioBitrate, PlaylistInfo, TrackInfo
-from groovegrab.providers.registry import ProviderRegistry
+from groovegrab.cli.factories import configured_queue_manager, configured_registry
+from groovegrab.queue.async_queue import AsyncTaskQueueManager
 from groovegrab.queue.task_queue import TaskQueueManager
 from groovegrab.engines.ffmpeg_converter import FfmpegHelper
 from groovegrab.ui.dashboard import PlaylistProgressDashboard, print_tasks_summary
@@ -33,6 +35,7 @@ def download_command(
     audio_bitrate: Optional[AudioBitrate] = typer.Option(None, "--bitrate", "-b", help="Audio bitrate quality (320k, 256k, 192k)"),
     no_cover: bool = typer.Option(False, "--no-cover", help="Disable embedding cover art"),
     no_lyrics: bool = typer.Option(False, "--no-lyrics", help="Disable fetching synced lyrics"),
+    use_asyncio: bool = typer.Option(False, "--asyncio", help="Run on the asyncio engine (lyrics & covers fetched concurrently, downloads still limited)"),
 ):
     """Download songs, albums, or playlists from any supported provider URL or query."""
     config_mgr = ConfigManager()
@@ -47,7 +50,7 @@ def download_command(
         concurrent_downloads=cfg.concurrent_downloads
     )
 
-    registry = ProviderRegistry()
+    registry = configured_registry(cfg)
     ffmpeg_available, ffmpeg_message = FfmpegHelper.get_ffmpeg_version()
     if not ffmpeg_available:
         print_error(f"FFmpeg is required for audio conversion. {ffmpeg_message}")
@@ -77,14 +80,25 @@ def download_command(
 
     console.print(f"\n[bold yellow]Downloading {len(tracks)} track(s) to:[/bold yellow] [bold white]{options.output_dir}[/bold white]\n")
 
-    dashboard = PlaylistProgressDashboard(total_tracks=len(tracks))
-    queue_mgr = TaskQueueManager()
+    queue_mgr = configured_queue_manager(cfg, manager_class=AsyncTaskQueueManager if use_asyncio else TaskQueueManager)
+    batch_title = resolved.title if isinstance(resolved, PlaylistInfo) else resolved.display_name()
+    batch_id = queue_mgr.storage.create_batch(batch_title, source=query_or_url)
+    print_info(f"Batch [bold]{batch_id[:8]}[/bold] (continue an interrupted run with [bold]groovegrab queue resume[/bold])")
 
+    # Enqueued unleased and drained through the shared queue: concurrent `dl` runs and `groovegrab worker`
+    # processes split the batch between them, and a song another run is already fetching is waited for, not refetched
+    queue_mgr.create_tasks(tracks, options, batch_id=batch_id, leased=False)
+    dashboard = PlaylistProgressDashboard(total_tracks=len(tracks))
     try:
-        tasks = queue_mgr.process_tracks(tracks, options, on_progress=dashboard.update_task)
+        if use_asyncio:
+            tasks = asyncio.run(queue_mgr.drain_async(options.concurrent_downloads, batch_id=batch_id, on_progress=dashboard.update_task))
+        else:
+            tasks = queue_mgr.drain(options.concurrent_downloads, batch_id=batch_id, on_progress=dashboard.update_task)
     finally:
         dashboard.close()
 
     print_tasks_summary(tasks)
+    if len(tasks) < len(tracks):
+        print_info(f"{len(tracks) - len(tasks)} track(s) of this batch were handled by other workers.")
     if any(task.status.value == "failed" for task in tasks):
         raise typer.Exit(1)
@@ -0,0 +1,40 @@
+"""
+Configured Engine Factories for CLI Commands
+Storage, queue managers and the provider registry take their settings as constructor arguments (so library code
+and tests never read the user's config file); commands build them from the configuration here.
+"""
+
+from typing import Optional, Type, TypeVar
+
+from groovegrab.core.config import ConfigManager, GrooveGrabConfig
+from groovegrab.providers.registry import ProviderRegistry
+from groovegrab.queue.storage import TaskStorage
+from groovegrab.queue.task_queue import TaskQueueManager
+
+Manager = TypeVar("Manager", bound=TaskQueueManager)
+
+
+def _config(cfg: Optional[GrooveGrabConfig]) -> GrooveGrabConfig:
+    return cfg or ConfigManager().get()
+
+
+def configured_storage(cfg: Optional[GrooveGrabConfig] = None) -> TaskStorage:
+    cfg = _config(cfg)
+    return TaskStorage(compress=cfg.history_compression, keep_raw_metadata=cfg.keep_raw_metadata)
+
+
+def configured_queue_manager(
+    cfg: Optional[GrooveGrabConfig] = None,
+    storage: Optional[TaskStorage] = None,
+    manager_class: Type[Manager] = TaskQueueManager,
+    **kwargs
+) -> Manager:
+    """A `manager_class` (TaskQueueManager or AsyncTaskQueueManager) on the configured storage and failure memo."""
+    cfg = _config(cfg)
+    return manager_class(
+        storage or configured_storage(cfg), unavailable_ttl_days=cfg.unavailable_ttl_days, **kwargs
+    )
+
+
+def configured_registry(cfg: Optional[GrooveGrabConfig] = None) -> ProviderRegistry:
+    return ProviderRegistry(keep_raw_metadata=_config(cfg).keep_raw_metadata)
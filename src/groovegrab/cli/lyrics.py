@@ -7,6 +7,7 @@ import typer
 from rich.console import Console
 
 from groovegrab.core.config import ConfigManager
+from groovegrab.player.live_source import LivePcmSource
 from groovegrab.player.mpris_player import MprisLiveLyricsPlayer
 
 console = Console()
@@ -21,6 +22,9 @@ def lyrics_command(
     theme: Optional[str] = typer.Option(
         None, "--theme", "-t", help="UI Color Theme (cava, cyberpunk, matrix, fire, sunset, ocean, aurora, synthwave, monochrome)"
     ),
+    audio_source: str = typer.Option(
+        "auto", "--audio-source", "-a", help="Visualizer audio: auto / pulse (output monitor via parec), none, or a FIFO path with 44.1 kHz stereo s16le"
+    ),
 ):
     """
     Connect to Spotify or any active Linux media player over MPRIS D-Bus to display live synced lyrics in real time.
@@ -31,6 +35,7 @@ def lyrics_command(
 
     mpris_player = MprisLiveLyricsPlayer(
         player_name=player,
-        theme_name=selected_theme
+        theme_name=selected_theme,
+        live_source=LivePcmSource.from_spec(audio_source)
     )
     mpris_player.start()
@@ -9,51 +9,134 @@ import typer
 from rich.console import Console
 
 from groovegrab.core.config import ConfigManager
-from groovegrab.core.models import TrackInfo, DownloadOptions
-from groovegrab.providers.registry import ProviderRegistry
+from groovegrab.core.models import AudioEngine, TrackInfo, DownloadOptions, PlaylistInfo
 from groovegrab.queue.task_queue import TaskQueueManager
+from groovegrab.queue.progressive import PlaylistDownloadSession, ProgressiveDownload
 from groovegrab.engines.ytdlp_engine import YtDlpEngine
 from groovegrab.engines.mpris_engine import MprisEngine
-from groovegrab.player.terminal_player import TerminalPlayer, PlaylistItem
+from groovegrab.cli.download import sanitize_filename
+from groovegrab.cli.factories import configured_queue_manager, configured_registry
+from groovegrab.library.index import AUDIO_EXTENSIONS, LibraryIndex, LibraryTrack
+from groovegrab.player.pcm_engine import create_audio_engine
+from groovegrab.player.terminal_player import TerminalPlayer
+from groovegrab.player.playlist import LazyPlaylist, PlaylistItem
 from groovegrab.player.mpris_player import MprisLiveLyricsPlayer
+from groovegrab.player.live_source import LivePcmSource
 from groovegrab.player.visualizer import VisualizerMode
-from groovegrab.ui.banner import print_info, print_error
+from groovegrab.ui.banner import print_info, print_error, print_success
 
 console = Console()
 app = typer.Typer(help="Play songs with real-time CAVA audio visualizer and synced lyrics")
 
-AUDIO_EXTENSIONS = {".mp3", ".flac", ".m4a", ".opus", ".wav", ".ogg"}
 
-
-def _build_playlist_from_files(files: List[Path]) -> List[PlaylistItem]:
+def _build_playlist_from_index(tracks: List[LibraryTrack]) -> List[PlaylistItem]:
     playlist: List[PlaylistItem] = []
-    for f in sorted(files):
-        if f.is_file() and f.suffix.lower() in AUDIO_EXTENSIONS:
-            stem = f.stem
-            if " - " in stem:
-                artist, title = stem.split(" - ", 1)
-            else:
-                artist, title = "Local Artist", stem
-            
-            track_info = TrackInfo(title=title.strip(), artist=artist.strip())
-            lrc_path = f.with_suffix(".lrc")
-            playlist.append((f, track_info, lrc_path))
+    for track in tracks:
+        audio_path = Path(track.path)
+        playlist.append((audio_path, track.to_track_info(), audio_path.with_suffix(".lrc")))
     return playlist
 
 
-def _search_local_library(target: str, base_dir: Path) -> List[PlaylistItem]:
+def _search_local_library(target: str, base_dir: Path, index: Optional[LibraryIndex] = None) -> List[PlaylistItem]:
     if not base_dir.exists():
         return []
 
-    clean_target = target.lower().strip()
-    matches: List[Path] = []
+    index = index or LibraryIndex()
+    index.refresh(base_dir)
+    return _build_playlist_from_index(index.search(target, root=base_dir))
+
+
+def _play_progressive(
+    track: TrackInfo,
+    options: DownloadOptions,
+    theme_name: str,
+    viz_mode: VisualizerMode,
+    audio_engine: AudioEngine,
+    queue_mgr: TaskQueueManager,
+) -> bool:
+    """
+    Stream-and-play: start the player on the partially downloaded stream and write the tagged library copy
+    in the background. Returns False when nothing could be streamed (the caller falls back to a full download).
+    """
+    session = ProgressiveDownload(track, options, queue_manager=queue_mgr).start()
+    if not session.wait_ready() or session.stream_path is None:
+        session.wait_finalized()
+        return False
+
+    if not create_audio_engine(audio_engine).supports_growing_files():
+        # paplay / vlc cannot follow a growing file: buffer the whole stream first
+        print_info("Buffering full track (install ffplay or mpv to start playback immediately)...")
+        session.finished.wait()
+
+    player = TerminalPlayer(
+        playlist=[(session.stream_path, track, YtDlpEngine().target_path(track, options, "lrc"))],
+        start_index=0,
+        theme_name=theme_name,
+        initial_mode=viz_mode,
+        growing_files={session.stream_path: session.finished},
+        audio_engine=audio_engine,
+    )
+    player.start()
+
+    if not session.finalized.is_set():
+        print_info("Finishing download & tagging in the background...")
+    session.wait_finalized()
+    if session.output_path:
+        session.cleanup()
+        print_success(f"Saved to {session.output_path}")
+    else:
+        print_error(f"Could not save '{track.display_name()}' to the library: {session.error}")
+    return True
 
-    for f in base_dir.rglob("*"):
-        if f.is_file() and f.suffix.lower() in AUDIO_EXTENSIONS:
-            if clean_target in f.stem.lower():
-                matches.append(f)
 
-    return _build_playlist_from_files(matches)
+def _play_playlist_progressive(
+    playlist_info: PlaylistInfo,
+    options: DownloadOptions,
+    theme_name: str,
+    viz_mode: VisualizerMode,
+    stream: bool,
+    audio_engine: AudioEngine,
+    queue_mgr: TaskQueueManager,
+):
+    """
+    Play an online playlist while it downloads: the first track starts as soon as it is ready and the
+    player's queue grows as the background downloads (in playlist order) complete.
+    """
+    options.output_dir = str(Path(options.output_dir) / (sanitize_filename(playlist_info.title) or "Playlist"))
+    print_info(f"Resolved Playlist: [bold yellow]{playlist_info.title}[/bold yellow] ({len(playlist_info.tracks)} tracks)")
+    print_info("Starting playback as soon as the first track is ready; the rest download in the background...")
+
+    session = PlaylistDownloadSession(
+        playlist_info.tracks, options, queue_manager=queue_mgr, stream_first=stream and create_audio_engine(audio_engine).supports_growing_files()
+    ).start()
+    try:
+        if not session.wait_first():
+            print_error(f"Could not download any track of '{playlist_info.title}'.")
+            raise typer.Exit(1)
+
+        player = TerminalPlayer(
+            playlist=session.playlist,
+            start_index=0,
+            theme_name=theme_name,
+            initial_mode=viz_mode,
+            growing_files=session.growing_files,
+            playlist_complete=session.complete,
+            audio_engine=audio_engine,
+        )
+        player.start()
+
+        pending = session.pending_count()
+        if pending:
+            print_info(f"Finishing {pending} download(s) in the background (Ctrl+C to cancel)...")
+        session.wait_finished()
+    except KeyboardInterrupt:
+        session.cancel()
+        print_info("Cancelled queued downloads; waiting for the running ones to finish...")
+        session.wait_finished()
+
+    if session.failed:
+        print_error(f"{len(session.failed)} track(s) failed to download.")
+    print_success(f"Playlist saved to {options.output_dir}")
 
 
 @app.callback(invoke_without_command=True)
@@ -62,12 +145,16 @@ def play_command(
     theme: Optional[str] = typer.Option(None, "--theme", "-t", help="Player theme (cava, cyberpunk, matrix, fire, sunset, ocean, aurora, synthwave, monochrome)"),
     mode: str = typer.Option("bars", "--mode", "-m", help="Visualizer mode (bars, braille, wave, mirror, particles)"),
     spotify: bool = typer.Option(False, "--spotify", "-s", help="Attach to live Spotify / MPRIS playback"),
+    stream: bool = typer.Option(True, "--stream/--no-stream", help="Start playing online tracks while they are still downloading"),
+    engine: Optional[AudioEngine] = typer.Option(None, "--engine", "-e", help="Playback engine (auto, pcm, external)"),
+    audio_source: str = typer.Option("auto", "--audio-source", "-a", help="With --spotify: visualizer audio (auto, pulse, none or a FIFO path)"),
 ):
     """Play songs with real-time CAVA TUI audio spectrum visualizer & 2-line couplet synced Karaoke lyrics."""
     config_mgr = ConfigManager()
     cfg = config_mgr.get()
     download_dir = Path(cfg.download_dir)
     selected_theme = (theme or cfg.player_theme).lower()
+    audio_engine = engine or cfg.audio_engine
 
     try:
         viz_mode = VisualizerMode(mode.lower())
@@ -82,20 +169,25 @@ def play_command(
             mpris_player = MprisLiveLyricsPlayer(
                 player_name="spotify" if spotify else players[0],
                 theme_name=selected_theme,
-                initial_mode=viz_mode
+                initial_mode=viz_mode,
+                live_source=LivePcmSource.from_spec(audio_source)
             )
             mpris_player.start()
             return
         
-        # If no Spotify running, check if local library has downloaded songs
-        local_files = [f for f in download_dir.rglob("*") if f.is_file() and f.suffix.lower() in AUDIO_EXTENSIONS]
-        if local_files:
-            playlist = _build_playlist_from_files(local_files)
+        # If no Spotify running, check if local library has downloaded songs (indexed, refreshed incrementally)
+        playlist = LazyPlaylist.from_items([])
+        if download_dir.exists():
+            library = LibraryIndex()
+            library.refresh(download_dir)
+            playlist = LazyPlaylist.from_index(library, download_dir)
+        if playlist:
             player = TerminalPlayer(
                 playlist=playlist,
                 start_index=0,
                 theme_name=selected_theme,
-                initial_mode=viz_mode
+                initial_mode=viz_mode,
+                audio_engine=audio_engine,
             )
             player.start()
             return
@@ -115,12 +207,13 @@ def play_command(
         if not files:
             print_error(f"No audio files found in directory: {local_path}")
             raise typer.Exit(1)
-        playlist = _build_playlist_from_files(files)
+        playlist = LazyPlaylist.from_paths(files)
         player = TerminalPlayer(
             playlist=playlist,
             start_index=0,
             theme_name=selected_theme,
-            initial_mode=viz_mode
+            initial_mode=viz_mode,
+            audio_engine=audio_engine,
         )
         player.start()
         return
@@ -129,18 +222,15 @@ def play_command(
     if local_path.exists() and local_path.is_file() and local_path.suffix.lower() in AUDIO_EXTENSIONS:
         # Also queue neighbor songs in the same folder
         parent_files = [f for f in local_path.parent.iterdir() if f.is_file() and f.suffix.lower() in AUDIO_EXTENSIONS]
-        playlist = _build_playlist_from_files(parent_files)
-        start_idx = 0
-        for idx, (p, _, _) in enumerate(playlist):
-            if p == local_path:
-                start_idx = idx
-                break
-        
+        playlist = LazyPlaylist.from_paths(parent_files)
+        start_idx = playlist.position_of(local_path) or 0
+
         player = TerminalPlayer(
             playlist=playlist,
             start_index=start_idx,
             theme_name=selected_theme,
-            initial_mode=viz_mode
+            initial_mode=viz_mode,
+            audio_engine=audio_engine,
         )
         player.start()
         return
@@ -152,15 +242,25 @@ def play_command(
             playlist=local_matches,
             start_index=0,
             theme_name=selected_theme,
-            initial_mode=viz_mode
+            initial_mode=viz_mode,
+            audio_engine=audio_engine,
         )
         player.start()
         return
 
     # 5. Online resolution & on-demand stream / download
-    registry = ProviderRegistry()
+    registry = configured_registry(cfg)
     print_info(f"Resolving track: [bold cyan]{target}[/bold cyan]...")
 
+    options = DownloadOptions(
+        output_dir=cfg.download_dir,
+        audio_format=cfg.audio_format,
+        audio_bitrate=cfg.audio_bitrate,
+        embed_cover=cfg.embed_cover,
+        fetch_lyrics=True,
+        concurrent_downloads=cfg.concurrent_downloads,
+    )
+
     try:
         resolved = registry.resolve(target)
         if hasattr(resolved, "tracks"):
@@ -168,21 +268,23 @@ def play_command(
         else:
             track = resolved
     except Exception:
+        resolved = None
         track = TrackInfo(title=target, artist="Unknown Artist")
 
-    downloader = YtDlpEngine()
-    options = DownloadOptions(
-        output_dir=cfg.download_dir,
-        audio_format=cfg.audio_format,
-        audio_bitrate=cfg.audio_bitrate,
-        embed_cover=cfg.embed_cover,
-        fetch_lyrics=True
-    )
+    queue_mgr = configured_queue_manager(cfg)
+    if isinstance(resolved, PlaylistInfo) and len(resolved.tracks) > 1:
+        _play_playlist_progressive(resolved, options, selected_theme, viz_mode, stream, audio_engine, queue_mgr)
+        return
+
+    existing_file = queue_mgr.find_existing(track, options)
+    if not existing_file and stream:
+        print_info("Buffering stream & downloading in the background...")
+        if _play_progressive(track, options, selected_theme, viz_mode, audio_engine, queue_mgr):
+            return
+        print_info("Streaming unavailable, falling back to a full download...")
 
-    existing_file = downloader.find_existing_file(track, options)
     if not existing_file:
         print_info(f"Downloading track & synced lyrics on demand...")
-        queue_mgr = TaskQueueManager()
         results = queue_mgr.process_tracks([track], options)
         if results and results[0].output_path:
             existing_file = Path(results[0].output_path)
@@ -197,6 +299,7 @@ def play_command(
         playlist=playlist,
         start_index=0,
         theme_name=selected_theme,
-        initial_mode=viz_mode
+        initial_mode=viz_mode,
+        audio_engine=audio_engine,
     )
     player.start()
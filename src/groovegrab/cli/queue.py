@@ -2,43 +2,309 @@
 Queue & History Subcommand Handler (`groovegrab queue`)
 """
 
+import csv
+import json
+import os
+import sys
+import time
+from typing import Dict, Iterable, List, Optional
+
 import typer
 from rich.console import Console
+from rich.json import JSON
+from rich.live import Live
 from rich.table import Table
 
-from groovegrab.queue.storage import TaskStorage
+from groovegrab.core.config import ConfigManager
+from groovegrab.core.models import DownloadStatus, ExportFormat
+from groovegrab.cli.factories import configured_queue_manager, configured_storage
+from groovegrab.engines.ffmpeg_converter import FfmpegHelper
+from groovegrab.queue.storage import TERMINAL_STATUSES, HistoryWatcher, TaskRow, TaskStorage, since_timestamp
+from groovegrab.ui.banner import print_error, print_info, print_success
+from groovegrab.ui.dashboard import PlaylistProgressDashboard, print_tasks_summary
 
 console = Console()
 app = typer.Typer(help="View download queue history")
 
+STATUS_COLORS = {"completed": "green", "failed": "red", "unavailable": "magenta"}
+
+
+def _show_detail(storage: TaskStorage, task_id: str):
+    task = storage.get_task(task_id)
+    if task is None:
+        print_error(f"No unique history entry matches id '{task_id}'.")
+        raise typer.Exit(code=1)
+    console.print(JSON(json.dumps(task.model_dump(mode="json"))))
+
+
+def _format_bytes(size: int) -> str:
+    for unit in ("B", "KiB", "MiB"):
+        if size < 1024:
+            return f"{size:.0f} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+        size /= 1024
+    return f"{size:.2f} GiB"
+
+
+def _format_ms(ms: Optional[float]) -> str:
+    if ms is None:
+        return "-"
+    return f"{ms:.0f} ms" if ms < 1000 else f"{ms / 1000:.2f} s"
+
+
+def _format_rate(bytes_per_sec: Optional[float]) -> str:
+    return f"{_format_bytes(int(bytes_per_sec))}/s" if bytes_per_sec else "-"
+
+
+def export_rows(rows: Iterable[TaskRow], fmt: ExportFormat, out=None):
+    """Write rows one at a time (constant memory however long the history is)."""
+    out = out or sys.stdout
+    if fmt == ExportFormat.CSV:
+        writer = csv.writer(out)
+        writer.writerow(TaskRow._fields)
+        for row in rows:
+            writer.writerow(row)
+    else:
+        for row in rows:
+            out.write(json.dumps(row._asdict(), ensure_ascii=False) + "\n")
+    out.flush()
+
 
 @app.callback(invoke_without_command=True)
 def queue_command(
-    limit: int = typer.Option(20, "--limit", "-n", min=1, max=500, help="Number of history items to show")
+    ctx: typer.Context,
+    limit: int = typer.Option(20, "--limit", "-n", min=1, max=500, help="Number of history items to show"),
+    status: Optional[DownloadStatus] = typer.Option(None, "--status", "-s", help="Only show tasks with this status"),
+    provider: Optional[str] = typer.Option(None, "--provider", "-p", help="Only show tasks from this provider"),
+    since: Optional[str] = typer.Option(None, "--since", help="Only show tasks created since (e.g. 12h, 7d, 2026-01-31)"),
+    detail: Optional[str] = typer.Option(None, "--detail", "-d", help="Show every stored field of one task (id or id prefix)"),
+    export: Optional[ExportFormat] = typer.Option(None, "--export", "-e", help="Stream every matching task to stdout as jsonl or csv (ignores --limit)"),
+    watch: bool = typer.Option(False, "--watch", "-w", help="Keep the table open and update it as tasks change"),
+    interval: float = typer.Option(0.5, "--interval", min=0.05, help="Seconds between change checks in --watch mode"),
 ):
     """View recent download history and task status."""
-    storage = TaskStorage()
-    tasks = storage.list_tasks(limit=limit)
+    if ctx.invoked_subcommand is not None:
+        return
+    storage = configured_storage()
+    if detail:
+        _show_detail(storage, detail)
+        return
 
-    if not tasks:
+    try:
+        since_ts = since_timestamp(since) if since else None
+    except ValueError as e:
+        print_error(str(e))
+        raise typer.Exit(code=1)
+
+    if export:
+        try:
+            export_rows(storage.iter_rows(status=status, provider=provider, since=since_ts), export)
+        except BrokenPipeError:
+            # Reader went away (`| head`): point stdout at devnull so the exit-time flush does not raise again
+            os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        return
+
+    if watch:
+        _watch_history(HistoryWatcher(storage, status=status, provider=provider, since=since_ts), limit, interval)
+        return
+
+    rows = storage.query_rows(status=status, provider=provider, since=since_ts, limit=limit)
+
+    if not rows:
         console.print("[yellow]No download history found.[/yellow]")
         return
 
-    table = Table(title="Download History & Queue", show_header=True, header_style="bold magenta")
+    console.print(_history_table(rows))
+
+
+def _history_table(rows: Iterable[TaskRow], title: str = "Download History & Queue") -> Table:
+    table = Table(title=title, show_header=True, header_style="bold magenta")
+    table.add_column("ID", style="dim")
     table.add_column("Status", style="cyan")
     table.add_column("Track", style="bold white")
     table.add_column("Artist", style="green")
     table.add_column("Provider", style="blue")
     table.add_column("Output Path", style="dim white")
 
-    for task in tasks:
-        status_color = "green" if task.status == "completed" else ("red" if task.status == "failed" else "yellow")
+    for row in rows:
+        status_color = STATUS_COLORS.get(row.status, "yellow")
+        table.add_row(
+            row.id[:8],
+            f"[{status_color}]{row.status.upper()}[/{status_color}]",
+            row.title,
+            row.artist,
+            row.provider,
+            row.output_path or row.error_message or "-"
+        )
+    return table
+
+
+def _watch_history(watcher: HistoryWatcher, limit: int, interval: float):
+    """Redraw only when the database changed, merging just the rows written since the last refresh."""
+    title = "Download History & Queue [dim](watching, Ctrl+C to stop)[/dim]"
+    shown: Dict[str, TaskRow] = {row.id: row for row in watcher.snapshot(limit)}
+
+    def newest() -> List[TaskRow]:
+        return sorted(shown.values(), key=lambda row: (row.created_at, row.id), reverse=True)[:limit]
+
+    try:
+        with Live(_history_table(newest(), title), console=console, auto_refresh=False) as live:
+            while True:
+                time.sleep(interval)
+                changed = watcher.poll()
+                if not changed:
+                    continue
+                for row in changed:
+                    if watcher.matches(row):
+                        shown[row.id] = row
+                    else:
+                        shown.pop(row.id, None)
+                rows = newest()
+                # Forget rows that scrolled out of view so the map stays at `limit` entries
+                shown = {row.id: row for row in rows}
+                live.update(_history_table(rows, title), refresh=True)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        watcher.close()
+
+
+@app.command("batches")
+def batches_command(
+    limit: int = typer.Option(20, "--limit", "-n", min=1, max=500, help="Number of batches to show"),
+    resumable: bool = typer.Option(False, "--resumable", "-r", help="Only show batches with unfinished or failed tasks"),
+):
+    """List download batches (one per `dl` run) and how far each got."""
+    batches = configured_storage().list_batches(limit=limit, resumable_only=resumable)
+    if not batches:
+        console.print("[yellow]No download batches found.[/yellow]")
+        return
+
+    table = Table(title="Download Batches", show_header=True, header_style="bold magenta")
+    table.add_column("Batch", style="dim")
+    table.add_column("Title", style="bold white")
+    table.add_column("Created", style="blue")
+    table.add_column("Done", style="green", justify="right")
+    table.add_column("Failed", style="red", justify="right")
+    table.add_column("Unavailable", style="magenta", justify="right")
+    table.add_column("Unfinished", style="yellow", justify="right")
+    for batch in batches:
         table.add_row(
-            f"[{status_color}]{task.status.upper()}[/{status_color}]",
-            task.track.title,
-            task.track.artist,
-            task.track.provider_name,
-            task.output_path or task.error_message or "-"
+            batch.id[:8], batch.title, batch.created_at,
+            str(batch.done), str(batch.failed), str(batch.unavailable), str(batch.unfinished)
         )
+    console.print(table)
+
+
+@app.command("resume")
+def resume_command(
+    batch: Optional[str] = typer.Argument(None, help="Batch id or prefix (default: newest batch with work left)"),
+):
+    """Reschedule the unfinished and failed tasks of an interrupted download batch."""
+    storage = configured_storage()
+    found = storage.find_batch(batch)
+    if found is None:
+        if batch:
+            print_error(f"No unique download batch matches '{batch}'.")
+            raise typer.Exit(code=1)
+        print_info("Nothing to resume: every batch has finished.")
+        return
+    if not found.resumable:
+        print_success(f"Batch [bold]{found.title}[/bold] already finished ({found.done}/{found.total} tracks).")
+        return
+
+    ffmpeg_available, ffmpeg_message = FfmpegHelper.get_ffmpeg_version()
+    if not ffmpeg_available:
+        print_error(f"FFmpeg is required for audio conversion. {ffmpeg_message}")
+        raise typer.Exit(1)
+
+    print_info(
+        f"Resuming [bold yellow]{found.title}[/bold yellow]: {found.unfinished} unfinished, "
+        f"{found.failed} failed of {found.total} track(s)"
+    )
+    queue_mgr = configured_queue_manager(storage=storage)
+    dashboard = PlaylistProgressDashboard(total_tracks=found.failed + found.unfinished)
+    try:
+        tasks = queue_mgr.resume_batch(found.id, on_progress=dashboard.update_task)
+    finally:
+        dashboard.close()
 
+    print_tasks_summary(tasks)
+    if any(task.status == DownloadStatus.FAILED for task in tasks):
+        raise typer.Exit(1)
+
+
+@app.command("compact")
+def compact_command(
+    older_than: Optional[str] = typer.Option(None, "--older-than", help="Prune rows created before this (e.g. 90d, 2026-01-31; default: config history_max_age_days)"),
+    keep: Optional[int] = typer.Option(None, "--keep", min=1, help="Prune rows beyond the newest N (default: config history_max_rows)"),
+    status: Optional[List[DownloadStatus]] = typer.Option(None, "--status", "-s", help="Statuses that may be pruned (repeatable; default: completed, skipped, failed)"),
+    vacuum: bool = typer.Option(True, "--vacuum/--no-vacuum", help="VACUUM and truncate the WAL afterwards"),
+):
+    """Apply history retention, drop raw provider metadata from finished rows and shrink the database."""
+    cfg = ConfigManager().get()
+    try:
+        if older_than:
+            cutoff = since_timestamp(older_than)
+        elif cfg.history_max_age_days:
+            cutoff = since_timestamp(f"{cfg.history_max_age_days}d")
+        else:
+            cutoff = None
+    except ValueError as e:
+        print_error(str(e))
+        raise typer.Exit(code=1)
+
+    storage = configured_storage(cfg)
+    result = storage.compact(
+        older_than=cutoff,
+        keep_last=keep or cfg.history_max_rows,
+        statuses=status or TERMINAL_STATUSES,
+        vacuum=vacuum,
+    )
+    print_success(
+        f"Pruned {result.pruned} row(s), slimmed {result.slimmed} payload(s): "
+        f"{_format_bytes(result.size_before)} -> {_format_bytes(result.size_after)}"
+    )
+
+
+@app.command("stats")
+def stats_command(
+    since: Optional[str] = typer.Option(None, "--since", help="Only tasks created since (e.g. 12h, 7d, 2026-01-31)"),
+    provider: Optional[str] = typer.Option(None, "--provider", "-p", help="Only this provider (stage table)"),
+):
+    """Per-stage latency percentiles, throughput and failure rates per provider and format."""
+    try:
+        since_ts = since_timestamp(since) if since else None
+    except ValueError as e:
+        print_error(str(e))
+        raise typer.Exit(code=1)
+
+    storage = configured_storage()
+    stages = storage.stage_stats(since=since_ts, provider=provider)
+    if not stages:
+        console.print("[yellow]No timed downloads recorded yet.[/yellow]")
+        return
+
+    table = Table(title="Stage Latency", show_header=True, header_style="bold magenta")
+    table.add_column("Stage", style="cyan")
+    for column in ("Runs", "Failed", "p50", "p95", "Bytes", "Throughput"):
+        table.add_column(column, justify="right")
+    for row in stages:
+        table.add_row(
+            row.stage, str(row.count), str(row.failed), _format_ms(row.p50_ms), _format_ms(row.p95_ms),
+            _format_bytes(row.bytes) if row.bytes else "-", _format_rate(row.bytes_per_sec)
+        )
     console.print(table)
+
+    for by, title in (("provider", "By Provider"), ("audio_format", "By Format")):
+        table = Table(title=title, show_header=True, header_style="bold magenta")
+        table.add_column(title.split()[-1], style="cyan")
+        for column in ("Tasks", "Done", "Skipped", "Failed", "Unavailable", "Failure Rate", "p50 Task", "p95 Task", "Download Rate"):
+            table.add_column(column, justify="right")
+        for row in storage.group_stats(by=by, since=since_ts):
+            table.add_row(
+                row.key or "-", str(row.tasks), str(row.completed), str(row.skipped), str(row.failed),
+                str(row.unavailable),
+                f"{row.failure_rate:.1%}" if row.failure_rate is not None else "-",
+                _format_ms(row.p50_ms), _format_ms(row.p95_ms), _format_rate(row.download_bytes_per_sec)
+            )
+        console.print(table)
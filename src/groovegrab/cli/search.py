@@ -8,10 +8,9 @@ from rich.console import Console
 
 from groovegrab.core.config import ConfigManager
 from groovegrab.core.models import DownloadOptions
-from groovegrab.providers.registry import ProviderRegistry
+from groovegrab.cli.factories import configured_queue_manager, configured_registry
 from groovegrab.ui.search_table import display_search_results
 from groovegrab.ui.dashboard import print_tasks_summary
-from groovegrab.queue.task_queue import TaskQueueManager
 from groovegrab.ui.banner import print_info, print_error
 
 console = Console()
@@ -25,7 +24,8 @@ def search_command(
     output_dir: Optional[str] = typer.Option(None, "--output", "-o", help="Custom output directory"),
 ):
     """Search for songs interactively and choose tracks to download."""
-    registry = ProviderRegistry()
+    cfg = ConfigManager().get()
+    registry = configured_registry(cfg)
     print_info(f"Searching for '[bold cyan]{query}[/bold cyan]'...")
 
     try:
@@ -40,9 +40,6 @@ def search_command(
         print_info("No tracks selected. Exiting.")
         return
 
-    config_mgr = ConfigManager()
-    cfg = config_mgr.get()
-
     options = DownloadOptions(
         output_dir=output_dir or cfg.download_dir,
         audio_format=cfg.audio_format,
@@ -54,6 +51,6 @@ def search_command(
 
     console.print(f"\n[bold yellow]Downloading {len(selected_tracks)} selected track(s)...[/bold yellow]\n")
 
-    queue_mgr = TaskQueueManager()
+    queue_mgr = configured_queue_manager(cfg)
     tasks = queue_mgr.process_tracks(selected_tracks, options)
     print_tasks_summary(tasks)
@@ -0,0 +1,87 @@
+"""
+Queue Worker Subcommand Handler (`groovegrab worker`)
+Drains the shared download queue: every worker process claims tasks under a renewable lease, so adding processes
+(on one host, against one history database) adds throughput without downloading a track twice.
+"""
+
+import asyncio
+from typing import Optional
+
+import typer
+from rich.console import Console
+
+from groovegrab.core.config import ConfigManager
+from groovegrab.core.models import DownloadStatus, DownloadTask
+from groovegrab.engines.ffmpeg_converter import FfmpegHelper
+from groovegrab.cli.factories import configured_queue_manager, configured_storage
+from groovegrab.queue.storage import LEASE_SEC, TERMINAL_STATUSES
+from groovegrab.queue.async_queue import DEFAULT_TASKS_IN_FLIGHT, AsyncTaskQueueManager
+from groovegrab.ui.banner import print_error, print_info
+from groovegrab.ui.dashboard import print_tasks_summary
+
+console = Console()
+
+STATUS_STYLES = {
+    DownloadStatus.COMPLETED: "green",
+    DownloadStatus.SKIPPED: "yellow",
+    DownloadStatus.FAILED: "red",
+    DownloadStatus.UNAVAILABLE: "magenta",
+}
+
+
+def _log_finished(task: DownloadTask):
+    if task.status in TERMINAL_STATUSES:
+        style = STATUS_STYLES[task.status]
+        line = f"[{style}]{task.status.value:<9}[/{style}] {task.id[:8]} {task.track.display_name()}"
+        if task.error_message:
+            line += f" [dim]({task.error_message})[/dim]"
+        console.print(line)
+
+
+def worker_command(
+    concurrency: Optional[int] = typer.Option(None, "--concurrency", "-c", min=1, max=16, help="Tasks in flight (default: config concurrent_downloads)"),
+    batch: Optional[str] = typer.Option(None, "--batch", help="Only drain this batch (id or prefix)"),
+    follow: bool = typer.Option(False, "--follow", "-F", help="Keep waiting for new tasks instead of exiting when the queue is empty"),
+    lease: float = typer.Option(LEASE_SEC, "--lease", min=5.0, help="Lease length in seconds; a crashed worker's tasks are re-claimed after it"),
+    poll: float = typer.Option(1.0, "--poll", min=0.1, help="Seconds between claims while waiting for work"),
+    use_asyncio: bool = typer.Option(False, "--asyncio", help="Run on the asyncio engine: --concurrency limits only yt-dlp / FFmpeg"),
+    in_flight: int = typer.Option(DEFAULT_TASKS_IN_FLIGHT, "--in-flight", min=1, max=1024, help="asyncio engine: tasks claimed and fetching lyrics / covers at once"),
+):
+    """Claim and download queued tasks until the queue is drained."""
+    cfg = ConfigManager().get()
+    storage = configured_storage(cfg)
+    batch_id = None
+    if batch:
+        found = storage.find_batch(batch)
+        if found is None:
+            print_error(f"No unique download batch matches '{batch}'.")
+            raise typer.Exit(code=1)
+        batch_id = found.id
+
+    ffmpeg_available, ffmpeg_message = FfmpegHelper.get_ffmpeg_version()
+    if not ffmpeg_available:
+        print_error(f"FFmpeg is required for audio conversion. {ffmpeg_message}")
+        raise typer.Exit(1)
+
+    if use_asyncio:
+        queue_mgr = configured_queue_manager(cfg, storage, AsyncTaskQueueManager, lease_sec=lease, tasks_in_flight=in_flight)
+    else:
+        queue_mgr = configured_queue_manager(cfg, storage, lease_sec=lease)
+    concurrency = concurrency or cfg.concurrent_downloads
+    print_info(
+        f"Worker [bold]{queue_mgr.owner}[/bold]: {storage.count_unfinished(batch_id)} queued task(s), "
+        f"{concurrency} at a time" + (" (following, Ctrl+C to stop)" if follow else "")
+    )
+
+    try:
+        if use_asyncio:
+            tasks = asyncio.run(queue_mgr.drain_async(concurrency, batch_id=batch_id, on_progress=_log_finished, follow=follow, poll_interval=poll))
+        else:
+            tasks = queue_mgr.drain(concurrency, batch_id=batch_id, on_progress=_log_finished, follow=follow, poll_interval=poll)
+    except KeyboardInterrupt:
+        print_info("Interrupted: leased tasks were released back to the queue (pending) for the next worker.")
+        raise typer.Exit(130)
+
+    print_tasks_summary(tasks)
+    if any(task.status == DownloadStatus.FAILED for task in tasks):
+        raise typer.Exit(1)
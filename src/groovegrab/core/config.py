@@ -9,7 +9,7 @@ from pathlib import Path
 from typing import Optional
 from platformdirs import user_config_dir, user_downloads_dir
 from pydantic import BaseModel, Field
-from groovegrab.core.models import AudioFormat, AudioBitrate
+from groovegrab.core.models import AudioEngine, AudioFormat, AudioBitrate
 
 
 class GrooveGrabConfig(BaseModel):
@@ -21,6 +21,12 @@ class GrooveGrabConfig(BaseModel):
     output_template: str = "{artist}/{album}/{track_number} - {title}.{ext}"
     concurrent_downloads: int = Field(default=3, ge=1, le=16)
     player_theme: str = "cava"
+    audio_engine: AudioEngine = AudioEngine.AUTO
+    history_compression: bool = False
+    history_max_age_days: Optional[int] = Field(default=None, ge=1)
+    history_max_rows: Optional[int] = Field(default=None, ge=1)
+    unavailable_ttl_days: int = Field(default=30, ge=0)
+    keep_raw_metadata: bool = False
     spotify_client_id: Optional[str] = None
     spotify_client_secret: Optional[str] = None
 
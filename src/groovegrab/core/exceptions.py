@@ -2,6 +2,17 @@
 GrooveGrab Custom Exceptions
 """
 
+import re
+
+# Provider / yt-dlp messages for sources that no retry will bring back (within the failure memo's TTL)
+PERMANENT_FAILURE_REGEX = re.compile(
+    r"video unavailable|this video (?:is no longer|is not) available|has been removed|private video"
+    r"|available in your country|geo[- ]?restrict|blocked it in your country"
+    r"|account (?:associated with this video )?has been terminated|copyright (?:claim|grounds)"
+    r"|members[- ]only|join this channel|sign in to confirm your age",
+    re.IGNORECASE,
+)
+
 class GrooveGrabError(Exception):
     """Base exception for GrooveGrab CLI errors."""
     pass
@@ -25,3 +36,11 @@ class MetadataError(GrooveGrabError):
 class ConfigError(GrooveGrabError):
     """Raised when configuration operations fail."""
     pass
+
+
+def is_permanent_failure(error: BaseException) -> bool:
+    """
+    True when `error` says the source itself is gone (unavailable, private, geo-blocked) rather than
+    the attempt failing (network, throttling, 403s, transcoding), so retrying it later is pointless.
+    """
+    return isinstance(error, (ExtractionError, ProviderError)) and bool(PERMANENT_FAILURE_REGEX.search(str(error)))
@@ -28,6 +28,17 @@ class AudioBitrate(str, Enum):
     BEST = "best"
 
 
+class AudioEngine(str, Enum):
+    AUTO = "auto"
+    PCM = "pcm"
+    EXTERNAL = "external"
+
+
+class ExportFormat(str, Enum):
+    JSONL = "jsonl"
+    CSV = "csv"
+
+
 class DownloadStatus(str, Enum):
     PENDING = "pending"
     RESOLVING = "resolving"
@@ -37,6 +48,29 @@ class DownloadStatus(str, Enum):
     COMPLETED = "completed"
     SKIPPED = "skipped"
     FAILED = "failed"
+    # Permanently unavailable source (removed, private, geo-blocked): not retried until its failure memo expires
+    UNAVAILABLE = "unavailable"
+
+
+class Stage(str, Enum):
+    SKIP_CHECK = "skip_check"
+    EXTRACT = "extract"
+    DOWNLOAD = "download"
+    TRANSCODE = "transcode"
+    LYRICS = "lyrics"
+    COVER = "cover"
+    TAG = "tag"
+
+
+# The provider-payload fields downstream code reads (identity.track_keys: the provider's own id); the rest of a
+# yt-dlp info dict or Spotify entity is dead weight carried by every task, in memory and in each history row
+RAW_METADATA_FIELDS = ("id",)
+
+
+def project_raw_metadata(payload: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    """The RAW_METADATA_FIELDS of a provider payload (missing and None values dropped)."""
+    payload = payload or {}
+    return {key: payload[key] for key in RAW_METADATA_FIELDS if payload.get(key) is not None}
 
 
 class TrackInfo(BaseModel):
@@ -80,6 +114,19 @@ class DownloadOptions(BaseModel):
     overwrite: bool = False
 
 
+class StageTiming(BaseModel):
+    """One stage of a task: monotonic start / end in ms since the task started, bytes it handled."""
+    stage: Stage
+    start_ms: float
+    end_ms: float
+    bytes: Optional[int] = None
+    ok: bool = True
+
+    @property
+    def duration_ms(self) -> float:
+        return self.end_ms - self.start_ms
+
+
 class DownloadTask(BaseModel):
     id: str
     track: TrackInfo
@@ -90,3 +137,5 @@ class DownloadTask(BaseModel):
     eta: Optional[str] = None
     output_path: Optional[str] = None
     error_message: Optional[str] = None
+    batch_id: Optional[str] = None
+    stages: List[StageTiming] = Field(default_factory=list)
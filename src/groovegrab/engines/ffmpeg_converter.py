@@ -3,7 +3,21 @@ FFmpeg Helper Engine
 """
 
 import shutil
-from typing import Tuple
+import subprocess
+from pathlib import Path
+from typing import Optional, Tuple
+
+from groovegrab.core.exceptions import TranscodeError
+
+AUDIO_CODECS = {
+    "mp3": "libmp3lame",
+    "flac": "flac",
+    "m4a": "aac",
+    "opus": "libopus",
+    "wav": "pcm_s16le",
+}
+
+LOSSLESS_FORMATS = {"flac", "wav"}
 
 
 class FfmpegHelper:
@@ -17,3 +31,33 @@ class FfmpegHelper:
         if not ffmpeg_path:
             return False, "FFmpeg is not installed or not in PATH."
         return True, f"FFmpeg available at {ffmpeg_path}"
+
+    @staticmethod
+    def transcode_audio(src: Path, dst: Path, audio_format: str, audio_bitrate: Optional[str] = None) -> Path:
+        """Convert `src` into `dst` with the codec for `audio_format` (the same targets yt-dlp's FFmpegExtractAudio produces)."""
+        if not shutil.which("ffmpeg"):
+            raise TranscodeError("FFmpeg is not installed or not in PATH.")
+        codec = AUDIO_CODECS.get(audio_format)
+        if codec is None:
+            raise TranscodeError(f"Unsupported audio format: {audio_format}")
+
+        cmd = ["ffmpeg", "-v", "error", "-nostdin", "-y", "-i", str(src), "-vn", "-c:a", codec]
+        if audio_bitrate and audio_bitrate != "best" and audio_format not in LOSSLESS_FORMATS:
+            cmd += ["-b:a", audio_bitrate]
+        elif audio_format == "mp3":
+            cmd += ["-q:a", "0"]
+        dst.parent.mkdir(parents=True, exist_ok=True)
+        temp = dst.with_name(dst.stem + ".part" + dst.suffix)
+        cmd.append(str(temp))
+
+        try:
+            result = subprocess.run(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, timeout=600)
+        except (OSError, subprocess.TimeoutExpired) as e:
+            temp.unlink(missing_ok=True)
+            raise TranscodeError(f"FFmpeg failed on {src.name}: {e}")
+        if result.returncode != 0 or not temp.exists():
+            temp.unlink(missing_ok=True)
+            message = result.stderr.decode("utf-8", "replace").strip().splitlines()
+            raise TranscodeError(f"FFmpeg failed on {src.name}: {message[-1] if message else result.returncode}")
+        temp.replace(dst)
+        return dst
@@ -1,12 +1,14 @@
 """
 LRCLIB & SyncedLyrics Synced Lyrics Fetcher Engine
 Robust query cleaning, LRCLIB API integration, syncedlyrics fallback, and persistent local cache.
+Blocking (`fetch_lyrics`) and asyncio (`fetch_lyrics_async`, on a shared httpx.AsyncClient) variants.
 """
 
+import asyncio
 import re
 import hashlib
 from pathlib import Path
-from typing import Optional, Tuple
+from typing import Any, Dict, List, Optional, Tuple
 import httpx
 
 from groovegrab.core.models import TrackInfo
@@ -59,26 +61,16 @@ class LyricFetcher:
             return None, None
 
         cache_path = self._get_cache_path(title, artist)
-        if cache_path.exists():
-            try:
-                cached_text = cache_path.read_text(encoding="utf-8")
-                if cached_text.strip():
-                    return cached_text, None
-            except Exception:
-                pass
+        cached_text = self._read_cache(cache_path)
+        if cached_text:
+            return cached_text, None
 
         raw_title = title
         clean_title = clean_track_title(raw_title)
 
-        # 1. Query LRCLIB GET API with exact cleaned title
-        synced, plain = self._query_lrclib_get(clean_title, artist, album, duration)
-        if synced:
-            self._save_cache(cache_path, synced)
-            return synced, plain
-
-        # 2. Query LRCLIB GET API with raw title if different
-        if clean_title != raw_title:
-            synced, plain = self._query_lrclib_get(raw_title, artist, album, duration)
+        # 1. Query LRCLIB GET API with exact cleaned title, 2. with raw title if different
+        for get_title in dict.fromkeys([clean_title, raw_title]):
+            synced, plain = self._query_lrclib_get(get_title, artist, album, duration)
             if synced:
                 self._save_cache(cache_path, synced)
                 return synced, plain
@@ -104,6 +96,23 @@ class LyricFetcher:
         album: Optional[str] = None,
         duration: Optional[float] = None
     ) -> Tuple[Optional[str], Optional[str]]:
+        try:
+            resp = httpx.get(LRCLIB_API_URL, params=self._lrclib_get_params(title, artist, album, duration), timeout=6.0)
+            return self._parse_lrclib_get(resp)
+        except Exception:
+            return None, None
+
+    def _query_lrclib_search(self, query: str, artist: str) -> Tuple[Optional[str], Optional[str]]:
+        try:
+            resp = httpx.get(LRCLIB_SEARCH_URL, params={"q": f"{query} {artist}".strip()}, timeout=6.0)
+            return self._parse_lrclib_search(resp)
+        except Exception:
+            return None, None
+
+    @staticmethod
+    def _lrclib_get_params(
+        title: str, artist: str, album: Optional[str], duration: Optional[float]
+    ) -> Dict[str, Any]:
         params = {
             "track_name": title,
             "artist_name": artist,
@@ -112,32 +121,60 @@ class LyricFetcher:
             params["album_name"] = album
         if duration and duration > 0:
             params["duration"] = int(duration)
+        return params
 
-        try:
-            resp = httpx.get(LRCLIB_API_URL, params=params, timeout=6.0)
-            if resp.status_code == 200:
-                data = resp.json()
-                synced = data.get("syncedLyrics")
-                plain = data.get("plainLyrics")
-                if synced:
-                    return synced, plain
-        except Exception:
-            pass
+    @staticmethod
+    def _parse_lrclib_get(resp: httpx.Response) -> Tuple[Optional[str], Optional[str]]:
+        if resp.status_code == 200:
+            data = resp.json()
+            synced = data.get("syncedLyrics")
+            if synced:
+                return synced, data.get("plainLyrics")
         return None, None
 
-    def _query_lrclib_search(self, query: str, artist: str) -> Tuple[Optional[str], Optional[str]]:
-        search_str = f"{query} {artist}".strip()
-        try:
-            resp = httpx.get(LRCLIB_SEARCH_URL, params={"q": search_str}, timeout=6.0)
-            if resp.status_code == 200:
-                results = resp.json()
-                if isinstance(results, list):
-                    for item in results:
-                        synced = item.get("syncedLyrics")
-                        if synced:
-                            return synced, item.get("plainLyrics")
-        except Exception:
-            pass
+    @staticmethod
+    def _parse_lrclib_search(resp: httpx.Response) -> Tuple[Optional[str], Optional[str]]:
+        if resp.status_code == 200:
+            results = resp.json()
+            if isinstance(results, list):
+                for item in results:
+                    synced = item.get("syncedLyrics")
+                    if synced:
+                        return synced, item.get("plainLyrics")
+        return None, None
+
+    async def fetch_lyrics_async(
+        self, track: TrackInfo, client: httpx.AsyncClient
+    ) -> Tuple[Optional[str], Optional[str]]:
+        """`fetch_lyrics` with the LRCLIB requests on `client`; cache files and the syncedlyrics fallback run in threads."""
+        title, artist = track.title, track.artist
+        if not title:
+            return None, None
+
+        cache_path = self._get_cache_path(title, artist)
+        cached_text = await asyncio.to_thread(self._read_cache, cache_path)
+        if cached_text:
+            return cached_text, None
+
+        clean_title = clean_track_title(title)
+        requests: List[Tuple[str, Dict[str, Any], Any]] = [
+            (LRCLIB_API_URL, self._lrclib_get_params(get_title, artist, track.album, track.duration), self._parse_lrclib_get)
+            for get_title in dict.fromkeys([clean_title, title])
+        ]
+        requests.append((LRCLIB_SEARCH_URL, {"q": f"{clean_title or title} {artist}".strip()}, self._parse_lrclib_search))
+        for url, params, parse in requests:
+            try:
+                synced, plain = parse(await client.get(url, params=params, timeout=6.0))
+            except Exception:
+                continue
+            if synced:
+                await asyncio.to_thread(self._save_cache, cache_path, synced)
+                return synced, plain
+
+        synced = await asyncio.to_thread(self._query_syncedlyrics, clean_title or title, artist)
+        if synced:
+            await asyncio.to_thread(self._save_cache, cache_path, synced)
+            return synced, None
         return None, None
 
     def _query_syncedlyrics(self, title: str, artist: str) -> Optional[str]:
@@ -151,6 +188,13 @@ class LyricFetcher:
             pass
         return None
 
+    def _read_cache(self, cache_path: Path) -> Optional[str]:
+        try:
+            cached_text = cache_path.read_text(encoding="utf-8")
+        except Exception:
+            return None
+        return cached_text if cached_text.strip() else None
+
     def _save_cache(self, cache_path: Path, content: str):
         try:
             cache_path.write_text(content, encoding="utf-8")
@@ -18,11 +18,20 @@ from groovegrab.core.exceptions import MetadataError
 class MetadataTagger:
     """Embeds ID3, Vorbis, or MP4 metadata and artwork into audio files."""
 
-    def tag_file(self, file_path: Path, track: TrackInfo, lyrics: Optional[str] = None) -> None:
+    def tag_file(
+        self,
+        file_path: Path,
+        track: TrackInfo,
+        lyrics: Optional[str] = None,
+        cover_data: Optional[bytes] = None,
+        fetch_cover: bool = True
+    ) -> None:
+        """Tag `file_path`; pass `fetch_cover=False` with `cover_data` when the artwork was fetched separately."""
         if not file_path.exists():
             raise MetadataError(f"File for tagging does not exist: {file_path}")
 
-        cover_data = self._fetch_cover(track.cover_url)
+        if fetch_cover:
+            cover_data = self.fetch_cover(track.cover_url)
         ext = file_path.suffix.lower()
 
         try:
@@ -44,7 +53,7 @@ class MetadataTagger:
         except Exception as e:
             raise MetadataError(f"Failed to tag file {file_path.name}: {e}")
 
-    def _fetch_cover(self, cover_url: Optional[str]) -> Optional[bytes]:
+    def fetch_cover(self, cover_url: Optional[str]) -> Optional[bytes]:
         if not cover_url:
             return None
         try:
@@ -55,6 +64,18 @@ class MetadataTagger:
             pass
         return None
 
+    async def fetch_cover_async(self, cover_url: Optional[str], client: httpx.AsyncClient) -> Optional[bytes]:
+        """`fetch_cover` on a shared AsyncClient."""
+        if not cover_url:
+            return None
+        try:
+            resp = await client.get(cover_url, timeout=10.0, follow_redirects=True)
+            if resp.status_code == 200 and len(resp.content) > 0:
+                return resp.content
+        except Exception:
+            pass
+        return None
+
     def _tag_mp3(self, file_path: Path, track: TrackInfo, cover_bytes: Optional[bytes], lyrics: Optional[str]):
         try:
             tags = ID3(file_path)
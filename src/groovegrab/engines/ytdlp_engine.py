@@ -8,7 +8,7 @@ import os
 import re
 import time
 from pathlib import Path
-from typing import Callable, Optional
+from typing import Any, Callable, Dict, Optional
 import yt_dlp
 
 from groovegrab.core.models import TrackInfo, DownloadOptions
@@ -54,14 +54,7 @@ class YtDlpEngine:
             if existing:
                 return existing
 
-        url = track.stream_url
-        web_url = track.webpage_url or ""
-        
-        # Spotify & metadata queries use official audio search to avoid music video intro dialogues
-        if not url or "spotify.com" in (url or "") or "spotify.com" in web_url or not url.startswith("http"):
-            search_query = f"ytsearch1:{track.artist} - {track.title} official audio"
-        else:
-            search_query = url
+        search_query = self._build_search_query(track)
 
         safe_artist = self._sanitize_filename(track.artist)
         safe_title = self._sanitize_filename(track.title)
@@ -71,29 +64,13 @@ class YtDlpEngine:
             f"{safe_artist} - {safe_title}.%(ext)s"
         )
 
-        ydl_opts = {
-            'format': 'bestaudio/best',
-            'outtmpl': output_template,
-            'quiet': True,
-            'no_warnings': True,
-            'ignoreerrors': False,
-            'retries': 10,
-            'fragment_retries': 10,
-            'extractor_args': {
-                'youtube': {
-                    'player_client': ['android', 'web'],
-                }
-            },
-            'http_headers': {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/122.0.0.0 Safari/537.36',
-                'Accept-Language': 'en-US,en;q=0.9',
-            },
-            'postprocessors': [{
-                'key': 'FFmpegExtractAudio',
-                'preferredcodec': options.audio_format.value,
-                'preferredquality': options.audio_bitrate.value.replace('k', ''),
-            }],
-        }
+        ydl_opts = self._base_ydl_opts()
+        ydl_opts['outtmpl'] = output_template
+        ydl_opts['postprocessors'] = [{
+            'key': 'FFmpegExtractAudio',
+            'preferredcodec': options.audio_format.value,
+            'preferredquality': options.audio_bitrate.value.replace('k', ''),
+        }]
 
         if progress_hook:
             ydl_opts['progress_hooks'] = [progress_hook]
@@ -101,8 +78,11 @@ class YtDlpEngine:
         try:
             with yt_dlp.YoutubeDL(ydl_opts) as ydl:
                 info = ydl.extract_info(search_query, download=True)
-                if 'entries' in info and info['entries']:
-                    entry = info['entries'][0]
+                if 'entries' in info:
+                    entries = [e for e in (info.get('entries') or []) if e]
+                    if not entries:
+                        raise ExtractionError(f"No search results for {search_query}")
+                    entry = entries[0]
                 else:
                     entry = info
 
@@ -121,6 +101,71 @@ class YtDlpEngine:
         except Exception as e:
             raise ExtractionError(f"Extraction failed for {track.title}: {str(e)}")
 
+    def resolve_audio_stream(self, track: TrackInfo) -> Dict[str, Any]:
+        """
+        Resolve the direct URL of the best audio stream without downloading it.
+        Returns url, http_headers, ext, abr (kbps, may be None), filesize (may be None) and the yt-dlp info dict.
+        """
+        ydl_opts = self._base_ydl_opts()
+        try:
+            with yt_dlp.YoutubeDL(ydl_opts) as ydl:
+                info = ydl.extract_info(self._build_search_query(track), download=False)
+        except Exception as e:
+            raise ExtractionError(f"Stream resolution failed for {track.title}: {str(e)}")
+
+        if info and 'entries' in info:
+            entries = [e for e in (info.get('entries') or []) if e]
+            info = entries[0] if entries else None
+        if not info or not info.get('url'):
+            raise ExtractionError(f"No direct audio stream found for {track.title}")
+
+        return {
+            'url': info['url'],
+            'http_headers': info.get('http_headers') or ydl_opts['http_headers'],
+            'ext': info.get('ext') or 'webm',
+            'abr': info.get('abr'),
+            'filesize': info.get('filesize') or info.get('filesize_approx'),
+            'info': info,
+        }
+
+    def source_key(self, track: TrackInfo) -> str:
+        """The URL or search query yt-dlp resolves for `track` (what a source failure is remembered under)."""
+        return self._build_search_query(track)
+
+    def _build_search_query(self, track: TrackInfo) -> str:
+        url = track.stream_url
+        web_url = track.webpage_url or ""
+
+        # Spotify & metadata queries use official audio search to avoid music video intro dialogues
+        if not url or "spotify.com" in (url or "") or "spotify.com" in web_url or not url.startswith("http"):
+            return f"ytsearch1:{track.artist} - {track.title} official audio"
+        return url
+
+    def _base_ydl_opts(self) -> Dict[str, Any]:
+        return {
+            'format': 'bestaudio/best',
+            'quiet': True,
+            'no_warnings': True,
+            'ignoreerrors': False,
+            'retries': 10,
+            'fragment_retries': 10,
+            'extractor_args': {
+                'youtube': {
+                    'player_client': ['android', 'web'],
+                }
+            },
+            'http_headers': {
+                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/122.0.0.0 Safari/537.36',
+                'Accept-Language': 'en-US,en;q=0.9',
+            },
+        }
+
+    def target_path(self, track: TrackInfo, options: DownloadOptions, ext: str) -> Path:
+        """Where `download_track` would place `track` with extension `ext`."""
+        safe_artist = self._sanitize_filename(track.artist)
+        safe_title = self._sanitize_filename(track.title)
+        return Path(options.output_dir) / f"{safe_artist} - {safe_title}.{ext}"
+
     def _sanitize_filename(self, name: str) -> str:
         clean = re.sub(r'[\\/*?:"<>|]', "", name)
         return clean.strip()
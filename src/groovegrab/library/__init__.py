@@ -0,0 +1,3 @@
+"""
+GrooveGrab Local Library Index Module
+"""
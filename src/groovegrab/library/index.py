@@ -0,0 +1,362 @@
+"""
+Persistent Local Library Index (SQLite + FTS5)
+Stores one row per audio file (path, parsed artist/title, tags, duration, lyrics presence, mtime) and one row per
+directory (mtime + subdirectories), so a refresh costs a single stat() per unchanged folder instead of a full walk.
+"""
+
+import os
+import re
+import sqlite3
+from pathlib import Path
+from typing import Dict, Iterable, List, NamedTuple, Optional, Set, Tuple
+import numpy as np
+from platformdirs import user_data_dir
+
+from groovegrab.core.models import TrackInfo
+
+AUDIO_EXTENSIONS = {".mp3", ".flac", ".m4a", ".opus", ".wav", ".ogg"}
+
+FTS_TOKEN_REGEX = re.compile(r"\w+", re.UNICODE)
+
+
+class LibraryTrack(NamedTuple):
+    id: int
+    path: str
+    artist: str
+    title: str
+    album: Optional[str]
+    genre: Optional[str]
+    duration: Optional[float]
+    has_lyrics: bool
+
+    def to_track_info(self) -> TrackInfo:
+        return TrackInfo(
+            title=self.title,
+            artist=self.artist,
+            album=self.album,
+            genre=self.genre,
+            duration=int(self.duration) if self.duration else None,
+        )
+
+
+TRACK_COLUMNS = "t.id, t.path, t.artist, t.title, t.album, t.genre, t.duration, t.has_lyrics"
+
+
+def parse_stem(stem: str) -> Tuple[str, str]:
+    """`Artist - Title` file stems; anything else is treated as a bare title."""
+    if " - " in stem:
+        artist, title = stem.split(" - ", 1)
+    else:
+        artist, title = "Local Artist", stem
+    return artist.strip(), title.strip()
+
+
+def _read_tags(path: str) -> Dict[str, object]:
+    """Best-effort artist/title/album/genre/duration from embedded tags."""
+    try:
+        import mutagen
+
+        audio = mutagen.File(path, easy=True)
+    except Exception:
+        return {}
+    if audio is None:
+        return {}
+
+    tags: Dict[str, object] = {}
+    for key in ("artist", "title", "album", "genre"):
+        try:
+            values = audio.get(key) if audio.tags is not None else None
+        except Exception:
+            values = None
+        if values:
+            tags[key] = str(values[0]).strip() or None
+    length = getattr(getattr(audio, "info", None), "length", None)
+    if length:
+        tags["duration"] = float(length)
+    return tags
+
+
+def _prefix_bounds(root: str) -> Tuple[str, str]:
+    """Range [lo, hi) of path strings strictly inside `root` (index-friendly replacement for LIKE 'root/%')."""
+    lo = root.rstrip(os.sep) + os.sep
+    return lo, lo[:-1] + chr(ord(os.sep) + 1)
+
+
+class LibraryIndex:
+    def __init__(self, db_path: Optional[Path] = None, read_tags: bool = True):
+        if not db_path:
+            try:
+                data_dir = Path(user_data_dir("groovegrab"))
+                data_dir.mkdir(parents=True, exist_ok=True)
+                db_path = data_dir / "library.db"
+            except Exception:
+                data_dir = Path("./.groovegrab_config")
+                data_dir.mkdir(parents=True, exist_ok=True)
+                db_path = data_dir / "library.db"
+        self.db_path = db_path
+        self.read_tags = read_tags
+        self.has_fts = False
+        self._init_db()
+
+    def _get_connection(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.db_path, timeout=10)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA busy_timeout=10000")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    def _init_db(self):
+        with self._get_connection() as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS tracks (
+                        id INTEGER PRIMARY KEY,
+                        path TEXT NOT NULL UNIQUE,
+                        dir TEXT NOT NULL,
+                        stem TEXT NOT NULL,
+                        artist TEXT NOT NULL,
+                        title TEXT NOT NULL,
+                        album TEXT,
+                        genre TEXT,
+                        duration REAL,
+                        has_lyrics INTEGER NOT NULL DEFAULT 0,
+                        mtime_ns INTEGER NOT NULL,
+                        size INTEGER NOT NULL
+                    )
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_tracks_dir ON tracks(dir)")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS dirs (
+                        path TEXT PRIMARY KEY,
+                        mtime_ns INTEGER NOT NULL,
+                        subdirs TEXT NOT NULL
+                    )
+            """)
+            try:
+                conn.execute("""
+                    CREATE VIRTUAL TABLE IF NOT EXISTS tracks_fts USING fts5(
+                        stem, artist, title, album, genre,
+                        content='tracks', content_rowid='id', tokenize='unicode61 remove_diacritics 2'
+                    )
+                """)
+                conn.executescript("""
+                    CREATE TRIGGER IF NOT EXISTS tracks_fts_ai AFTER INSERT ON tracks BEGIN
+                        INSERT INTO tracks_fts(rowid, stem, artist, title, album, genre)
+                        VALUES (new.id, new.stem, new.artist, new.title, new.album, new.genre);
+                    END;
+                    CREATE TRIGGER IF NOT EXISTS tracks_fts_ad AFTER DELETE ON tracks BEGIN
+                        INSERT INTO tracks_fts(tracks_fts, rowid, stem, artist, title, album, genre)
+                        VALUES ('delete', old.id, old.stem, old.artist, old.title, old.album, old.genre);
+                    END;
+                    CREATE TRIGGER IF NOT EXISTS tracks_fts_au AFTER UPDATE ON tracks BEGIN
+                        INSERT INTO tracks_fts(tracks_fts, rowid, stem, artist, title, album, genre)
+                        VALUES ('delete', old.id, old.stem, old.artist, old.title, old.album, old.genre);
+                        INSERT INTO tracks_fts(rowid, stem, artist, title, album, genre)
+                        VALUES (new.id, new.stem, new.artist, new.title, new.album, new.genre);
+                    END;
+                """)
+                self.has_fts = True
+            except sqlite3.OperationalError:
+                # SQLite built without FTS5: search() falls back to LIKE over the stem column
+                self.has_fts = False
+            conn.commit()
+
+    # ------------------------------------------------------------------ incremental refresh
+
+    def refresh(self, root: Path) -> int:
+        """
+        Bring the index for `root` up to date. Folders whose mtime is unchanged are not listed again;
+        only files that were added, removed or changed (mtime/size) in changed folders are (re)read.
+        Returns the number of track rows written or deleted.
+        """
+        root_str = str(Path(root).expanduser().resolve())
+        lo, hi = _prefix_bounds(root_str)
+        changes = 0
+
+        with self._get_connection() as conn:
+            known: Dict[str, Tuple[int, List[str]]] = {}
+            for row in conn.execute(
+                "SELECT path, mtime_ns, subdirs FROM dirs WHERE path = ? OR (path >= ? AND path < ?)",
+                (root_str, lo, hi),
+            ):
+                known[row["path"]] = (row["mtime_ns"], row["subdirs"].split("\n") if row["subdirs"] else [])
+
+            seen: Set[str] = set()
+            stack = [root_str]
+            while stack:
+                directory = stack.pop()
+                try:
+                    dir_mtime = os.stat(directory).st_mtime_ns
+                except OSError:
+                    continue
+                seen.add(directory)
+
+                cached = known.get(directory)
+                if cached and cached[0] == dir_mtime:
+                    stack.extend(cached[1])
+                    continue
+
+                subdirs, written = self._scan_directory(conn, directory)
+                changes += written
+                conn.execute(
+                    "INSERT OR REPLACE INTO dirs (path, mtime_ns, subdirs) VALUES (?, ?, ?)",
+                    (directory, dir_mtime, "\n".join(subdirs)),
+                )
+                stack.extend(subdirs)
+
+            # Folders that disappeared since the last refresh
+            for directory in set(known) - seen:
+                conn.execute("DELETE FROM dirs WHERE path = ?", (directory,))
+                changes += conn.execute("DELETE FROM tracks WHERE dir = ?", (directory,)).rowcount
+            conn.commit()
+        return changes
+
+    def _scan_directory(self, conn: sqlite3.Connection, directory: str) -> Tuple[List[str], int]:
+        subdirs: List[str] = []
+        audio: Dict[str, os.stat_result] = {}
+        lrc_stems: Set[str] = set()
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            subdirs.append(entry.path)
+                            continue
+                        if not entry.is_file():
+                            continue
+                    except OSError:
+                        continue
+                    stem, ext = os.path.splitext(entry.name)
+                    ext = ext.lower()
+                    if ext == ".lrc":
+                        lrc_stems.add(stem)
+                    elif ext in AUDIO_EXTENSIONS:
+                        try:
+                            audio[entry.path] = entry.stat()
+                        except OSError:
+                            pass
+        except OSError:
+            return [], 0
+
+        written = 0
+        existing = {
+            row["path"]: row
+            for row in conn.execute("SELECT path, mtime_ns, size, has_lyrics FROM tracks WHERE dir = ?", (directory,))
+        }
+        for path in existing.keys() - audio.keys():
+            conn.execute("DELETE FROM tracks WHERE path = ?", (path,))
+            written += 1
+
+        for path, st in audio.items():
+            stem = os.path.splitext(os.path.basename(path))[0]
+            has_lyrics = 1 if stem in lrc_stems else 0
+            row = existing.get(path)
+            if row is not None and row["mtime_ns"] == st.st_mtime_ns and row["size"] == st.st_size:
+                if row["has_lyrics"] != has_lyrics:
+                    conn.execute("UPDATE tracks SET has_lyrics = ? WHERE path = ?", (has_lyrics, path))
+                    written += 1
+                continue
+
+            artist, title = parse_stem(stem)
+            tags = _read_tags(path) if self.read_tags else {}
+            conn.execute("""
+                    INSERT INTO tracks
+                    (path, dir, stem, artist, title, album, genre, duration, has_lyrics, mtime_ns, size)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                    ON CONFLICT(path) DO UPDATE SET
+                        stem = excluded.stem,
+                        artist = excluded.artist,
+                        title = excluded.title,
+                        album = excluded.album,
+                        genre = excluded.genre,
+                        duration = excluded.duration,
+                        has_lyrics = excluded.has_lyrics,
+                        mtime_ns = excluded.mtime_ns,
+                        size = excluded.size
+                """, (
+                    path,
+                    directory,
+                    stem,
+                    tags.get("artist") or artist,
+                    tags.get("title") or title,
+                    tags.get("album"),
+                    tags.get("genre"),
+                    tags.get("duration"),
+                    has_lyrics,
+                    st.st_mtime_ns,
+                    st.st_size,
+                ))
+            written += 1
+        return subdirs, written
+
+    # ------------------------------------------------------------------ queries
+
+    def tracks_under(self, root: Path) -> List[LibraryTrack]:
+        """Every indexed track below `root`, ordered by path."""
+        lo, hi = _prefix_bounds(str(Path(root).expanduser().resolve()))
+        with self._get_connection() as conn:
+            rows = conn.execute(
+                f"SELECT {TRACK_COLUMNS} FROM tracks t WHERE t.path >= ? AND t.path < ? ORDER BY t.path", (lo, hi)
+            ).fetchall()
+        return self._to_tracks(rows)
+
+    def track_ids_under(self, root: Path) -> np.ndarray:
+        """Row ids of every indexed track below `root` in path order, as a compact int64 array."""
+        lo, hi = _prefix_bounds(str(Path(root).expanduser().resolve()))
+        with self._get_connection() as conn:
+            cursor = conn.execute("SELECT id FROM tracks WHERE path >= ? AND path < ? ORDER BY path", (lo, hi))
+            return np.fromiter((row[0] for row in cursor), dtype=np.int64)
+
+    def get_track(self, track_id: int) -> Optional[LibraryTrack]:
+        with self._get_connection() as conn:
+            row = conn.execute(f"SELECT {TRACK_COLUMNS} FROM tracks t WHERE t.id = ?", (track_id,)).fetchone()
+        return self._to_tracks([row])[0] if row else None
+
+    def get_path(self, track_id: int) -> Optional[str]:
+        with self._get_connection() as conn:
+            row = conn.execute("SELECT path FROM tracks WHERE id = ?", (track_id,)).fetchone()
+        return row["path"] if row else None
+
+    def search(self, query: str, root: Optional[Path] = None, limit: Optional[int] = None) -> List[LibraryTrack]:
+        """
+        Tracks whose file name, artist, title, album or genre match every word of `query` (prefix match via FTS5).
+        Falls back to a case-insensitive substring match on the file name, the behaviour of the old disk walk.
+        """
+        clean_query = query.strip()
+        if not clean_query or (limit is not None and limit < 1):
+            return []
+        limit = -1 if limit is None else limit
+
+        where, params = "", []
+        if root is not None:
+            lo, hi = _prefix_bounds(str(Path(root).expanduser().resolve()))
+            where, params = " AND t.path >= ? AND t.path < ?", [lo, hi]
+
+        with self._get_connection() as conn:
+            rows: List[sqlite3.Row] = []
+            tokens = FTS_TOKEN_REGEX.findall(clean_query)
+            if self.has_fts and tokens:
+                match = " ".join('"' + token.replace('"', '""') + '"*' for token in tokens)
+                rows = conn.execute(
+                    f"SELECT {TRACK_COLUMNS} FROM tracks_fts "
+                    f"JOIN tracks t ON t.id = tracks_fts.rowid WHERE tracks_fts MATCH ?{where} ORDER BY t.path LIMIT ?",
+                    [match, *params, limit],
+                ).fetchall()
+            if not rows:
+                escaped = clean_query.lower().replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+                rows = conn.execute(
+                    f"SELECT {TRACK_COLUMNS} FROM tracks t "
+                    f"WHERE lower(t.stem) LIKE ? ESCAPE '\\'{where} ORDER BY t.path LIMIT ?",
+                    [f"%{escaped}%", *params, limit],
+                ).fetchall()
+        return self._to_tracks(rows)
+
+    @staticmethod
+    def _to_tracks(rows: Iterable[sqlite3.Row]) -> List[LibraryTrack]:
+        return [
+            LibraryTrack(
+                row["id"], row["path"], row["artist"], row["title"],
+                row["album"], row["genre"], row["duration"], bool(row["has_lyrics"]),
+            )
+            for row in rows
+        ]
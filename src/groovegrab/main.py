@@ -8,10 +8,12 @@ from rich.console import Console
 from groovegrab import __version__
 from groovegrab.cli.download import download_command
 from groovegrab.cli.search import search_command
-from groovegrab.cli.queue import queue_command
+from groovegrab.cli.queue import app as queue_app
 from groovegrab.cli.config import config_command, setup_command
 from groovegrab.cli.player import play_command
 from groovegrab.cli.lyrics import lyrics_command
+from groovegrab.cli.bench import app as bench_app
+from groovegrab.cli.worker import worker_command
 
 console = Console()
 
@@ -28,9 +30,11 @@ app.command(name="lyrics", help="Live real-time synced lyrics tracker for Spotif
 app.command(name="sync", help="Alias for live lyrics tracker")(lyrics_command)
 app.command(name="spotify", help="Alias for live Spotify lyrics tracker")(lyrics_command)
 app.command(name="search", help="Search songs interactively")(search_command)
-app.command(name="queue", help="View download queue history")(queue_command)
+app.add_typer(queue_app, name="queue", help="View download history and resume interrupted batches")
+app.command(name="worker", help="Drain the shared download queue (run several to download in parallel)")(worker_command)
 app.command(name="config", help="Manage configuration settings")(config_command)
 app.command(name="setup", help="Run interactive auto-selection setup wizard")(setup_command)
+app.add_typer(bench_app, name="bench", help="Run headless performance benchmarks")
 
 
 @app.callback(invoke_without_command=True)
@@ -9,8 +9,9 @@ import time
 import shutil
 import signal
 import subprocess
+import threading
 from pathlib import Path
-from typing import Optional
+from typing import List, Optional
 
 IS_WINDOWS = os.name == "nt"
 
@@ -28,6 +29,10 @@ class AudioDriver:
         self.volume = 0.8
         self.previous_volume = 0.8
         self.file_path: Optional[Path] = None
+        # Set while playing a file that is still being downloaded; the event fires once it is complete
+        self.growing: Optional[threading.Event] = None
+        # The running player follows the growing file (see _stop_following)
+        self.following = False
         
         self.player_cmd = self._detect_system_player()
 
@@ -37,12 +42,42 @@ class AudioDriver:
                 return cmd
         return None
 
-    def load_and_play(self, file_path: Path, start_offset: float = 0.0) -> bool:
+    def supports_growing_files(self) -> bool:
+        """Whether the detected player can follow a file that is still being written."""
+        return self.player_cmd in ("ffplay", "mpv")
+
+    def _source_args(self) -> List[str]:
+        # ffplay: the file protocol's follow mode waits for appended data instead of stopping at EOF;
+        # mpv: the appending:// protocol does the same. Once the download is complete play the plain file.
+        path = str(self.file_path)
+        self.following = self.growing is not None and not self.growing.is_set() and self.supports_growing_files()
+        if not self.following:
+            return [path]
+        if self.player_cmd == "ffplay":
+            return ["-follow", "1", "-rw_timeout", "5000000", f"file:{path}"]
+        return [f"appending://{path}"]
+
+    def _stop_following(self):
+        """
+        Once the download completes, replace a following player with one reading the plain file: at the true end
+        of file a follower only gives up after its read timeout, leaving seconds of silence.
+        """
+        if not self.following or not self.growing.is_set():
+            return
+        self.following = False
+        if self.is_paused:
+            # Resuming restarts the player on the plain file
+            self._terminate_proc()
+        else:
+            self._restart_at(self.get_position_sec())
+
+    def load_and_play(self, file_path: Path, start_offset: float = 0.0, growing: Optional[threading.Event] = None) -> bool:
         if not file_path.exists():
             return False
 
         self.stop()
         self.file_path = file_path
+        self.growing = growing
         self.is_loaded = True
         self.is_paused = False
         self.accumulated_time_sec = max(0.0, start_offset)
@@ -54,12 +89,12 @@ class AudioDriver:
             cmd = ["ffplay", "-nodisp", "-autoexit", "-loglevel", "quiet", "-volume", str(vol_val)]
             if start_offset > 0:
                 cmd.extend(["-ss", f"{start_offset:.2f}"])
-            cmd.append(str(file_path))
+            cmd.extend(self._source_args())
         elif self.player_cmd == "mpv":
             cmd = ["mpv", "--no-video", f"--volume={vol_val}"]
             if start_offset > 0:
                 cmd.extend([f"--start={start_offset:.2f}"])
-            cmd.append(str(file_path))
+            cmd.extend(self._source_args())
         elif self.player_cmd == "paplay":
             cmd = ["paplay", str(file_path)]
         elif self.player_cmd in ["vlc", "cvlc"]:
@@ -146,10 +181,11 @@ class AudioDriver:
         if self.file_path:
             vol_val = 0 if self.is_muted else int(self.volume * 100)
             if self.player_cmd == "ffplay":
-                cmd = ["ffplay", "-nodisp", "-autoexit", "-loglevel", "quiet", "-volume", str(vol_val), "-ss", f"{pos_sec:.2f}", str(self.file_path)]
+                cmd = ["ffplay", "-nodisp", "-autoexit", "-loglevel", "quiet", "-volume", str(vol_val), "-ss", f"{pos_sec:.2f}", *self._source_args()]
             elif self.player_cmd == "mpv":
-                cmd = ["mpv", "--no-video", f"--volume={vol_val}", f"--start={pos_sec:.2f}", str(self.file_path)]
+                cmd = ["mpv", "--no-video", f"--volume={vol_val}", f"--start={pos_sec:.2f}", *self._source_args()]
             else:
+                self.following = False
                 cmd = ["ffplay", "-nodisp", "-autoexit", "-loglevel", "quiet", "-ss", f"{pos_sec:.2f}", str(self.file_path)]
 
             try:
@@ -179,11 +215,13 @@ class AudioDriver:
     def is_busy(self) -> bool:
         if not self.is_loaded:
             return False
+        self._stop_following()
         if self.proc and self.proc.poll() is not None and not self.is_paused:
             return False
         return True
 
     def stop(self):
         self._terminate_proc()
+        self.following = False
         self.is_loaded = False
         self.is_paused = False
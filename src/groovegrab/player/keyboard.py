@@ -1,29 +1,175 @@
 """
 Cross-Platform Non-Blocking Keyboard Input Reader
-Supports Windows (msvcrt) and Unix (termios/tty/select)
+Supports Windows (msvcrt) and Unix (selectors + os.read with an incremental escape-sequence decoder)
 Safe handling for mouse scroll escape sequences without accidental TUI exit
 """
 
 import sys
 import os
-from typing import Optional
+import time
+import codecs
+from typing import List, Optional
 
 IS_WINDOWS = os.name == "nt"
 
 if IS_WINDOWS:
     import msvcrt
 else:
-    import select
+    import selectors
     import termios
     import tty
 
 
+# CSI final byte -> normalized key name (also used for SS3 `ESC O x` sequences)
+CSI_FINAL_KEYS = {
+    "A": "UP",
+    "B": "DOWN",
+    "C": "RIGHT",
+    "D": "LEFT",
+}
+
+# CSI `~` sequences: PageUp / PageDown behave like scroll up / down
+CSI_TILDE_KEYS = {
+    "5": "UP",
+    "6": "DOWN",
+}
+
+# SGR mouse button codes (`ESC [ < b ; x ; y M`): wheel up / down
+SGR_MOUSE_KEYS = {
+    "64": "UP",
+    "65": "DOWN",
+    "0": "UP",
+    "1": "DOWN",
+}
+
+# X10 mouse button bytes (`ESC [ M b x y`): wheel up / down
+X10_MOUSE_KEYS = {
+    chr(32 + 64): "UP",
+    chr(32 + 65): "DOWN",
+}
+
+
+class EscapeSequenceDecoder:
+    """
+    Incremental terminal input decoder.
+    Bytes may arrive split across reads; partial escape sequences are kept until the rest arrives.
+    """
+
+    GROUND = 0
+    ESCAPE = 1
+    CSI = 2
+    SS3 = 3
+    MOUSE_X10 = 4
+
+    MAX_SEQUENCE_LEN = 32
+
+    def __init__(self):
+        self._utf8 = codecs.getincrementaldecoder("utf-8")(errors="ignore")
+        self.state = self.GROUND
+        self.seq = ""
+
+    def feed(self, data: bytes) -> List[str]:
+        """Decode a chunk of raw bytes and return every complete key it contains, in order."""
+        keys: List[str] = []
+        for ch in self._utf8.decode(data):
+            key = self._step(ch)
+            if key:
+                keys.append(key)
+        return keys
+
+    def flush(self) -> List[str]:
+        """Called when the input went idle: a dangling lone ESC is dropped so it never triggers quit."""
+        self.state = self.GROUND
+        self.seq = ""
+        return []
+
+    def _step(self, ch: str) -> Optional[str]:
+        if self.state == self.GROUND:
+            if ch == "\x1b":
+                self.state = self.ESCAPE
+                return None
+            if ch == " ":
+                return "SPACE"
+            if ch in ("\r", "\n"):
+                return "ENTER"
+            return ch
+
+        if self.state == self.ESCAPE:
+            if ch == "[":
+                self.state = self.CSI
+                self.seq = ""
+            elif ch == "O":
+                self.state = self.SS3
+            elif ch == "\x1b":
+                # Double ESC: the first one was standalone, keep waiting on the second
+                pass
+            else:
+                # Alt+key: drop the modifier, ignore the key like the old reader did
+                self.state = self.GROUND
+            return None
+
+        if self.state == self.SS3:
+            self.state = self.GROUND
+            return CSI_FINAL_KEYS.get(ch)
+
+        if self.state == self.MOUSE_X10:
+            self.seq += ch
+            if len(self.seq) < 3:
+                return None
+            button = self.seq[0]
+            self.state = self.GROUND
+            self.seq = ""
+            return X10_MOUSE_KEYS.get(button)
+
+        # CSI: parameter/intermediate bytes until a final byte in 0x40-0x7E
+        if self.seq == "" and ch == "M":
+            self.state = self.MOUSE_X10
+            return None
+        if "\x40" <= ch <= "\x7e":
+            params = self.seq
+            self.state = self.GROUND
+            self.seq = ""
+            return self._decode_csi(params, ch)
+
+        self.seq += ch
+        if len(self.seq) >= self.MAX_SEQUENCE_LEN:
+            # Garbage or an unknown report: resynchronize instead of growing forever
+            self.state = self.GROUND
+            self.seq = ""
+        return None
+
+    def _decode_csi(self, params: str, final: str) -> Optional[str]:
+        if params.startswith("<"):
+            # SGR mouse report: only wheel / button presses (final "M") are mapped
+            if final != "M":
+                return None
+            button = params[1:].split(";", 1)[0]
+            return SGR_MOUSE_KEYS.get(button)
+        if final == "~":
+            return CSI_TILDE_KEYS.get(params.split(";", 1)[0])
+        return CSI_FINAL_KEYS.get(final)
+
+
+def coalesce_keys(keys: List[str]) -> List[str]:
+    """Collapse runs of the same key so a held key (arrow-seek, volume) acts once per frame instead of queueing up."""
+    collapsed: List[str] = []
+    for key in keys:
+        if not collapsed or collapsed[-1] != key:
+            collapsed.append(key)
+    return collapsed
+
+
 class NonBlockingKeyboard:
-    """Non-blocking single keypress reader context manager."""
+    """Non-blocking keypress reader context manager driven by a selector on stdin."""
+
+    READ_CHUNK = 4096
 
     def __init__(self):
         self.old_settings = None
         self.fd = None
+        self.selector = None
+        self.decoder = EscapeSequenceDecoder()
+        self.pending: List[str] = []
 
     def __enter__(self):
         if not IS_WINDOWS:
@@ -33,27 +179,101 @@ class NonBlockingKeyboard:
                 tty.setcbreak(self.fd)
             except Exception:
                 pass
+            if self.fd is not None:
+                try:
+                    self.selector = selectors.DefaultSelector()
+                    self.selector.register(self.fd, selectors.EVENT_READ)
+                except Exception:
+                    self.selector = None
         return self
 
     def __exit__(self, exc_type, exc_val, exc_tb):
+        if self.selector is not None:
+            try:
+                self.selector.close()
+            except Exception:
+                pass
+            self.selector = None
         if not IS_WINDOWS and self.old_settings and self.fd is not None:
             try:
                 termios.tcsetattr(self.fd, termios.TCSADRAIN, self.old_settings)
             except Exception:
                 pass
 
+    def wait_keys(self, timeout: float) -> List[str]:
+        """
+        Sleep until the next frame deadline or until input arrives, whichever is first.
+        Returns every key decoded from the bytes available at wake-up, with held-key repeats coalesced.
+        This is the frame scheduler's sleep: a keypress wakes the loop immediately so it can re-render.
+        """
+        timeout = max(0.0, timeout)
+        if IS_WINDOWS:
+            return self._wait_windows_keys(timeout)
+        if self.selector is None:
+            time.sleep(timeout)
+            return []
+
+        started = time.monotonic()
+        try:
+            ready = self.selector.select(timeout)
+        except (InterruptedError, OSError, ValueError):
+            return []
+        if not ready:
+            if timeout > 0:
+                self.decoder.flush()
+            return []
+
+        keys = self._drain()
+        if self.selector is None:
+            # stdin hit EOF (not a terminal): keep the frame pacing instead of spinning
+            time.sleep(max(0.0, timeout - (time.monotonic() - started)))
+        return coalesce_keys(keys)
+
     def read_key(self) -> Optional[str]:
         """Read a single key press without blocking. Returns normalized key name or None."""
-        if IS_WINDOWS:
-            return self._read_windows_key()
-        else:
-            return self._read_unix_key()
+        if not self.pending:
+            self.pending = self.wait_keys(0.0)
+        if self.pending:
+            return self.pending.pop(0)
+        return None
+
+    def _drain(self) -> List[str]:
+        keys: List[str] = []
+        while True:
+            try:
+                chunk = os.read(self.fd, self.READ_CHUNK)
+            except (BlockingIOError, InterruptedError):
+                break
+            except OSError:
+                break
+            if not chunk:
+                self.selector.close()
+                self.selector = None
+                break
+            keys.extend(self.decoder.feed(chunk))
+            if len(chunk) < self.READ_CHUNK:
+                break
+            if not self.selector.select(0):
+                break
+        return keys
+
+    def _wait_windows_keys(self, timeout: float) -> List[str]:
+        deadline = time.monotonic() + timeout
+        keys: List[str] = []
+        while True:
+            key = self._read_windows_key()
+            while key:
+                keys.append(key)
+                key = self._read_windows_key()
+            if keys or time.monotonic() >= deadline:
+                return coalesce_keys(keys)
+            time.sleep(min(0.005, max(0.0, deadline - time.monotonic())))
 
     def _read_windows_key(self) -> Optional[str]:
         try:
             if not msvcrt.kbhit():
                 return None
-            
+
             ch = msvcrt.getwch()
             if ch in ('\x00', '\xe0'):
                 if msvcrt.kbhit():
@@ -75,54 +295,3 @@ class NonBlockingKeyboard:
             return ch
         except Exception:
             return None
-
-    def _read_unix_key(self) -> Optional[str]:
-        try:
-            rlist, _, _ = select.select([sys.stdin], [], [], 0.002)
-            if not rlist:
-                return None
-
-            ch = sys.stdin.read(1)
-            if ch != '\x1b':
-                if ch == ' ':
-                    return "SPACE"
-                elif ch in ('\r', '\n'):
-                    return "ENTER"
-                return ch
-
-            # Non-blocking escape sequence payload reader
-            seq = ""
-            while True:
-                rlist2, _, _ = select.select([sys.stdin], [], [], 0.02)
-                if not rlist2:
-                    break
-                seq += sys.stdin.read(1)
-                if len(seq) >= 16:
-                    break
-
-            if not seq:
-                # Standalone ESC key press (Safely drop so it doesn't trigger quit)
-                return None
-
-            # Standard Arrow Keys
-            if seq == "[A":
-                return "UP"
-            elif seq == "[B":
-                return "DOWN"
-            elif seq == "[C":
-                return "RIGHT"
-            elif seq == "[D":
-                return "LEFT"
-
-            # Mouse wheel scroll sequences (SGR mode & normal tracking)
-            # Mouse scroll up: <64;, Ma, [5~, [A
-            if "<64;" in seq or "Ma" in seq or "[5~" in seq or "<0;" in seq:
-                return "UP"
-            # Mouse scroll down: <65;, Mb, [6~, [B
-            elif "<65;" in seq or "Mb" in seq or "[6~" in seq or "<1;" in seq:
-                return "DOWN"
-
-            # Safely ignore all unhandled mouse/terminal escape sequences without quitting
-            return None
-        except Exception:
-            return None
@@ -0,0 +1,182 @@
+"""
+Live PCM Source for the MPRIS Lyrics Visualizer
+Reads any raw s16le stream (a PulseAudio / PipeWire monitor through `parec`, a FIFO, another process) into an
+overwriting PcmRing and keeps a sliding-window FFT up to date as samples arrive, so the Spotify view shows the
+spectrum of what is actually playing instead of a procedural pulse.
+"""
+
+import os
+import shutil
+import subprocess
+import threading
+from pathlib import Path
+from typing import BinaryIO, List, Optional, Tuple
+
+import numpy as np
+
+from groovegrab.player.pcm_ring import PcmRing
+
+LIVE_SAMPLE_RATE = 44100
+LIVE_CHANNELS = 2
+FFT_WINDOW = 2048
+FFT_HOP = 512
+
+
+class LivePcmSource:
+    """
+    Spectrum source (see SpectrumDataEngine.attach_source) fed by a live s16le stream. A reader thread appends
+    to the ring and recomputes the FFT every `hop` frames; renders only pick up the latest result.
+    """
+
+    def __init__(
+        self,
+        command: Optional[List[str]] = None,
+        fifo_path: Optional[Path] = None,
+        sample_rate: int = LIVE_SAMPLE_RATE,
+        channels: int = LIVE_CHANNELS,
+        window_size: int = FFT_WINDOW,
+        hop: int = FFT_HOP,
+        buffer_sec: float = 1.0,
+    ):
+        if (command is None) == (fifo_path is None):
+            raise ValueError("Pass exactly one of command or fifo_path")
+        self.command = command
+        self.fifo_path = fifo_path
+        self.sample_rate = sample_rate
+        self.channels = channels
+        self.window_size = window_size
+        self.hop = hop
+        self.ring = PcmRing(max(int(sample_rate * buffer_sec), window_size * 2), channels, overwrite=True)
+
+        self._hann = np.hanning(window_size).astype(np.float32)
+        # (rms, |rfft|) of the newest window; replaced as a whole, so readers never see a half-updated pair
+        self._latest: Optional[Tuple[float, np.ndarray]] = None
+        self._proc: Optional[subprocess.Popen] = None
+        self._stream: Optional[BinaryIO] = None
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+
+    @classmethod
+    def pulse_monitor(cls, device: str = "@DEFAULT_MONITOR@") -> Optional["LivePcmSource"]:
+        """Capture what the default output device plays (PulseAudio or PipeWire's pulse server)."""
+        if not shutil.which("parec"):
+            return None
+        return cls(command=[
+            "parec", f"--device={device}", "--raw", "--format=s16le", f"--rate={LIVE_SAMPLE_RATE}",
+            f"--channels={LIVE_CHANNELS}", "--latency-msec=20", "--client-name=groovegrab-visualizer",
+        ])
+
+    @classmethod
+    def from_spec(cls, spec: str) -> Optional["LivePcmSource"]:
+        """`auto` / `pulse` (monitor capture), `none`, or a path to a FIFO carrying 44.1 kHz stereo s16le."""
+        spec = spec.strip()
+        if spec.lower() == "none":
+            return None
+        if spec.lower() in ("auto", "pulse"):
+            return cls.pulse_monitor()
+        return cls(fifo_path=Path(spec).expanduser())
+
+    # ------------------------------------------------------------------ lifecycle
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> bool:
+        if self.running:
+            return True
+        self._stop.clear()
+        if self.command is not None:
+            try:
+                self._proc = subprocess.Popen(
+                    self.command, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, stdin=subprocess.DEVNULL
+                )
+            except OSError:
+                return False
+        self._thread = threading.Thread(target=self._read_loop, name="groovegrab-live-pcm", daemon=True)
+        self._thread.start()
+        return True
+
+    def stop(self):
+        self._stop.set()
+        proc, self._proc = self._proc, None
+        if proc and proc.poll() is None:
+            try:
+                proc.terminate()
+                proc.wait(timeout=0.5)
+            except Exception:
+                try:
+                    proc.kill()
+                except Exception:
+                    pass
+        if self.fifo_path is not None and self._stream is None:
+            # The reader may still be blocked opening the FIFO: connect as a writer once to release it
+            try:
+                os.close(os.open(self.fifo_path, os.O_WRONLY | os.O_NONBLOCK))
+            except OSError:
+                pass
+        if self._thread:
+            self._thread.join(timeout=1.0)
+        self._thread = None
+
+    # ------------------------------------------------------------------ reader
+
+    def _open_stream(self) -> Optional[BinaryIO]:
+        if self._proc is not None:
+            return self._proc.stdout
+        try:
+            # Blocks until a writer connects
+            return open(self.fifo_path, "rb", buffering=0)
+        except OSError:
+            return None
+
+    def _read_loop(self):
+        frame_bytes = 2 * self.channels
+        read_bytes = self.hop * frame_bytes
+        while not self._stop.is_set():
+            stream = self._open_stream()
+            if stream is None:
+                return
+            self._stream = stream
+            pending = b""
+            next_fft = self.ring.write_pos + self.hop
+            try:
+                while not self._stop.is_set():
+                    chunk = stream.read(read_bytes)
+                    if not chunk:
+                        break
+                    chunk = pending + chunk
+                    usable = len(chunk) - len(chunk) % frame_bytes
+                    pending = chunk[usable:]
+                    if not usable:
+                        continue
+                    self.ring.write(np.frombuffer(chunk[:usable], dtype=np.int16))
+                    if self.ring.write_pos >= next_fft:
+                        self._update_fft()
+                        next_fft = self.ring.write_pos + self.hop
+            finally:
+                self._stream = None
+                if self._proc is None:
+                    stream.close()
+            if self._proc is not None:
+                # The capture process ended; a FIFO is reopened for the next writer
+                return
+
+    def _update_fft(self):
+        chunk = self.ring.latest_mono(self.window_size)
+        rms = float(np.sqrt(np.mean(chunk ** 2)))
+        self._latest = (rms, np.abs(np.fft.rfft(chunk * self._hann)))
+
+    # ------------------------------------------------------------------ spectrum source
+
+    def window(self, center_time_sec: float, num_samples: int) -> Optional[np.ndarray]:
+        """The newest `num_samples` (live audio has no timeline, so the requested time is ignored)."""
+        if self.ring.write_pos == 0:
+            return None
+        return self.ring.latest_mono(num_samples)
+
+    def magnitudes(self, window_size: int) -> Optional[Tuple[float, np.ndarray]]:
+        """(rms, |rfft|) of the newest window, computed by the reader thread; None until audio arrives."""
+        if window_size != self.window_size:
+            return None
+        return self._latest
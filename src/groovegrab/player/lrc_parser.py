@@ -1,11 +1,12 @@
 """
 Synced .lrc Timestamped Lyric Parser
-Robust parsing supporting [mm:ss.xx], [mm:ss.xxx], [offset:+/-ms], and word-level timing models.
+Single-pass parsing supporting [mm:ss.xx], [mm:ss.xxx], [offset:+/-ms] and enhanced LRC <mm:ss.xx> word timings.
+Returns lightweight slotted records; pydantic models are built only on request via to_model().
 """
 
 import re
 from pathlib import Path
-from typing import List, Optional
+from typing import List, Optional, Sequence, Union
 from pydantic import BaseModel, Field
 
 
@@ -22,17 +23,147 @@ class LrcLine(BaseModel):
     words: List[WordTiming] = Field(default_factory=list)
 
 
+class WordTimingRecord:
+    """Slotted counterpart of WordTiming produced by the parser."""
+
+    __slots__ = ("word", "start_sec", "end_sec")
+
+    def __init__(self, word: str, start_sec: float, end_sec: Optional[float] = None):
+        self.word = word
+        self.start_sec = start_sec
+        self.end_sec = end_sec
+
+    def to_model(self) -> WordTiming:
+        return WordTiming(word=self.word, start_sec=self.start_sec, end_sec=self.end_sec if self.end_sec is not None else self.start_sec)
+
+    def __repr__(self) -> str:
+        return f"WordTimingRecord({self.word!r}, {self.start_sec!r}, {self.end_sec!r})"
+
+
+class LrcLineRecord:
+    """
+    Slotted counterpart of LrcLine produced by the parser.
+    Enhanced-LRC word timings are decoded from the tagged source on first access to `words`.
+    """
+
+    __slots__ = ("timestamp_sec", "end_sec", "text", "_words", "_word_source", "_word_shift")
+
+    def __init__(
+        self,
+        timestamp_sec: float,
+        text: str,
+        end_sec: Optional[float] = None,
+        words: Optional[List[WordTimingRecord]] = None,
+    ):
+        self.timestamp_sec = timestamp_sec
+        self.end_sec = end_sec
+        self.text = text
+        self._words = words
+        self._word_source: Optional[str] = None
+        self._word_shift = 0.0
+
+    @property
+    def words(self) -> List[WordTimingRecord]:
+        if self._words is None:
+            self._words = _decode_word_tags(self._word_source, self._word_shift, self.end_sec) if self._word_source else []
+        return self._words
+
+    @words.setter
+    def words(self, value: List[WordTimingRecord]):
+        self._words = value
+
+    def to_row(self) -> list:
+        """Compact JSON-friendly form: [timestamp, end, text, word_source, word_shift] (words stay undecoded)."""
+        return [self.timestamp_sec, self.end_sec, self.text, self._word_source, self._word_shift]
+
+    @classmethod
+    def from_row(cls, row: Sequence) -> "LrcLineRecord":
+        record = cls(row[0], row[2], row[1])
+        record._word_source = row[3]
+        record._word_shift = row[4]
+        return record
+
+    def to_model(self) -> LrcLine:
+        return LrcLine(
+            timestamp_sec=self.timestamp_sec,
+            end_sec=self.end_sec,
+            text=self.text,
+            words=[w.to_model() for w in self.words],
+        )
+
+    def __repr__(self) -> str:
+        return f"LrcLineRecord({self.timestamp_sec!r}, {self.text!r}, end_sec={self.end_sec!r})"
+
+
+# Anything the players accept as a lyric line
+LyricLine = Union[LrcLine, LrcLineRecord]
+
+
+FRACTION_SCALE = {1: 10.0, 2: 100.0, 3: 1000.0}
+
+# Enhanced LRC word tag followed by its text: (minutes, seconds, fraction, text up to the next tag)
+WORD_TAG_REGEX = re.compile(r'<(\d{1,2}):(\d{2})(?:\.(\d{1,3}))?>([^<]*)')
+WORD_TAG_STRIP_REGEX = re.compile(r'<\d{1,2}:\d{2}(?:\.\d{1,3})?>')
+
+
+def _decode_word_tags(source: str, shift: float, line_end: Optional[float]) -> List[WordTimingRecord]:
+    """Decode `<mm:ss.xx>word <mm:ss.xx>word <mm:ss.xx>` into word timings shifted by `shift` seconds."""
+    words: List[WordTimingRecord] = []
+    for minutes, seconds, frac_str, chunk in WORD_TAG_REGEX.findall(source):
+        ts = int(minutes) * 60.0 + int(seconds) + (int(frac_str) / FRACTION_SCALE[len(frac_str)] if frac_str else 0.0)
+        ts = max(0.0, ts + shift)
+        if words and words[-1].end_sec is None:
+            words[-1].end_sec = ts
+        word = chunk.strip()
+        if word:
+            words.append(WordTimingRecord(word, ts))
+
+    # Last word runs until the line ends
+    if words and words[-1].end_sec is None:
+        words[-1].end_sec = max(words[-1].start_sec, line_end if line_end is not None else words[-1].start_sec)
+    return words
+
+
+def _parse_timestamp(tag: str) -> Optional[float]:
+    """Parse `mm:ss`, `mm:ss.xx` or `mm:ss.xxx` (no brackets) into seconds; None if it is not a timestamp."""
+    colon = tag.find(":")
+    if colon < 1 or colon > 2:
+        return None
+    minutes_str = tag[:colon]
+    rest = tag[colon + 1:]
+    dot = rest.find(".")
+    if dot < 0:
+        seconds_str, frac_str = rest, ""
+    else:
+        seconds_str, frac_str = rest[:dot], rest[dot + 1:]
+    if len(seconds_str) != 2 or not minutes_str.isdigit() or not seconds_str.isdigit():
+        return None
+    if frac_str and (len(frac_str) > 3 or not frac_str.isdigit()):
+        return None
+
+    # Normalize fraction of a second (tenths, centiseconds or milliseconds)
+    if len(frac_str) == 2:
+        frac = int(frac_str) / 100.0
+    elif len(frac_str) == 3:
+        frac = int(frac_str) / 1000.0
+    elif len(frac_str) == 1:
+        frac = int(frac_str) / 10.0
+    else:
+        frac = 0.0
+    return int(minutes_str) * 60.0 + int(seconds_str) + frac
+
+
 class LrcParser:
-    """Parses .lrc synced lyric files into cleanly sorted, timestamped sequence models."""
+    """Parses .lrc synced lyric files into cleanly sorted, timestamped sequence records."""
 
-    TIMESTAMP_REGEX = re.compile(r'\[(\d{1,2}):(\d{2})(?:\.(\d{2,3}))?\]')
-    OFFSET_REGEX = re.compile(r'\[offset:\s*([+-]?\d+)\s*\]', re.IGNORECASE)
+    # Only used for the rare lines that carry tags after the lyric text starts
+    TIMESTAMP_REGEX = re.compile(r'\[(\d{1,2}):(\d{2})(?:\.(\d{1,3}))?\]')
     METADATA_TAG_REGEX = re.compile(r'\[[a-zA-Z]{1,8}:.*?\]')
 
-    def parse_file(self, file_path: Path) -> List[LrcLine]:
+    def parse_file(self, file_path: Path) -> List[LrcLineRecord]:
         if not file_path.exists():
             return []
-        
+
         try:
             with open(file_path, "r", encoding="utf-8", errors="ignore") as f:
                 content = f.read()
@@ -40,65 +171,81 @@ class LrcParser:
         except Exception:
             return []
 
-    def parse_text(self, text: str) -> List[LrcLine]:
-        raw_lines = text.splitlines()
-        parsed: List[LrcLine] = []
-        global_offset_sec = 0.0
+    @staticmethod
+    def to_models(records: Sequence[LyricLine]) -> List[LrcLine]:
+        """Convert parser records into pydantic LrcLine models (for callers that need validation / serialization)."""
+        return [r.to_model() if isinstance(r, LrcLineRecord) else r for r in records]
 
-        # Check for [offset:+/-ms] tag
-        for line in raw_lines:
-            match = self.OFFSET_REGEX.search(line)
-            if match:
-                try:
-                    global_offset_sec = float(match.group(1)) / 1000.0
-                except ValueError:
-                    pass
+    def parse_text(self, text: str) -> List[LrcLineRecord]:
+        parsed: List[LrcLineRecord] = []
+        global_offset_sec = 0.0
 
-        for line in raw_lines:
+        for line in text.splitlines():
             line_str = line.strip()
-            if not line_str:
+            if not line_str or line_str[0] != "[":
                 continue
 
-            matches = list(self.TIMESTAMP_REGEX.finditer(line_str))
-            if not matches:
+            # Leading [..] tags: timestamps, [offset:..] and metadata tags
+            stamps: List[float] = []
+            pos = 0
+            while pos < len(line_str) and line_str[pos] == "[":
+                close = line_str.find("]", pos)
+                if close < 0:
+                    break
+                tag = line_str[pos + 1:close]
+                ts = _parse_timestamp(tag)
+                if ts is not None:
+                    stamps.append(ts)
+                elif tag[:7].lower() == "offset:":
+                    try:
+                        global_offset_sec = float(tag[7:].strip()) / 1000.0
+                    except ValueError:
+                        pass
+                pos = close + 1
+
+            if not stamps:
                 continue
 
-            # Strip timestamps and any metadata tags from lyric text
-            clean_text = self.TIMESTAMP_REGEX.sub('', line_str)
-            clean_text = self.METADATA_TAG_REGEX.sub('', clean_text).strip()
+            body = line_str[pos:]
+            if "[" in body:
+                # Timestamps or metadata tags after the text started (uncommon)
+                body = self.TIMESTAMP_REGEX.sub('', body)
+                body = self.METADATA_TAG_REGEX.sub('', body)
+
+            word_source = None
+            if "<" in body:
+                stripped = WORD_TAG_STRIP_REGEX.sub('', body)
+                if stripped != body:
+                    word_source, body = body, stripped
+            clean_text = body.strip()
             if not clean_text:
                 continue
 
-            for match in matches:
-                minutes = int(match.group(1))
-                seconds = int(match.group(2))
-                frac_str = match.group(3) or "0"
-                
-                # Normalize fraction of a second (centiseconds or milliseconds)
-                if len(frac_str) == 2:
-                    frac = int(frac_str) / 100.0
-                elif len(frac_str) == 3:
-                    frac = int(frac_str) / 1000.0
-                else:
-                    frac = 0.0
-
-                total_seconds = max(0.0, minutes * 60.0 + seconds + frac + global_offset_sec)
-                parsed.append(LrcLine(timestamp_sec=total_seconds, text=clean_text))
-
-        # Sort strictly by timestamp
+            first = stamps[0]
+            for ts in stamps:
+                record = LrcLineRecord(ts, clean_text)
+                if word_source is not None:
+                    # Repeated timestamps reuse the word tags, shifted to that occurrence
+                    record._word_source = word_source
+                    record._word_shift = ts - first
+                parsed.append(record)
+
+        # Sort strictly by timestamp (stable, so same-time lines keep file order)
         parsed.sort(key=lambda x: x.timestamp_sec)
 
-        # Remove duplicate consecutive lines at exact same timestamp
-        unique_parsed: List[LrcLine] = []
+        # Apply [offset:] (it may appear anywhere in the file), drop duplicate consecutive lines and compute end_sec
+        unique_parsed: List[LrcLineRecord] = []
         for line in parsed:
-            if not unique_parsed or abs(line.timestamp_sec - unique_parsed[-1].timestamp_sec) > 0.05 or line.text != unique_parsed[-1].text:
-                unique_parsed.append(line)
-
-        # Compute end_sec for each line
-        for i in range(len(unique_parsed)):
-            if i + 1 < len(unique_parsed):
-                unique_parsed[i].end_sec = unique_parsed[i + 1].timestamp_sec
-            else:
-                unique_parsed[i].end_sec = unique_parsed[i].timestamp_sec + 5.0
+            line.timestamp_sec = max(0.0, line.timestamp_sec + global_offset_sec)
+            line._word_shift += global_offset_sec
+            if unique_parsed:
+                prev = unique_parsed[-1]
+                if abs(line.timestamp_sec - prev.timestamp_sec) <= 0.05 and line.text == prev.text:
+                    continue
+                prev.end_sec = line.timestamp_sec
+            unique_parsed.append(line)
+
+        if unique_parsed:
+            unique_parsed[-1].end_sec = unique_parsed[-1].timestamp_sec + 5.0
 
         return unique_parsed
@@ -0,0 +1,93 @@
+"""
+Per-Track Lyric Timeline Index
+Sorted start times, couplet boundaries and typewriter reveal schedules built once per track,
+with a monotonic cursor (bisect fallback on seeks) shared by the offline and MPRIS players.
+"""
+
+from array import array
+from bisect import bisect_right
+from typing import List, Optional, Sequence, Tuple
+
+from groovegrab.player.lrc_parser import LyricLine
+from groovegrab.player.typewriter import TypewriterAnimator
+
+
+class LyricTimeline:
+    """Immutable lyric index for one track plus a playback cursor."""
+
+    def __init__(self, lines: Sequence[LyricLine], typewriter: Optional[TypewriterAnimator] = None):
+        self.lines: List[LyricLine] = sorted(lines, key=lambda line: line.timestamp_sec)
+        self.typewriter = typewriter or TypewriterAnimator()
+
+        self.starts = array("d", (line.timestamp_sec for line in self.lines))
+        # Couplet (top, bottom) line indices for every line: pairs 0-1, 2-3, 4-5, ...
+        self.couplets: List[Tuple[int, Optional[int]]] = [
+            ((idx // 2) * 2, (idx // 2) * 2 + 1 if (idx // 2) * 2 + 1 < len(self.lines) else None)
+            for idx in range(len(self.lines))
+        ]
+        self.reveal_durations = array("d", (self.typewriter.reveal_duration(line) for line in self.lines))
+        self.cursor = 0
+
+    def __len__(self) -> int:
+        return len(self.lines)
+
+    def __bool__(self) -> bool:
+        return bool(self.lines)
+
+    def active_index(self, current_time: float) -> Optional[int]:
+        """Index of the line being sung at `current_time`, or None before the first line."""
+        starts = self.starts
+        n = len(starts)
+        if n == 0 or current_time < starts[0]:
+            return None
+
+        # Normal playback moves forward by at most a line or two per frame
+        cursor = self.cursor
+        for candidate in (cursor, cursor + 1, cursor + 2):
+            if candidate < n and starts[candidate] <= current_time and (candidate + 1 == n or current_time < starts[candidate + 1]):
+                self.cursor = candidate
+                return candidate
+
+        # Seek (either direction): binary search
+        self.cursor = bisect_right(starts, current_time) - 1
+        return self.cursor
+
+    def active_line(self, current_time: float) -> Tuple[Optional[int], Optional[LyricLine]]:
+        idx = self.active_index(current_time)
+        if idx is None:
+            return None, None
+        return idx, self.lines[idx]
+
+    def render_couplet(self, current_time: float, color: str) -> str:
+        """
+        Renders exactly 2 lines in couplets (Pairs) with clear on transition:
+        - Couplet 1: Line 1 types -> Line 2 types below it while Line 1 stays -> CLR!
+        - Couplet 2: Line 3 types -> Line 4 types below it while Line 3 stays -> CLR!
+        - Zero dull preview text anywhere.
+        """
+        active_idx = self.active_index(current_time)
+        if active_idx is None:
+            return " \n "
+
+        pair_start, pair_bottom = self.couplets[active_idx]
+        line_top = self.lines[pair_start]
+
+        if active_idx == pair_start:
+            # First line of couplet is active and typing; second row is blank
+            rendered_top = self.typewriter.render_with_duration(
+                line_top, current_time, self.reveal_durations[pair_start], active_color=color
+            )
+            line1 = f" [{color}]>[/{color}] {rendered_top}[{color}]█[/{color}]"
+            line2 = " "
+        else:
+            # First line of couplet completed; second line is active and typing below it
+            line1 = f"   [{color}]{line_top.text}[/{color}]"
+            if pair_bottom is not None:
+                rendered_bottom = self.typewriter.render_with_duration(
+                    self.lines[pair_bottom], current_time, self.reveal_durations[pair_bottom], active_color=color
+                )
+                line2 = f" [{color}]>[/{color}] {rendered_bottom}[{color}]█[/{color}]"
+            else:
+                line2 = " "
+
+        return f"{line1}\n{line2}"
@@ -0,0 +1,132 @@
+"""
+Parsed Lyrics Cache & Per-Directory .lrc Index
+Parsed timelines are keyed by (path, mtime, size) and kept in memory plus a compact JSON form on disk;
+each folder's .lrc stems are indexed once (revalidated by the directory mtime) so sidecar lookup is a dict hit.
+"""
+
+import hashlib
+import json
+import os
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from groovegrab.player.lrc_parser import LrcLineRecord, LrcParser
+
+CacheKey = Tuple[str, int, int]
+
+CACHE_FORMAT_VERSION = 1
+
+
+class LyricsCache:
+    """Memory + disk cache of parsed .lrc files and a per-directory index of .lrc stems."""
+
+    def __init__(
+        self,
+        cache_dir: Optional[Path] = None,
+        parser: Optional[LrcParser] = None,
+        max_memory_entries: int = 256,
+    ):
+        self.cache_dir = cache_dir or Path.home() / ".cache" / "groovegrab" / "timelines"
+        self.parser = parser or LrcParser()
+        self.max_memory_entries = max_memory_entries
+        self._memory: "OrderedDict[CacheKey, List[LrcLineRecord]]" = OrderedDict()
+        # directory -> (directory mtime_ns, {lowercase stem: .lrc path})
+        self._dir_index: Dict[str, Tuple[int, Dict[str, Path]]] = {}
+
+    # ------------------------------------------------------------------ parsed timelines
+
+    def load(self, lrc_path: Path) -> List[LrcLineRecord]:
+        """Parsed lines of `lrc_path`, reparsing only when the file's mtime or size changed."""
+        try:
+            st = os.stat(lrc_path)
+        except OSError:
+            return []
+        key: CacheKey = (str(lrc_path), st.st_mtime_ns, st.st_size)
+
+        lines = self._memory.get(key)
+        if lines is not None:
+            self._memory.move_to_end(key)
+            return lines
+
+        lines = self._read_disk(key)
+        if lines is None:
+            lines = self.parser.parse_file(lrc_path)
+            self._write_disk(key, lines)
+
+        self._memory[key] = lines
+        if len(self._memory) > self.max_memory_entries:
+            self._memory.popitem(last=False)
+        return lines
+
+    def _disk_path(self, path_str: str) -> Path:
+        # One entry per .lrc path: a changed file simply overwrites its stale entry
+        return self.cache_dir / f"{hashlib.md5(path_str.encode('utf-8')).hexdigest()}.json"
+
+    def _read_disk(self, key: CacheKey) -> Optional[List[LrcLineRecord]]:
+        try:
+            with open(self._disk_path(key[0]), "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("v") != CACHE_FORMAT_VERSION or tuple(data.get("k", ())) != key:
+                return None
+            return [LrcLineRecord.from_row(row) for row in data["l"]]
+        except (OSError, ValueError, KeyError, IndexError, TypeError):
+            return None
+
+    def _write_disk(self, key: CacheKey, lines: List[LrcLineRecord]):
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            payload = {"v": CACHE_FORMAT_VERSION, "k": list(key), "l": [line.to_row() for line in lines]}
+            target = self._disk_path(key[0])
+            temp = target.with_suffix(".tmp")
+            with open(temp, "w", encoding="utf-8") as f:
+                json.dump(payload, f, ensure_ascii=False, separators=(",", ":"))
+            os.replace(temp, target)
+        except (OSError, TypeError, ValueError):
+            pass
+
+    # ------------------------------------------------------------------ directory index
+
+    def _stems_for(self, directory: Path) -> Dict[str, Path]:
+        dir_key = str(directory)
+        try:
+            dir_mtime = os.stat(directory).st_mtime_ns
+        except OSError:
+            self._dir_index.pop(dir_key, None)
+            return {}
+
+        cached = self._dir_index.get(dir_key)
+        if cached and cached[0] == dir_mtime:
+            return cached[1]
+
+        stems: Dict[str, Path] = {}
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    name = entry.name
+                    if name[-4:].lower() == ".lrc" and entry.is_file():
+                        stems.setdefault(name[:-4].lower(), Path(entry.path))
+        except OSError:
+            return {}
+        self._dir_index[dir_key] = (dir_mtime, stems)
+        return stems
+
+    def find_lrc_candidates(self, audio_path: Path) -> Iterator[Path]:
+        """
+        Yields .lrc files in the audio file's folder that may belong to it: the exact stem first (one dict lookup),
+        then, only if the caller keeps asking, stems that contain or are contained in the audio stem.
+        """
+        stems = self._stems_for(audio_path.parent)
+        if not stems:
+            return
+
+        stem_lower = audio_path.stem.lower()
+        exact = stems.get(stem_lower)
+        if exact:
+            yield exact
+        for lrc_stem, lrc_path in list(stems.items()):
+            if lrc_stem != stem_lower and (lrc_stem in stem_lower or stem_lower in lrc_stem):
+                yield lrc_path
+
+    def invalidate_directory(self, directory: Path):
+        self._dir_index.pop(str(directory), None)
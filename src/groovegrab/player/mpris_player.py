@@ -12,14 +12,18 @@ from rich.text import Text
 
 from groovegrab.engines.mpris_engine import MprisEngine, MprisTrackInfo
 from groovegrab.engines.lyric_fetcher import LyricFetcher
-from groovegrab.player.lrc_parser import LrcParser, LrcLine
+from groovegrab.player.lrc_parser import LrcParser, LyricLine
 from groovegrab.player.typewriter import TypewriterAnimator
+from groovegrab.player.lyric_timeline import LyricTimeline
 from groovegrab.player.keyboard import NonBlockingKeyboard
+from groovegrab.player.live_source import LivePcmSource
 from groovegrab.player.themes import get_theme, next_theme_name, Theme
 from groovegrab.player.visualizer import AudioSpectrumVisualizer, VisualizerMode, next_visualizer_mode
 
 console = Console()
 
+FRAME_INTERVAL = 1.0 / 30.0
+
 
 class MprisLiveLyricsPlayer:
     """Live terminal synchronized lyrics displayer with 2-line couplet lyrics and bottom CAVA visualizer."""
@@ -28,20 +32,26 @@ class MprisLiveLyricsPlayer:
         self,
         player_name: Optional[str] = None,
         theme_name: str = "cava",
-        initial_mode: VisualizerMode = VisualizerMode.BARS
+        initial_mode: VisualizerMode = VisualizerMode.BARS,
+        live_source: Optional[LivePcmSource] = None,
     ):
         self.engine = MprisEngine()
         self.fetcher = LyricFetcher()
         self.parser = LrcParser()
         self.typewriter = TypewriterAnimator()
         self.visualizer = AudioSpectrumVisualizer(num_bars=48)
+        self.visualizer.truecolor = console.color_system == "truecolor"
         
+        # Real audio for the spectrum (e.g. the PulseAudio monitor); without it the visualizer is procedural
+        self.live_source = live_source
+
         self.target_player = player_name
         self.theme_name = theme_name.lower()
         self.mode = initial_mode
 
         self.current_track: Optional[MprisTrackInfo] = None
-        self.current_lyrics: List[LrcLine] = []
+        self.current_lyrics: List[LyricLine] = []
+        self.timeline = LyricTimeline([], self.typewriter)
         self.last_track_signature: str = ""
 
     def start(self):
@@ -51,10 +61,23 @@ class MprisLiveLyricsPlayer:
             console.print("[bold yellow][Warning] No active media players found on D-Bus.[/bold yellow]")
             console.print("[dim]Please start Spotify or another media player and play a song.[/dim]\n")
 
+        if self.live_source is not None and self.live_source.start():
+            self.visualizer.engine.attach_source(self.live_source)
+        try:
+            self._run_loop()
+        finally:
+            if self.live_source is not None:
+                self.live_source.stop()
+                self.visualizer.engine.attach_source(None)
+
+        console.print("[bold green][Lyrics tracker stopped][/bold green]")
+
+    def _run_loop(self):
         with NonBlockingKeyboard() as kbd:
             with console.screen():
-                with Live(self._build_screen(0.0), console=console, refresh_per_second=30, screen=True) as live:
+                with Live(self._build_screen(0.0), console=console, auto_refresh=False, screen=True) as live:
                     last_poll_time = 0.0
+                    next_frame = time.monotonic()
 
                     while True:
                         now = time.monotonic()
@@ -70,30 +93,33 @@ class MprisLiveLyricsPlayer:
                         else:
                             current_pos = 0.0
 
-                        live.update(self._build_screen(current_pos))
-
-                        # Handle keyboard interactions
-                        key = kbd.read_key()
-                        if key:
-                            if key.lower() == 'q' or key == 'ESC':
-                                break
-                            elif key == 'SPACE':
-                                self.engine.play_pause(self.current_track.player_name if self.current_track else None)
-                                self._poll_mpris()
-                            elif key.lower() in ('n', 'right'):
-                                self.engine.next_track(self.current_track.player_name if self.current_track else None)
-                                self._poll_mpris()
-                            elif key.lower() in ('p', 'left'):
-                                self.engine.previous_track(self.current_track.player_name if self.current_track else None)
-                                self._poll_mpris()
-                            elif key.lower() == 't':
-                                self.theme_name = next_theme_name(self.theme_name)
-                            elif key.lower() == 'v':
-                                self.mode = next_visualizer_mode(self.mode)
-
-                        time.sleep(0.025)
+                        live.update(self._build_screen(current_pos), refresh=True)
 
-        console.print("[bold green][Lyrics tracker stopped][/bold green]")
+                        # Sleep until the next frame or wake on input; keys re-render immediately
+                        now = time.monotonic()
+                        if next_frame <= now:
+                            next_frame = now + FRAME_INTERVAL
+                        if any(self._handle_key(key) == "quit" for key in kbd.wait_keys(next_frame - now)):
+                            break
+
+    def _handle_key(self, key: str) -> Optional[str]:
+        """Apply a single key. Returns "quit" when the tracker should stop."""
+        if key.lower() == 'q' or key == 'ESC':
+            return "quit"
+        elif key == 'SPACE':
+            self.engine.play_pause(self.current_track.player_name if self.current_track else None)
+            self._poll_mpris()
+        elif key.lower() in ('n', 'right'):
+            self.engine.next_track(self.current_track.player_name if self.current_track else None)
+            self._poll_mpris()
+        elif key.lower() in ('p', 'left'):
+            self.engine.previous_track(self.current_track.player_name if self.current_track else None)
+            self._poll_mpris()
+        elif key.lower() == 't':
+            self.theme_name = next_theme_name(self.theme_name)
+        elif key.lower() == 'v':
+            self.mode = next_visualizer_mode(self.mode)
+        return None
 
     def _poll_mpris(self):
         track_info = self.engine.get_track_info(self.target_player)
@@ -120,6 +146,7 @@ class MprisLiveLyricsPlayer:
             self.current_lyrics = self.parser.parse_text(synced_text)
         else:
             self.current_lyrics = []
+        self.timeline = LyricTimeline(self.current_lyrics, self.typewriter)
 
     def _build_screen(self, current_pos: float) -> Text:
         theme = get_theme(self.theme_name)
@@ -156,13 +183,14 @@ class MprisLiveLyricsPlayer:
             mirror=False
         )
 
+        # Header and lyrics are short markup; the visualizer arrives as a pre-styled Text
         body_parts = [header_str]
         if lyrics_str:
             body_parts.append(lyrics_str)
-        body_parts.append(viz_output)
 
-        full_content = "\n".join(body_parts)
-        text_obj = Text.from_markup(full_content)
+        text_obj = Text.from_markup("\n".join(body_parts))
+        text_obj.append("\n")
+        text_obj.append_text(viz_output)
         text_obj.no_wrap = True
         return text_obj
 
@@ -188,50 +216,5 @@ class MprisLiveLyricsPlayer:
         return f" [{theme.header}]> {player_label} {title} - {artist}[/{theme.header}]  {status_badge}  [{theme.header}]{time_str}[/{theme.header}] {progress_bar}"
 
     def _render_lyrics_2lines(self, current_pos: float, theme: Theme) -> str:
-        """
-        Renders exactly 2 lines in couplets (Pairs) with clear on transition:
-        - Couplet 1: Line 1 types -> Line 2 types below it while Line 1 stays -> CLR!
-        - Couplet 2: Line 3 types -> Line 4 types below it while Line 3 stays -> CLR!
-        - Zero dull preview text anywhere.
-        """
-        if not self.current_lyrics:
-            return " \n "
-
-        # 1. Before first lyric: Both rows blank (no dull text)
-        if current_pos < self.current_lyrics[0].timestamp_sec:
-            return " \n "
-
-        # 2. Find active line index
-        active_idx = 0
-        for idx, line in enumerate(self.current_lyrics):
-            if current_pos >= line.timestamp_sec:
-                active_idx = idx
-
-        # Couplet pair base index (0, 2, 4, 6, ...)
-        pair_start = (active_idx // 2) * 2
-        line_top = self.current_lyrics[pair_start]
-        line_bottom = self.current_lyrics[pair_start + 1] if pair_start + 1 < len(self.current_lyrics) else None
-
-        if active_idx == pair_start:
-            # First line of couplet is active and typing; second row is blank
-            rendered_top = self.typewriter.render_active_line(
-                line_top,
-                current_pos,
-                active_color=f"{theme.header}"
-            )
-            line1 = f" [{theme.header}]>[/{theme.header}] {rendered_top}[{theme.header}]█[/{theme.header}]"
-            line2 = " "
-        else:
-            # First line of couplet completed; second line is active and typing below it
-            line1 = f"   [{theme.header}]{line_top.text}[/{theme.header}]"
-            if line_bottom:
-                rendered_bottom = self.typewriter.render_active_line(
-                    line_bottom,
-                    current_pos,
-                    active_color=f"{theme.header}"
-                )
-                line2 = f" [{theme.header}]>[/{theme.header}] {rendered_bottom}[{theme.header}]█[/{theme.header}]"
-            else:
-                line2 = " "
-
-        return f"{line1}\n{line2}"
+        """Renders exactly 2 lines in couplets (Line 1 -> Line 2 -> CLR) via the track's shared timeline index."""
+        return self.timeline.render_couplet(current_pos, theme.header)
@@ -0,0 +1,116 @@
+"""
+Vectorized Particle System for the PARTICLES Visualizer Mode
+Struct-of-arrays numpy buffers with fixed capacity: spawn, integrate, cull and rasterize are whole-array operations.
+"""
+
+from typing import Optional
+
+import numpy as np
+
+
+class ParticleSystem:
+    """Band-energy driven particle fountain. Alive particles are kept packed in the first `count` slots."""
+
+    GRAVITY = 0.55          # normalized screen heights / s^2
+    SPAWN_RATE = 900.0      # particles / s per band at full energy
+    MAX_LIFE_SEC = 2.2
+    GLYPHS = (ord("·"), ord("•"), ord("●"))
+
+    def __init__(self, capacity: int = 4096, seed: Optional[int] = None):
+        self.capacity = capacity
+        self.count = 0
+        self.rng = np.random.default_rng(seed)
+
+        # Positions are normalized to [0, 1) so terminal resizes need no state rewrite (y = 0 is the bottom)
+        self.pos_x = np.zeros(capacity, dtype=np.float32)
+        self.pos_y = np.zeros(capacity, dtype=np.float32)
+        self.vel_x = np.zeros(capacity, dtype=np.float32)
+        self.vel_y = np.zeros(capacity, dtype=np.float32)
+        self.life = np.zeros(capacity, dtype=np.float32)
+        self.color = np.zeros(capacity, dtype=np.int16)
+
+    def reset(self):
+        self.count = 0
+
+    def step(self, energies: np.ndarray, dt: float, num_colors: int):
+        """Advance the simulation by `dt` seconds: spawn from band energies, integrate, then cull."""
+        dt = float(max(0.0, min(dt, 0.1)))
+        if dt <= 0.0:
+            return
+        self._spawn(np.asarray(energies, dtype=np.float32), dt, max(1, num_colors))
+        self._integrate(dt)
+        self._cull()
+
+    def _spawn(self, energies: np.ndarray, dt: float, num_colors: int):
+        num_bands = len(energies)
+        free = self.capacity - self.count
+        if num_bands == 0 or free <= 0:
+            return
+
+        per_band = self.rng.poisson(np.square(energies) * self.SPAWN_RATE * dt)
+        total = int(per_band.sum())
+        if total <= 0:
+            return
+        if total > free:
+            # Scale every band down instead of starving the high-frequency end
+            per_band = np.floor(per_band * (free / total)).astype(np.int64)
+            total = int(per_band.sum())
+            if total <= 0:
+                return
+
+        band = np.repeat(np.arange(num_bands), per_band)
+        energy = energies[band]
+        s = slice(self.count, self.count + total)
+
+        self.pos_x[s] = (band + self.rng.random(total)) / num_bands
+        self.pos_y[s] = 0.0
+        self.vel_x[s] = self.rng.normal(0.0, 0.06, total)
+        self.vel_y[s] = 0.35 + energy * 1.1 + self.rng.random(total) * 0.15
+        self.life[s] = self.MAX_LIFE_SEC * (0.4 + 0.6 * self.rng.random(total))
+        self.color[s] = np.minimum(num_colors - 1, (energy * num_colors).astype(np.int16))
+        self.count += total
+
+    def _integrate(self, dt: float):
+        n = self.count
+        self.vel_y[:n] -= self.GRAVITY * dt
+        self.pos_x[:n] += self.vel_x[:n] * dt
+        self.pos_y[:n] += self.vel_y[:n] * dt
+        self.life[:n] -= dt
+
+    def _cull(self):
+        n = self.count
+        if n == 0:
+            return
+        alive = (
+            (self.life[:n] > 0.0)
+            & (self.pos_y[:n] >= 0.0) & (self.pos_y[:n] < 1.0)
+            & (self.pos_x[:n] >= 0.0) & (self.pos_x[:n] < 1.0)
+        )
+        keep = int(np.count_nonzero(alive))
+        if keep == n:
+            return
+        for buf in (self.pos_x, self.pos_y, self.vel_x, self.vel_y, self.life, self.color):
+            buf[:keep] = buf[:n][alive]
+        self.count = keep
+
+    def rasterize(self, width: int, height: int):
+        """
+        Returns (codes, colors): (height, width) grids of glyph code points and palette indices (-1 = empty).
+        Row 0 is the top of the screen.
+        """
+        codes = np.full((height, width), ord(" "), dtype=np.uint32)
+        colors = np.full((height, width), -1, dtype=np.int16)
+        n = self.count
+        if n == 0:
+            return codes, colors
+
+        cols = np.minimum((self.pos_x[:n] * width).astype(np.int32), width - 1)
+        rows = (height - 1) - np.minimum((self.pos_y[:n] * height).astype(np.int32), height - 1)
+        fade = np.clip(self.life[:n] / self.MAX_LIFE_SEC * len(self.GLYPHS), 0, len(self.GLYPHS) - 1).astype(np.int32)
+
+        # Brightest particle wins a shared cell: write in ascending color order so higher indices land last
+        order = np.argsort(self.color[:n], kind="stable")
+        rows, cols = rows[order], cols[order]
+        codes[rows, cols] = np.asarray(self.GLYPHS, dtype=np.uint32)[fade[order]]
+        colors[rows, cols] = self.color[:n][order]
+        return codes, colors
@@ -0,0 +1,473 @@
+"""
+In-Process PCM Audio Engine & Pluggable Sinks
+FFmpeg decodes each track once into a shared PcmRing; a sink thread feeds the ring to PulseAudio (pacat), ALSA
+(aplay), a file or nowhere, and the spectrum visualizer reads its analysis windows from the same ring.
+The number of frames handed to the sink, less what the sink still buffers, is the playback clock: pause, seek
+and volume act within that latency and lyrics follow the samples actually played.
+"""
+
+import shutil
+import subprocess
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import List, Optional, Union
+
+import numpy as np
+
+from groovegrab.core.models import AudioEngine
+from groovegrab.player.audio_driver import AudioDriver, IS_WINDOWS
+from groovegrab.player.pcm_ring import PcmRing
+
+SAMPLE_RATE = 44100
+CHANNELS = 2
+PERIOD_FRAMES = 1024
+# Capacity of a pipe we cannot resize (Linux default; macOS grows pipes up to the same size)
+DEFAULT_PIPE_BYTES = 65536
+
+
+class PcmSink:
+    """
+    Where decoded s16le frames go. `write` may block (that is what paces playback); `latency_sec` is how long
+    written audio takes to be heard.
+    """
+
+    latency_sec = 0.0
+
+    def open(self, sample_rate: int, channels: int):
+        self.sample_rate = sample_rate
+        self.channels = channels
+
+    def write(self, data: bytes):
+        raise NotImplementedError
+
+    def drain(self):
+        """Block until everything written has been played (end of track)."""
+
+    def close(self):
+        pass
+
+
+class PipeSink(PcmSink):
+    """
+    Raw PCM piped into `pacat` (PulseAudio / PipeWire) or `aplay` (ALSA). The pipe is unbuffered on our side and
+    shrunk to about one period, so its latency is the player's buffer plus that one period.
+    """
+
+    def __init__(self, player_cmd: str, latency_msec: int = 60):
+        self.player_cmd = player_cmd
+        self.device_latency_sec = latency_msec / 1000.0
+        self.latency_sec = self.device_latency_sec
+        self.proc: Optional[subprocess.Popen] = None
+
+    @classmethod
+    def detect(cls) -> Optional["PipeSink"]:
+        for cmd in ["pacat", "aplay"]:
+            if shutil.which(cmd):
+                return cls(cmd)
+        return None
+
+    def _command(self) -> List[str]:
+        latency_msec = int(self.device_latency_sec * 1000)
+        if self.player_cmd == "pacat":
+            return [
+                "pacat", "--playback", "--raw", "--format=s16le", f"--rate={self.sample_rate}",
+                f"--channels={self.channels}", f"--latency-msec={latency_msec}", "--client-name=groovegrab",
+            ]
+        return [
+            "aplay", "-q", "-t", "raw", "-f", "S16_LE", "-r", str(self.sample_rate), "-c", str(self.channels),
+            f"--buffer-time={latency_msec * 1000}",
+        ]
+
+    def open(self, sample_rate: int, channels: int):
+        super().open(sample_rate, channels)
+        self.proc = subprocess.Popen(
+            self._command(),
+            stdin=subprocess.PIPE,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            bufsize=0,
+            creationflags=subprocess.CREATE_NO_WINDOW if IS_WINDOWS else 0
+        )
+        pipe_bytes = self._shrink_pipe(PERIOD_FRAMES * 2 * channels)
+        self.latency_sec = self.device_latency_sec + pipe_bytes / (2 * channels * sample_rate)
+
+    def _shrink_pipe(self, size: int) -> int:
+        """Resize the pipe to the player (Linux only); returns its capacity in bytes."""
+        if sys.platform.startswith("linux"):
+            try:
+                import fcntl
+                fd = self.proc.stdin.fileno()
+                fcntl.fcntl(fd, fcntl.F_SETPIPE_SZ, size)
+                return fcntl.fcntl(fd, fcntl.F_GETPIPE_SZ)
+            except (ImportError, AttributeError, OSError):
+                pass
+        return DEFAULT_PIPE_BYTES
+
+    def write(self, data: bytes):
+        if self.proc is None or self.proc.stdin is None:
+            raise OSError("Audio sink is not open")
+        # Unbuffered: a write may be partial
+        view = memoryview(data)
+        while view:
+            view = view[self.proc.stdin.write(view):]
+
+    def drain(self):
+        proc = self.proc
+        if proc is None:
+            return
+        try:
+            proc.stdin.close()
+            proc.wait(timeout=self.latency_sec + 2.0)
+        except Exception:
+            return  # close() terminates it
+        self.proc = None
+
+    def close(self):
+        proc, self.proc = self.proc, None
+        if proc is None:
+            return
+        try:
+            if proc.stdin:
+                proc.stdin.close()
+            proc.terminate()
+            proc.wait(timeout=0.5)
+        except Exception:
+            try:
+                proc.kill()
+            except Exception:
+                pass
+
+
+class NullSink(PcmSink):
+    """Discards audio. With `realtime` it still consumes it at playback speed (headless boxes, benchmarks)."""
+
+    def __init__(self, realtime: bool = True):
+        self.realtime = realtime
+        self._deadline = 0.0
+
+    def open(self, sample_rate: int, channels: int):
+        super().open(sample_rate, channels)
+        self._deadline = time.monotonic()
+
+    def write(self, data: bytes):
+        if not self.realtime:
+            return
+        frames = len(data) // (2 * self.channels)
+        # Catch up after a stall instead of racing through the backlog
+        self._deadline = max(self._deadline, time.monotonic()) + frames / self.sample_rate
+        delay = self._deadline - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
+
+
+class FileSink(PcmSink):
+    """Writes raw interleaved s16le to a file as fast as it is decoded (tests, offline capture)."""
+
+    def __init__(self, path: Path):
+        self.path = path
+        self._file = None
+
+    def open(self, sample_rate: int, channels: int):
+        super().open(sample_rate, channels)
+        self._file = open(self.path, "wb")
+
+    def write(self, data: bytes):
+        self._file.write(data)
+
+    def close(self):
+        if self._file:
+            self._file.close()
+            self._file = None
+
+
+class PcmAudioEngine:
+    """Drop-in replacement for AudioDriver that plays through a PcmSink from a single in-process decode."""
+
+    def __init__(
+        self,
+        sink: Optional[PcmSink] = None,
+        sample_rate: int = SAMPLE_RATE,
+        channels: int = CHANNELS,
+        buffer_sec: float = 2.0,
+        history_sec: float = 0.25,
+    ):
+        self.sink = sink or PipeSink.detect() or NullSink()
+        self.sample_rate = sample_rate
+        self.channels = channels
+        self.ring = PcmRing(
+            int(sample_rate * (buffer_sec + history_sec)), channels, history_frames=int(sample_rate * history_sec)
+        )
+        self.player_cmd = "pcm"
+
+        self.is_loaded = False
+        self.is_paused = False
+        self.is_muted = False
+        self.volume = 0.8
+        self.previous_volume = 0.8
+        self.file_path: Optional[Path] = None
+        self.growing: Optional[threading.Event] = None
+        self.finished = False
+
+        # Clock: position = base_offset_sec + frames_played / sample_rate - sink latency
+        self.base_offset_sec = 0.0
+        self.frames_played = 0
+        self._clock_lock = threading.Lock()
+
+        self._decoder: Optional[subprocess.Popen] = None
+        # Follow-mode decoder ended because its download completed (see _stop_following)
+        self._unfollowed: Optional[subprocess.Popen] = None
+        self._decoder_lock = threading.Lock()
+        self._sink_thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self._resume = threading.Event()
+        self._resume.set()
+
+    @staticmethod
+    def is_available() -> bool:
+        return shutil.which("ffmpeg") is not None
+
+    def supports_growing_files(self) -> bool:
+        return True
+
+    # ------------------------------------------------------------------ transport
+
+    def load_and_play(self, file_path: Path, start_offset: float = 0.0, growing: Optional[threading.Event] = None) -> bool:
+        if not file_path.exists():
+            return False
+
+        self.stop()
+        self.file_path = file_path
+        self.growing = growing
+        self.is_paused = False
+        self._resume.set()
+        if not self._start_decoder(max(0.0, start_offset)):
+            return False
+
+        self.is_loaded = True
+        self._ensure_sink()
+        return True
+
+    def get_position_sec(self) -> float:
+        if not self.is_loaded:
+            return 0.0
+        with self._clock_lock:
+            played = self.frames_played / self.sample_rate
+            base = self.base_offset_sec
+        return base + max(0.0, played - self.sink.latency_sec)
+
+    def toggle_pause(self):
+        if not self.is_loaded:
+            return
+        self.is_paused = not self.is_paused
+        if self.is_paused:
+            self._resume.clear()
+        else:
+            self._resume.set()
+
+    def seek_relative(self, delta_sec: float):
+        if not self.is_loaded or not self.file_path:
+            return
+        if self._start_decoder(max(0.0, self.get_position_sec() + delta_sec)):
+            # Seeking back from the end of a track restarts the sink that had already finished
+            self._ensure_sink()
+
+    def change_volume(self, delta: float):
+        self.volume = max(0.0, min(1.0, self.volume + delta))
+        if self.is_muted and delta > 0:
+            self.is_muted = False
+
+    def toggle_mute(self):
+        if self.is_muted:
+            self.is_muted = False
+            self.volume = self.previous_volume or 0.8
+        else:
+            self.previous_volume = self.volume
+            self.is_muted = True
+            self.volume = 0.0
+
+    def is_busy(self) -> bool:
+        return self.is_loaded and not self.finished
+
+    def stop(self):
+        self._stop.set()
+        self._resume.set()
+        self._stop_decoder()
+        self.ring.reset()
+        if self._sink_thread and self._sink_thread is not threading.current_thread():
+            self._sink_thread.join(timeout=1.0)
+        self._sink_thread = None
+        self.is_loaded = False
+        self.is_paused = False
+
+    # ------------------------------------------------------------------ spectrum source
+
+    def window(self, center_time_sec: float, num_samples: int) -> Optional[np.ndarray]:
+        """Mono analysis window centred on `center_time_sec` (track time), or None when nothing is playing."""
+        if not self.is_loaded:
+            return None
+        with self._clock_lock:
+            center_frame = int((center_time_sec - self.base_offset_sec) * self.sample_rate)
+        return self.ring.window_mono(center_frame - num_samples // 2, num_samples)
+
+    # ------------------------------------------------------------------ decode
+
+    def _decode_command(self, start_offset: float, follow: bool) -> List[str]:
+        cmd = ["ffmpeg", "-loglevel", "quiet", "-nostdin"]
+        if start_offset > 0:
+            cmd += ["-ss", f"{start_offset:.3f}"]
+        source = str(self.file_path)
+        if follow:
+            cmd += ["-follow", "1", "-rw_timeout", "5000000"]
+            source = f"file:{source}"
+        return cmd + ["-i", source, "-vn", "-f", "s16le", "-ac", str(self.channels), "-ar", str(self.sample_rate), "pipe:1"]
+
+    def _spawn_decoder(self, start_offset: float, follow: bool) -> Optional[subprocess.Popen]:
+        try:
+            return subprocess.Popen(
+                self._decode_command(start_offset, follow),
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
+                stdin=subprocess.DEVNULL,
+                creationflags=subprocess.CREATE_NO_WINDOW if IS_WINDOWS else 0
+            )
+        except OSError:
+            return None
+
+    def _start_decoder(self, start_offset: float) -> bool:
+        self._stop_decoder()
+        self.ring.reset()
+        generation = self.ring.generation
+        with self._clock_lock:
+            self.base_offset_sec = start_offset
+            self.frames_played = 0
+        self.finished = False
+
+        # A file still being downloaded is followed (ffmpeg waits for appended data) until the download completes
+        growing = self.growing
+        follow = growing is not None and not growing.is_set()
+        proc = self._spawn_decoder(start_offset, follow)
+        if proc is None:
+            return False
+        with self._decoder_lock:
+            self._decoder = proc
+        threading.Thread(
+            target=self._pump_decoder, args=(proc, generation, start_offset), name="groovegrab-pcm-decode", daemon=True
+        ).start()
+        if follow:
+            threading.Thread(
+                target=self._stop_following, args=(proc, generation, growing), name="groovegrab-pcm-follow", daemon=True
+            ).start()
+        return True
+
+    def _stop_following(self, proc: subprocess.Popen, generation: int, growing: threading.Event):
+        """
+        End the follow-mode decoder once the download completes: at the true end of file it would only give up
+        after its read timeout. `_pump_decoder` carries on with a plain-file decoder where it stopped.
+        """
+        while not growing.wait(0.2):
+            if proc.poll() is not None or self.ring.generation != generation:
+                return
+        with self._decoder_lock:
+            if self._decoder is proc and proc.poll() is None:
+                self._unfollowed = proc
+                proc.terminate()
+
+    def _pump_decoder(self, proc: subprocess.Popen, generation: int, start_offset: float):
+        frame_bytes = 2 * self.channels
+        decoded = 0
+        while proc is not None:
+            pending = b""
+            while proc.stdout:
+                chunk = proc.stdout.read(PERIOD_FRAMES * frame_bytes * 4)
+                if not chunk:
+                    break
+                chunk = pending + chunk
+                usable = len(chunk) - len(chunk) % frame_bytes
+                pending = chunk[usable:]
+                if usable and not self.ring.write(np.frombuffer(chunk[:usable], dtype=np.int16), generation):
+                    break
+                decoded += usable // frame_bytes
+            proc = self._take_over(proc, generation, start_offset + decoded / self.sample_rate)
+        self.ring.mark_eof(generation)
+
+    def _take_over(self, proc: subprocess.Popen, generation: int, offset: float) -> Optional[subprocess.Popen]:
+        """The plain-file decoder continuing at `offset` when `_stop_following` ended `proc`, else None."""
+        with self._decoder_lock:
+            if self._unfollowed is not proc or self._decoder is not proc or self.ring.generation != generation:
+                return None
+            self._unfollowed = None
+            self._decoder = self._spawn_decoder(offset, follow=False)
+            return self._decoder
+
+    def _stop_decoder(self):
+        with self._decoder_lock:
+            proc, self._decoder = self._decoder, None
+            self._unfollowed = None
+        if proc and proc.poll() is None:
+            try:
+                proc.terminate()
+                proc.wait(timeout=0.5)
+            except Exception:
+                try:
+                    proc.kill()
+                except Exception:
+                    pass
+
+    # ------------------------------------------------------------------ sink
+
+    def _ensure_sink(self):
+        if self._sink_thread and self._sink_thread.is_alive():
+            return
+        self._stop.clear()
+        self._sink_thread = threading.Thread(target=self._sink_loop, name="groovegrab-pcm-sink", daemon=True)
+        self._sink_thread.start()
+
+    def _sink_loop(self):
+        try:
+            self.sink.open(self.sample_rate, self.channels)
+        except OSError:
+            self.finished = True
+            return
+
+        try:
+            while not self._stop.is_set():
+                if not self._resume.wait(0.1):
+                    continue
+                generation = self.ring.generation
+                block = self.ring.read(PERIOD_FRAMES, timeout=0.1)
+                if not len(block):
+                    if self.ring.drained and generation == self.ring.generation:
+                        # Let the sink play out what it has buffered before reporting the end
+                        self.sink.drain()
+                        self.finished = True
+                        break
+                    continue
+
+                gain = 0.0 if self.is_muted else self.volume
+                if gain != 1.0:
+                    block = (block * gain).astype(np.int16)
+                self.sink.write(block.tobytes())
+                with self._clock_lock:
+                    if generation == self.ring.generation:
+                        self.frames_played += len(block)
+        except (OSError, ValueError):
+            # The sink process died (device gone): report the track as over instead of hanging
+            self.finished = True
+        finally:
+            self.sink.close()
+
+
+def create_audio_engine(preference: Union[AudioEngine, str] = AudioEngine.AUTO) -> Union[AudioDriver, PcmAudioEngine]:
+    """
+    `pcm`: in-process engine (silent NullSink when neither pacat nor aplay exists); `external`: ffplay / mpv /
+    paplay / vlc processes; `auto`: the PCM engine when FFmpeg and a PulseAudio / ALSA sink are available.
+    """
+    preference = AudioEngine(preference)
+    if preference == AudioEngine.EXTERNAL or not PcmAudioEngine.is_available():
+        return AudioDriver()
+    sink = PipeSink.detect()
+    if preference == AudioEngine.AUTO and sink is None:
+        return AudioDriver()
+    return PcmAudioEngine(sink=sink)
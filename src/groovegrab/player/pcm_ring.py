@@ -0,0 +1,158 @@
+"""
+Shared PCM Ring Buffer
+Fixed-size ring of interleaved s16 frames addressed by absolute frame counters. One thread writes (a decoder or
+a live capture), one thread consumes (a playback sink), and any thread can copy out a mono analysis window.
+"""
+
+import threading
+from typing import Optional
+
+import numpy as np
+
+
+class PcmRing:
+    """
+    Single-producer / single-consumer PCM ring.
+
+    * blocking rings (playback) never overwrite frames the consumer has not read, nor the `history_frames`
+      just behind the read head that the spectrum still looks at; the writer sleeps until there is room.
+    * overwriting rings (live capture, no consumer) always accept writes and drop the oldest frames.
+
+    Writers and the consumer only take the lock to publish a counter or to sleep; `window_mono` never locks,
+    it copies straight out of the array (a frame being overwritten at that instant only affects the visual).
+    """
+
+    def __init__(self, capacity_frames: int, channels: int = 2, history_frames: int = 0, overwrite: bool = False):
+        if capacity_frames <= history_frames:
+            raise ValueError("Ring capacity must exceed the history it keeps")
+        self.capacity = capacity_frames
+        self.channels = channels
+        self.history_frames = history_frames
+        self.overwrite = overwrite
+        self._data = np.zeros((capacity_frames, channels), dtype=np.int16)
+        self._cond = threading.Condition()
+
+        self.write_pos = 0
+        self.read_pos = 0
+        self.eof = False
+        self.generation = 0
+
+    # ------------------------------------------------------------------ state
+
+    def reset(self):
+        """Drop everything (seek / new track). Writers and readers blocked on the old contents wake up."""
+        with self._cond:
+            self.generation += 1
+            self.write_pos = 0
+            self.read_pos = 0
+            self.eof = False
+            self._cond.notify_all()
+
+    def mark_eof(self, generation: Optional[int] = None):
+        with self._cond:
+            if generation is None or generation == self.generation:
+                self.eof = True
+                self._cond.notify_all()
+
+    @property
+    def available(self) -> int:
+        """Frames written but not yet consumed."""
+        return self.write_pos - self.read_pos
+
+    @property
+    def drained(self) -> bool:
+        return self.eof and self.read_pos >= self.write_pos
+
+    def _free(self) -> int:
+        oldest_kept = max(0, self.read_pos - self.history_frames)
+        return self.capacity - (self.write_pos - oldest_kept)
+
+    # ------------------------------------------------------------------ producer
+
+    def write(self, frames: np.ndarray, generation: Optional[int] = None) -> bool:
+        """
+        Append `frames` (int16, shape (n, channels) or flat interleaved). Returns False if the ring was reset
+        since `generation` was read (the frames belong to a stale decode) and nothing more should be written.
+        """
+        frames = np.asarray(frames, dtype=np.int16).reshape(-1, self.channels)
+        if generation is None:
+            generation = self.generation
+        if self.overwrite and len(frames) > self.capacity:
+            frames = frames[-self.capacity:]
+
+        offset = 0
+        while offset < len(frames):
+            if self.overwrite:
+                count = len(frames) - offset
+            else:
+                with self._cond:
+                    self._cond.wait_for(lambda: generation != self.generation or self._free() > 0)
+                    if generation != self.generation:
+                        return False
+                    count = min(len(frames) - offset, self._free())
+
+            self._copy_in(self.write_pos, frames[offset:offset + count])
+            with self._cond:
+                if generation != self.generation:
+                    return False
+                self.write_pos += count
+                if self.overwrite:
+                    self.read_pos = max(self.read_pos, self.write_pos - self.capacity)
+                self._cond.notify_all()
+            offset += count
+        return True
+
+    def _copy_in(self, position: int, frames: np.ndarray):
+        start = position % self.capacity
+        first = min(len(frames), self.capacity - start)
+        self._data[start:start + first] = frames[:first]
+        if first < len(frames):
+            self._data[:len(frames) - first] = frames[first:]
+
+    # ------------------------------------------------------------------ consumer
+
+    def read(self, max_frames: int, timeout: Optional[float] = None) -> np.ndarray:
+        """Consume up to `max_frames` (waits up to `timeout` for data). Empty at EOF, on timeout or after a reset."""
+        with self._cond:
+            generation = self.generation
+            self._cond.wait_for(
+                lambda: self.write_pos > self.read_pos or self.eof or generation != self.generation, timeout
+            )
+            count = min(max_frames, self.write_pos - self.read_pos)
+            if count <= 0 or generation != self.generation:
+                return np.zeros((0, self.channels), dtype=np.int16)
+            out = self._copy_out(self.read_pos, count)
+            self.read_pos += count
+            self._cond.notify_all()
+            return out
+
+    def _copy_out(self, position: int, count: int) -> np.ndarray:
+        start = position % self.capacity
+        first = min(count, self.capacity - start)
+        if first == count:
+            return self._data[start:start + count].copy()
+        return np.concatenate((self._data[start:], self._data[:count - first]))
+
+    # ------------------------------------------------------------------ analysis
+
+    def window_mono(self, start_frame: int, num_frames: int) -> np.ndarray:
+        """
+        Mono float32 samples for absolute frames [start_frame, start_frame + num_frames); frames that were never
+        written or have already been overwritten read as silence.
+        """
+        window = np.zeros(num_frames, dtype=np.float32)
+        write_pos = self.write_pos
+        lo = max(start_frame, write_pos - self.capacity, 0)
+        hi = min(start_frame + num_frames, write_pos)
+        if hi > lo:
+            frames = self._copy_out(lo, hi - lo)
+            if self.channels == 1:
+                window[lo - start_frame:hi - start_frame] = frames[:, 0]
+            else:
+                window[lo - start_frame:hi - start_frame] = frames.mean(axis=1)
+            window *= 1.0 / 32768.0
+        return window
+
+    def latest_mono(self, num_frames: int) -> np.ndarray:
+        """The most recent `num_frames` written (zero-padded at the front until that much exists)."""
+        return self.window_mono(self.write_pos - num_frames, num_frames)
@@ -0,0 +1,175 @@
+"""
+Lazy, Compact Playlist for Large Local Libraries
+Tracks are stored as library row ids or as one packed UTF-8 path blob with an offsets array;
+(path, TrackInfo, .lrc path) items are built only when the player asks for them, and shuffle is a permutation array.
+"""
+
+from collections import OrderedDict
+from pathlib import Path
+from typing import Callable, Iterable, Iterator, List, Optional, Sequence, Tuple, overload
+
+import numpy as np
+
+from groovegrab.core.models import TrackInfo
+from groovegrab.library.index import LibraryIndex, parse_stem
+
+PlaylistItem = Tuple[Path, TrackInfo, Optional[Path]]
+
+
+class PathArray:
+    """Immutable sequence of path strings packed into a single bytes blob (no per-path Python objects)."""
+
+    def __init__(self, paths: Iterable[str]):
+        encoded = [p.encode("utf-8", "surrogateescape") for p in paths]
+        self._blob = b"".join(encoded)
+        self._offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+        if encoded:
+            np.cumsum([len(e) for e in encoded], out=self._offsets[1:])
+
+    def __len__(self) -> int:
+        return len(self._offsets) - 1
+
+    def __getitem__(self, idx: int) -> str:
+        start, end = self._offsets[idx], self._offsets[idx + 1]
+        return self._blob[start:end].decode("utf-8", "surrogateescape")
+
+
+def _item_from_path(path: str) -> PlaylistItem:
+    audio_path = Path(path)
+    artist, title = parse_stem(audio_path.stem)
+    return audio_path, TrackInfo(title=title, artist=artist), audio_path.with_suffix(".lrc")
+
+
+class LazyPlaylist(Sequence[PlaylistItem]):
+    """
+    Sequence of playlist items resolved on demand. Only a handful of recently used items
+    (the current track and its neighbours) are kept built at any time.
+    """
+
+    def __init__(
+        self,
+        size: int,
+        resolve: Callable[[int], PlaylistItem],
+        key: Callable[[int], str],
+        cache_size: int = 8,
+    ):
+        self._size = size
+        self._items: Optional[List[PlaylistItem]] = None
+        self._resolve = resolve
+        self._key = key
+        self._order: Optional[np.ndarray] = None
+        self._cache: "OrderedDict[int, PlaylistItem]" = OrderedDict()
+        self._cache_size = cache_size
+
+    @classmethod
+    def from_paths(cls, paths: Iterable[Path]) -> "LazyPlaylist":
+        """Playlist over audio file paths (sorted), titles parsed from `Artist - Title` file names."""
+        packed = PathArray(sorted(str(p) for p in paths))
+        return cls(len(packed), lambda idx: _item_from_path(packed[idx]), packed.__getitem__)
+
+    @classmethod
+    def from_index(cls, index: LibraryIndex, root: Path) -> "LazyPlaylist":
+        """Playlist over every indexed track below `root`; rows are read from the index one at a time."""
+        ids = index.track_ids_under(root)
+
+        def resolve(idx: int) -> PlaylistItem:
+            track = index.get_track(int(ids[idx]))
+            if track is None:
+                # Removed from the library after the playlist was built
+                return Path(), TrackInfo(title="Missing track"), None
+            audio_path = Path(track.path)
+            return audio_path, track.to_track_info(), audio_path.with_suffix(".lrc")
+
+        return cls(len(ids), resolve, lambda idx: index.get_path(int(ids[idx])) or "")
+
+    @classmethod
+    def from_items(cls, items: List[PlaylistItem]) -> "LazyPlaylist":
+        """Wrap already-built items (single files, progressive downloads) in the same interface."""
+        playlist = cls(len(items), items.__getitem__, lambda idx: str(items[idx][0]), cache_size=0)
+        playlist._items = items
+        return playlist
+
+    def append(self, item: PlaylistItem):
+        """
+        Add an item after the last one (playlists built with `from_items` only), e.g. as background downloads
+        finish. While shuffled, new items are queued after the current permutation.
+        """
+        if self._items is None:
+            raise TypeError("Only playlists built from items can grow")
+        self._items.append(item)
+        if self._order is not None:
+            self._order = np.append(self._order, self._size)
+        self._size += 1
+
+    def __len__(self) -> int:
+        return self._size
+
+    @overload
+    def __getitem__(self, idx: int) -> PlaylistItem: ...
+
+    @overload
+    def __getitem__(self, idx: slice) -> List[PlaylistItem]: ...
+
+    def __getitem__(self, idx):
+        if isinstance(idx, slice):
+            return [self[i] for i in range(*idx.indices(self._size))]
+        if idx < 0:
+            idx += self._size
+        if idx < 0 or idx >= self._size:
+            raise IndexError("playlist index out of range")
+
+        source = int(self._order[idx]) if self._order is not None else idx
+        item = self._cache.get(source)
+        if item is not None:
+            self._cache.move_to_end(source)
+            return item
+
+        item = self._resolve(source)
+        if self._cache_size > 0:
+            self._cache[source] = item
+            if len(self._cache) > self._cache_size:
+                self._cache.popitem(last=False)
+        return item
+
+    def __iter__(self) -> Iterator[PlaylistItem]:
+        for idx in range(self._size):
+            yield self[idx]
+
+    def position_of(self, path: Path) -> Optional[int]:
+        """Playlist position of `path` without building any items, or None."""
+        target = str(path)
+        for idx in range(self._size):
+            source = int(self._order[idx]) if self._order is not None else idx
+            if self._key(source) == target:
+                return idx
+        return None
+
+    def shuffle(self, keep_first: Optional[int] = None, seed: Optional[int] = None) -> int:
+        """
+        Shuffle playback order with a permutation array; the item at position `keep_first` (e.g. the
+        current track) is moved to the front. Returns the new position of that item (0), or 0.
+        """
+        if self._size == 0:
+            return 0
+        anchor = None
+        if keep_first is not None:
+            anchor = int(self._order[keep_first]) if self._order is not None else keep_first
+
+        order = np.random.default_rng(seed).permutation(self._size)
+        if anchor is not None:
+            pos = int(np.flatnonzero(order == anchor)[0])
+            order[0], order[pos] = order[pos], order[0]
+        self._order = order
+        return 0
+
+    def unshuffle(self, keep: Optional[int] = None) -> int:
+        """Restore library order. Returns the new position of the item at position `keep` (or 0)."""
+        if self._order is None:
+            return keep or 0
+        source = int(self._order[keep]) if keep is not None else 0
+        self._order = None
+        return source
+
+    @property
+    def shuffled(self) -> bool:
+        return self._order is not None
@@ -3,19 +3,23 @@ Full-Screen CAVA-Style Live TUI Terminal Player UI Component
 Seamless offline playlist queue & single-track playback with real-time 2-line couplet lyrics (CLR between pairs) & bottom CAVA visualizer.
 """
 
+import threading
 import time
 from pathlib import Path
-from typing import List, Tuple, Optional
+from typing import Dict, List, Optional, Sequence
 
 from rich.console import Console
 from rich.live import Live
 from rich.text import Text
 
-from groovegrab.core.models import TrackInfo
-from groovegrab.player.audio_driver import AudioDriver
+from groovegrab.core.models import AudioEngine, TrackInfo
+from groovegrab.player.pcm_engine import PcmAudioEngine, create_audio_engine
 from groovegrab.player.keyboard import NonBlockingKeyboard
-from groovegrab.player.lrc_parser import LrcParser, LrcLine
+from groovegrab.player.lrc_parser import LrcParser, LyricLine
 from groovegrab.player.typewriter import TypewriterAnimator
+from groovegrab.player.lyric_timeline import LyricTimeline
+from groovegrab.player.lyrics_cache import LyricsCache
+from groovegrab.player.playlist import LazyPlaylist, PlaylistItem
 from groovegrab.player.visualizer import AudioSpectrumVisualizer, VisualizerMode, next_visualizer_mode
 from groovegrab.player.themes import get_theme, next_theme_name, Theme
 from groovegrab.engines.lyric_fetcher import LyricFetcher
@@ -23,7 +27,7 @@ from groovegrab.player.timing_chain import TimingChain
 
 console = Console()
 
-PlaylistItem = Tuple[Path, TrackInfo, Optional[Path]]
+FRAME_INTERVAL = 1.0 / 30.0
 
 
 class TerminalPlayer:
@@ -34,17 +38,26 @@ class TerminalPlayer:
         audio_path: Optional[Path] = None,
         track_info: Optional[TrackInfo] = None,
         lrc_path: Optional[Path] = None,
-        playlist: Optional[List[PlaylistItem]] = None,
+        playlist: Optional[Sequence[PlaylistItem]] = None,
         start_index: int = 0,
         theme_name: str = "cava",
         initial_mode: VisualizerMode = VisualizerMode.BARS,
+        growing_files: Optional[Dict[Path, threading.Event]] = None,
+        playlist_complete: Optional[threading.Event] = None,
+        audio_engine: AudioEngine = AudioEngine.AUTO,
     ):
-        if playlist:
-            self.playlist: List[PlaylistItem] = playlist
+        # Files still being downloaded (progressive playback) -> event set once the file is complete
+        self.growing_files: Dict[Path, threading.Event] = growing_files if growing_files is not None else {}
+        # Set once nothing more will be appended to the playlist (None: the playlist is already complete)
+        self.playlist_complete = playlist_complete
+        if isinstance(playlist, LazyPlaylist):
+            self.playlist = playlist
+        elif playlist:
+            self.playlist = LazyPlaylist.from_items(list(playlist))
         elif audio_path and track_info:
-            self.playlist = [(audio_path, track_info, lrc_path or audio_path.with_suffix(".lrc"))]
+            self.playlist = LazyPlaylist.from_items([(audio_path, track_info, lrc_path or audio_path.with_suffix(".lrc"))])
         else:
-            self.playlist = []
+            self.playlist = LazyPlaylist.from_items([])
 
         self.current_index = max(0, min(start_index, len(self.playlist) - 1)) if self.playlist else 0
         self.theme_name = theme_name.lower()
@@ -52,16 +65,22 @@ class TerminalPlayer:
         self.show_lyrics = True
         self.mirror_mode = False
 
-        self.driver = AudioDriver()
+        self.driver = create_audio_engine(audio_engine)
         self.lrc_parser = LrcParser()
+        self.lyrics_cache = LyricsCache(parser=self.lrc_parser)
         self.typewriter = TypewriterAnimator()
         self.visualizer = AudioSpectrumVisualizer(num_bars=48)
+        self.visualizer.truecolor = console.color_system == "truecolor"
+        if isinstance(self.driver, PcmAudioEngine):
+            # The spectrum reads the samples being played straight from the engine's ring: no second decode
+            self.visualizer.engine.attach_source(self.driver)
         self.timing_chain = TimingChain()
 
         self.audio_path: Optional[Path] = None
         self.track_info: Optional[TrackInfo] = None
         self.lrc_path: Optional[Path] = None
-        self.lyrics: List[LrcLine] = []
+        self.lyrics: List[LyricLine] = []
+        self.timeline = LyricTimeline([], self.typewriter)
 
         if self.playlist:
             self._load_track(self.current_index)
@@ -72,28 +91,40 @@ class TerminalPlayer:
 
         self.current_index = index
         self.audio_path, self.track_info, self.lrc_path = self.playlist[index]
-        self.visualizer.load_audio_file(self.audio_path)
+        growing = self._growing_event(self.audio_path)
+        # With the in-process engine attached, the visualizer reads the samples being played: nothing to decode
+        if self.visualizer.engine.source is None:
+            if growing is not None:
+                self.visualizer.load_growing_file(self.audio_path, growing)
+            else:
+                self.visualizer.load_audio_file(self.audio_path)
         self.lyrics = self._resolve_and_load_lyrics()
+        self.timeline = LyricTimeline(self.lyrics, self.typewriter)
+
+    def _growing_event(self, audio_path: Optional[Path]) -> Optional[threading.Event]:
+        if audio_path is None:
+            return None
+        event = self.growing_files.get(audio_path)
+        return event if event is not None and not event.is_set() else None
 
-    def _resolve_and_load_lyrics(self) -> List[LrcLine]:
+    def _resolve_and_load_lyrics(self) -> List[LyricLine]:
         if not self.audio_path or not self.track_info:
             return []
 
         # 1. Check exact .lrc path next to audio file
         if self.lrc_path and self.lrc_path.exists():
-            parsed = self.lrc_parser.parse_file(self.lrc_path)
+            parsed = self.lyrics_cache.load(self.lrc_path)
             if parsed:
                 return parsed
 
-        # 2. Check parent directory for matching .lrc files
-        if self.audio_path.parent.exists():
-            stem_lower = self.audio_path.stem.lower()
-            for lrc_candidate in self.audio_path.parent.glob("*.lrc"):
-                if lrc_candidate.stem.lower() in stem_lower or stem_lower in lrc_candidate.stem.lower():
-                    parsed = self.lrc_parser.parse_file(lrc_candidate)
-                    if parsed:
-                        self.lrc_path = lrc_candidate
-                        return parsed
+        # 2. Check parent directory for matching .lrc files (indexed once per folder)
+        for lrc_candidate in self.lyrics_cache.find_lrc_candidates(self.audio_path):
+            if lrc_candidate == self.lrc_path:
+                continue
+            parsed = self.lyrics_cache.load(lrc_candidate)
+            if parsed:
+                self.lrc_path = lrc_candidate
+                return parsed
 
         # 3. Query and cache offline
         fetcher = LyricFetcher()
@@ -104,6 +135,7 @@ class TerminalPlayer:
                 try:
                     offline_lrc = self.audio_path.with_suffix(".lrc")
                     fetcher.save_lrc_file(offline_lrc, synced_text)
+                    self.lyrics_cache.invalidate_directory(self.audio_path.parent)
                 except Exception:
                     pass
                 return parsed
@@ -117,54 +149,40 @@ class TerminalPlayer:
 
         with NonBlockingKeyboard() as kbd:
             with console.screen():
-                with Live(self._build_screen(0.0), console=console, refresh_per_second=30, screen=True) as live:
+                with Live(self._build_screen(0.0), console=console, auto_refresh=False, screen=True) as live:
                     while True:
-                        if not self.audio_path or not self.driver.load_and_play(self.audio_path):
+                        growing = self._growing_event(self.audio_path)
+                        if not self.audio_path or not self.driver.load_and_play(self.audio_path, growing=growing):
                             break
 
                         track_finished_naturally = False
+                        track_changed = False
+                        next_frame = time.monotonic()
                         while True:
                             if not self.driver.is_busy():
                                 track_finished_naturally = True
                                 break
 
                             current_time = self.driver.get_position_sec()
-                            live.update(self._build_screen(current_time))
-
-                            key = kbd.read_key()
-                            if key:
-                                if key.lower() == 'q' or key == 'ESC':
+                            live.update(self._build_screen(current_time), refresh=True)
+
+                            # Sleep until the next frame or wake on input; keys re-render immediately
+                            now = time.monotonic()
+                            if next_frame <= now:
+                                next_frame = now + FRAME_INTERVAL
+                            for key in kbd.wait_keys(next_frame - now):
+                                action = self._handle_key(key)
+                                if action == "quit":
                                     self.driver.stop()
                                     return
-                                elif key == 'SPACE':
-                                    self.driver.toggle_pause()
-                                elif key in ('LEFT', 'h'):
-                                    self.driver.seek_relative(-5.0)
-                                elif key in ('RIGHT', 'l'):
-                                    self.driver.seek_relative(+5.0)
-                                elif key in ('UP', 'k'):
-                                    self.driver.change_volume(+0.1)
-                                elif key in ('DOWN', 'j'):
-                                    self.driver.change_volume(-0.1)
-                                elif key.lower() == 'n':
-                                    if self.current_index + 1 < len(self.playlist):
-                                        self._load_track(self.current_index + 1)
-                                        break
-                                elif key.lower() == 'p':
-                                    if self.current_index > 0:
-                                        self._load_track(self.current_index - 1)
-                                        break
-                                elif key.lower() == 'm':
-                                    self.driver.toggle_mute()
-                                elif key.lower() == 't':
-                                    self.theme_name = next_theme_name(self.theme_name)
-                                elif key.lower() == 'v':
-                                    self.mode = next_visualizer_mode(self.mode)
-
-                            time.sleep(0.025)
+                                if action == "track":
+                                    track_changed = True
+                                    break
+                            if track_changed:
+                                break
 
                         if track_finished_naturally:
-                            if self.current_index + 1 < len(self.playlist):
+                            if self._wait_for_next_track(live, kbd):
                                 self._load_track(self.current_index + 1)
                             else:
                                 break
@@ -173,10 +191,63 @@ class TerminalPlayer:
         if self.track_info:
             console.print(f"[bold green][Playback finished][/bold green] [white]{self.track_info.display_name()}[/white]")
 
-    def _build_screen(self, current_time: float) -> Text:
+    def _wait_for_next_track(self, live: Live, kbd: NonBlockingKeyboard) -> bool:
+        """True once a next track exists; waits while background downloads may still append one (q quits)."""
+        while self.current_index + 1 >= len(self.playlist):
+            if self.playlist_complete is None or self.playlist_complete.is_set():
+                return self.current_index + 1 < len(self.playlist)
+            live.update(self._build_screen(self.driver.get_position_sec()), refresh=True)
+            for key in kbd.wait_keys(0.25):
+                if key.lower() == 'q' or key == 'ESC':
+                    return False
+        return True
+
+    def _handle_key(self, key: str) -> Optional[str]:
+        """Apply a single key. Returns "quit", "track" (a different track was loaded) or None."""
+        if key.lower() == 'q' or key == 'ESC':
+            return "quit"
+        elif key == 'SPACE':
+            self.driver.toggle_pause()
+        elif key in ('LEFT', 'h'):
+            self.driver.seek_relative(-5.0)
+        elif key in ('RIGHT', 'l'):
+            self.driver.seek_relative(+5.0)
+        elif key in ('UP', 'k'):
+            self.driver.change_volume(+0.1)
+        elif key in ('DOWN', 'j'):
+            self.driver.change_volume(-0.1)
+        elif key.lower() == 'n':
+            if self.current_index + 1 < len(self.playlist):
+                self._load_track(self.current_index + 1)
+                return "track"
+        elif key.lower() == 'p':
+            if self.current_index > 0:
+                self._load_track(self.current_index - 1)
+                return "track"
+        elif key.lower() == 's':
+            # Toggle shuffle; the current track keeps playing at its new position
+            if self.playlist.shuffled:
+                self.current_index = self.playlist.unshuffle(keep=self.current_index)
+            elif len(self.playlist) > 1:
+                self.current_index = self.playlist.shuffle(keep_first=self.current_index)
+        elif key.lower() == 'm':
+            self.driver.toggle_mute()
+        elif key.lower() == 't':
+            self.theme_name = next_theme_name(self.theme_name)
+        elif key.lower() == 'v':
+            self.mode = next_visualizer_mode(self.mode)
+        return None
+
+    def _build_screen(
+        self,
+        current_time: float,
+        width: Optional[int] = None,
+        height: Optional[int] = None,
+        frame_dt: Optional[float] = None,
+    ) -> Text:
         theme = get_theme(self.theme_name)
-        term_width = max(30, console.size.width or 80)
-        term_height = max(10, console.size.height or 24)
+        term_width = max(30, width or console.size.width or 80)
+        term_height = max(10, height or console.size.height or 24)
 
         if not self.track_info:
             return Text.from_markup("  [dim]No track loaded[/dim]")
@@ -203,16 +274,18 @@ class TerminalPlayer:
             mode=self.mode,
             theme_name=self.theme_name,
             is_playing=not self.driver.is_paused,
-            mirror=self.mirror_mode
+            mirror=self.mirror_mode,
+            frame_dt=frame_dt,
         )
 
+        # Header and lyrics are short markup; the visualizer arrives as a pre-styled Text
         body_parts = [header_str]
         if lyrics_str:
             body_parts.append(lyrics_str)
-        body_parts.append(viz_output)
 
-        full_content = "\n".join(body_parts)
-        text_obj = Text.from_markup(full_content)
+        text_obj = Text.from_markup("\n".join(body_parts))
+        text_obj.append("\n")
+        text_obj.append_text(viz_output)
         text_obj.no_wrap = True
         return text_obj
 
@@ -240,50 +313,5 @@ class TerminalPlayer:
         return f" [{theme.header}]> {queue_tag}PLAYING TRACK - {title} - {artist}[/{theme.header}]  {status_badge}  [{theme.header}]{time_str}[/{theme.header}] {progress_bar}"
 
     def _render_lyrics_2lines(self, current_time: float, theme: Theme) -> str:
-        """
-        Renders exactly 2 lines in couplets (Pairs) with clear on transition:
-        - Couplet 1: Line 1 types -> Line 2 types below it while Line 1 stays -> CLR!
-        - Couplet 2: Line 3 types -> Line 4 types below it while Line 3 stays -> CLR!
-        - Zero dull preview text anywhere.
-        """
-        if not self.lyrics:
-            return " \n "
-
-        # 1. Before first lyric: Both rows blank (no dull text)
-        if current_time < self.lyrics[0].timestamp_sec:
-            return " \n "
-
-        # 2. Find active line index
-        active_idx = 0
-        for idx, line in enumerate(self.lyrics):
-            if current_time >= line.timestamp_sec:
-                active_idx = idx
-
-        # Couplet pair base index (0, 2, 4, 6, ...)
-        pair_start = (active_idx // 2) * 2
-        line_top = self.lyrics[pair_start]
-        line_bottom = self.lyrics[pair_start + 1] if pair_start + 1 < len(self.lyrics) else None
-
-        if active_idx == pair_start:
-            # First line of couplet is active and typing; second row is blank
-            rendered_top = self.typewriter.render_active_line(
-                line_top,
-                current_time,
-                active_color=f"{theme.header}"
-            )
-            line1 = f" [{theme.header}]>[/{theme.header}] {rendered_top}[{theme.header}]█[/{theme.header}]"
-            line2 = " "
-        else:
-            # First line of couplet completed; second line is active and typing below it
-            line1 = f"   [{theme.header}]{line_top.text}[/{theme.header}]"
-            if line_bottom:
-                rendered_bottom = self.typewriter.render_active_line(
-                    line_bottom,
-                    current_time,
-                    active_color=f"{theme.header}"
-                )
-                line2 = f" [{theme.header}]>[/{theme.header}] {rendered_bottom}[{theme.header}]█[/{theme.header}]"
-            else:
-                line2 = " "
-
-        return f"{line1}\n{line2}"
+        """Renders exactly 2 lines in couplets (Line 1 -> Line 2 -> CLR) via the track's shared timeline index."""
+        return self.timeline.render_couplet(current_time, theme.header)
@@ -1,9 +1,15 @@
 """
 Visualizer Themes and Color Gradient Engine
+Per-(theme, height) row lookup tables hold ready-made rich Styles, so renderers never resolve colour
+names or gradient indices per frame.
 """
 
+from functools import lru_cache
 from typing import Dict, List, Tuple
 
+from rich.color import Color
+from rich.style import Style
+
 
 class Theme:
     """Color palette and gradient definition for TUI and Visualizer."""
@@ -158,6 +164,51 @@ THEMES["groove"] = THEMES["cava"]
 THEME_ORDER = ["cava", "cyberpunk", "matrix", "fire", "sunset", "ocean", "aurora", "synthwave", "monochrome"]
 
 
+class ThemeTables:
+    """
+    Row lookup tables for one theme at one visualizer height (index 0 = bottom row):
+    stepped theme colours and the truecolor-interpolated gradient.
+    """
+
+    __slots__ = ("row_colors", "row_styles", "gradient_styles", "palette_styles")
+
+    def __init__(self, theme: Theme, height: int):
+        self.row_colors: List[str] = [theme.get_row_color(row, height) for row in range(height)]
+        self.row_styles: List[Style] = [Style.parse(color) for color in self.row_colors]
+        self.palette_styles: List[Style] = [Style.parse(color) for color in (theme.bar_colors or ["cyan"])]
+        self.gradient_styles: List[Style] = _interpolate_gradient(self.palette_styles, height)
+
+
+def _interpolate_gradient(stops: List[Style], height: int) -> List[Style]:
+    """Blend the theme's colour stops in RGB across `height` rows; attributes (bold, dim) follow the nearest stop."""
+    rgb_stops = [
+        style.color.get_truecolor() if style.color is not None else Color.parse("cyan").get_truecolor()
+        for style in stops
+    ]
+    if height <= 1 or len(stops) == 1:
+        return [stops[0]] * max(1, height)
+
+    styles: List[Style] = []
+    for row in range(height):
+        pos = row / (height - 1) * (len(stops) - 1)
+        lo = min(int(pos), len(stops) - 2)
+        frac = pos - lo
+        a, b = rgb_stops[lo], rgb_stops[lo + 1]
+        color = Color.from_rgb(
+            a.red + (b.red - a.red) * frac,
+            a.green + (b.green - a.green) * frac,
+            a.blue + (b.blue - a.blue) * frac,
+        )
+        styles.append(stops[lo if frac < 0.5 else lo + 1] + Style(color=color))
+    return styles
+
+
+@lru_cache(maxsize=128)
+def get_theme_tables(theme: Theme, height: int) -> ThemeTables:
+    """Cached tables: cycling themes or resizing builds each (theme, height) pair once."""
+    return ThemeTables(theme, height)
+
+
 def get_theme(name: str) -> Theme:
     """Get theme by name with fallback to cava."""
     clean_name = (name or "cava").strip().lower()
@@ -6,7 +6,8 @@ Direct audio clock synchronization aligning playback position with acoustic time
 from typing import List, Optional, Tuple
 import numpy as np
 
-from groovegrab.player.lrc_parser import LrcLine
+from groovegrab.player.lrc_parser import LyricLine
+from groovegrab.player.lyric_timeline import LyricTimeline
 
 
 class TimingChain:
@@ -15,6 +16,8 @@ class TimingChain:
     def __init__(self):
         self.leading_silence_sec: float = 0.0
         self.audio_duration_sec: float = 0.0
+        self._timeline: Optional[LyricTimeline] = None
+        self._timeline_source: Optional[List[LyricLine]] = None
 
     def inspect_audio(self, pcm_data: Optional[np.ndarray], sample_rate: int = 22050) -> float:
         """
@@ -30,9 +33,9 @@ class TimingChain:
 
     def find_active_line(
         self,
-        lyrics: List[LrcLine],
+        lyrics: List[LyricLine],
         current_audio_time: float
-    ) -> Tuple[Optional[int], Optional[LrcLine]]:
+    ) -> Tuple[Optional[int], Optional[LyricLine]]:
         """
         Finds the current active lyric line based on direct audio playback time.
         Returns (index, line) or (None, None) if before the first lyric line.
@@ -40,13 +43,9 @@ class TimingChain:
         if not lyrics:
             return None, None
 
-        # If before first lyric timestamp
-        if current_audio_time < lyrics[0].timestamp_sec:
-            return None, None
-
-        active_idx = 0
-        for idx, line in enumerate(lyrics):
-            if current_audio_time >= line.timestamp_sec:
-                active_idx = idx
+        # Index is built once per lyric list; per-frame lookups use its cursor / bisect
+        if self._timeline is None or self._timeline_source is not lyrics:
+            self._timeline = LyricTimeline(lyrics)
+            self._timeline_source = lyrics
 
-        return active_idx, lyrics[active_idx]
+        return self._timeline.active_line(current_audio_time)
@@ -3,35 +3,46 @@ Natural Vocal Cadence Lyric Typewriter Animator
 Paces character and word reveal to match the singing tempo and time duration of each line.
 """
 
-from groovegrab.player.lrc_parser import LrcLine
+from groovegrab.player.lrc_parser import LyricLine
 
 
 class TypewriterAnimator:
     """Calculates character reveal matching singing tempo and line duration."""
 
+    def reveal_duration(self, line: LyricLine) -> float:
+        """Seconds the full line takes to type out; depends only on the line, so it can be precomputed per track."""
+        # Available time gap until next line
+        line_gap = (line.end_sec - line.timestamp_sec) if line.end_sec else 4.0
+        num_words = max(1, len(line.text.split()))
+
+        # Singing duration is proportional to words and line interval (~80% of gap)
+        return max(0.8, min(line_gap * 0.82, max(1.2, num_words * 0.40)))
+
     def render_active_line(
         self,
-        line: LrcLine,
+        line: LyricLine,
+        current_time_sec: float,
+        active_color: str = "bold bright_cyan"
+    ) -> str:
+        if not line.text:
+            return ""
+        return self.render_with_duration(line, current_time_sec, self.reveal_duration(line), active_color)
+
+    def render_with_duration(
+        self,
+        line: LyricLine,
         current_time_sec: float,
+        singing_duration: float,
         active_color: str = "bold bright_cyan"
     ) -> str:
         text = line.text
         if not text:
             return ""
 
-        start = line.timestamp_sec
-        elapsed = current_time_sec - start
+        elapsed = current_time_sec - line.timestamp_sec
         if elapsed <= 0:
             return ""
 
-        # Available time gap until next line
-        line_gap = (line.end_sec - start) if line.end_sec else 4.0
-        words = text.split()
-        num_words = max(1, len(words))
-
-        # Singing duration is proportional to words and line interval (~80% of gap)
-        singing_duration = max(0.8, min(line_gap * 0.82, max(1.2, num_words * 0.40)))
-
         if elapsed >= singing_duration:
             # Line completed: show 100% of line
             return f"[{active_color}]{text}[/{active_color}]"
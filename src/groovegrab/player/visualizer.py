@@ -6,13 +6,18 @@ Computes real 100% mathematical FFT spectrum and uses TimingChain for synchroniz
 import math
 import random
 import subprocess
+import threading
+import time
 from enum import Enum
 from pathlib import Path
 from typing import List, Optional, Tuple
 
 import numpy as np
+from rich.style import Style
+from rich.text import Span, Text
 
-from groovegrab.player.themes import Theme, get_theme
+from groovegrab.player.particles import ParticleSystem
+from groovegrab.player.themes import Theme, get_theme, get_theme_tables
 from groovegrab.player.timing_chain import TimingChain
 
 
@@ -38,6 +43,39 @@ def next_visualizer_mode(current: VisualizerMode) -> VisualizerMode:
     return VISUALIZER_MODES[(idx + 1) % len(VISUALIZER_MODES)]
 
 
+class GrowingPcmBuffer:
+    """
+    Mono float32 PCM filled incrementally from s16le bytes (a decoder reading a file that is still downloading).
+    Storage doubles as it fills; `view()` returns the decoded prefix without copying, so readers never see a torn array.
+    """
+
+    def __init__(self, initial_samples: int = 22050 * 30):
+        self._data = np.zeros(initial_samples, dtype=np.float32)
+        self._size = 0
+        self._pending = b""
+
+    def __len__(self) -> int:
+        return self._size
+
+    def feed(self, chunk: bytes):
+        chunk = self._pending + chunk
+        usable = len(chunk) - (len(chunk) % 2)
+        self._pending = chunk[usable:]
+        if not usable:
+            return
+        samples = np.frombuffer(chunk[:usable], dtype=np.int16)
+        needed = self._size + len(samples)
+        if needed > len(self._data):
+            grown = np.zeros(max(needed, len(self._data) * 2), dtype=np.float32)
+            grown[:self._size] = self._data[:self._size]
+            self._data = grown
+        np.multiply(samples, 1.0 / 32768.0, out=self._data[self._size:needed], casting="unsafe")
+        self._size = needed
+
+    def view(self) -> np.ndarray:
+        return self._data[:self._size]
+
+
 class SpectrumDataEngine:
     """Computes real 100% mathematical FFT frequency spectrum with TimingChain integration."""
 
@@ -50,6 +88,15 @@ class SpectrumDataEngine:
         self.sample_rate: int = 22050
         self.audio_loaded: bool = False
         self.timing_chain = TimingChain()
+        self._decode_proc: Optional[subprocess.Popen] = None
+        self._decode_generation = 0
+        # Optional live sample source (e.g. PcmAudioEngine): `sample_rate` plus `window(center_time_sec, n)`
+        # returning mono float32 samples, or None while it has nothing to offer
+        self.source = None
+
+    def attach_source(self, source):
+        """Read analysis windows from `source` instead of a decoded copy of the track."""
+        self.source = source
 
     @property
     def leading_silence_sec(self) -> float:
@@ -57,6 +104,7 @@ class SpectrumDataEngine:
 
     def load_audio_file(self, file_path: Path):
         """Decode 100% real PCM audio samples using FFmpeg & run TimingChain inspection."""
+        self._stop_growing_decode()
         try:
             cmd = ["ffmpeg", "-i", str(file_path), "-f", "s16le", "-ac", "1", "-ar", "22050", "-loglevel", "quiet", "pipe:1"]
             res = subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
@@ -86,6 +134,68 @@ class SpectrumDataEngine:
             self.pcm_data = None
             self.timing_chain.inspect_audio(None, 22050)
 
+    def load_growing_file(self, file_path: Path, finished: threading.Event):
+        """
+        Decode a file that is still being downloaded: FFmpeg follows the file as it grows and `pcm_data` is
+        republished as more samples arrive, so the spectrum tracks playback from the first buffered seconds.
+        `finished` is set by the downloader once the file is complete.
+        """
+        self._stop_growing_decode()
+        self.pcm_data = None
+        self.audio_loaded = False
+        self.timing_chain.inspect_audio(None, 22050)
+        self.sample_rate = 22050
+
+        cmd = [
+            "ffmpeg", "-loglevel", "quiet", "-follow", "1", "-rw_timeout", "3000000", "-i", f"file:{file_path}",
+            "-f", "s16le", "-ac", "1", "-ar", "22050", "pipe:1",
+        ]
+        try:
+            proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, stdin=subprocess.DEVNULL)
+        except OSError:
+            # No FFmpeg: decode the complete file once it is there
+            threading.Thread(target=self._load_when_finished, args=(file_path, finished, self._decode_generation), daemon=True).start()
+            return
+
+        self._decode_proc = proc
+        threading.Thread(
+            target=self._pump_growing_decode, args=(proc, file_path, finished, self._decode_generation), daemon=True
+        ).start()
+
+    def _pump_growing_decode(self, proc: subprocess.Popen, file_path: Path, finished: threading.Event, generation: int):
+        buffer = GrowingPcmBuffer()
+        while True:
+            chunk = proc.stdout.read(32768) if proc.stdout else b""
+            if not chunk or generation != self._decode_generation:
+                break
+            buffer.feed(chunk)
+            self.pcm_data = buffer.view()
+            if len(buffer) > 1024:
+                self.audio_loaded = True
+        proc.wait()
+        if generation != self._decode_generation:
+            return
+
+        if finished.is_set():
+            self.timing_chain.inspect_audio(self.pcm_data, self.sample_rate)
+        else:
+            # The download stalled longer than FFmpeg's read timeout: finish with a full decode
+            self._load_when_finished(file_path, finished, generation)
+
+    def _load_when_finished(self, file_path: Path, finished: threading.Event, generation: int):
+        finished.wait()
+        if generation == self._decode_generation and file_path.exists():
+            self.load_audio_file(file_path)
+
+    def _stop_growing_decode(self):
+        self._decode_generation += 1
+        proc, self._decode_proc = self._decode_proc, None
+        if proc and proc.poll() is None:
+            try:
+                proc.terminate()
+            except Exception:
+                pass
+
     def update(self, current_time_sec: float, num_bars: int, is_playing: bool = True, dt: float = 0.033) -> np.ndarray:
         """Compute frequency bar heights normalized with fluid smoothing."""
         if num_bars != self.num_bars:
@@ -97,7 +207,8 @@ class SpectrumDataEngine:
             self.heights *= 0.80
             return np.clip(self.heights, 0.0, 1.0)
 
-        if self.audio_loaded and self.pcm_data is not None:
+        source_live = self.source is not None and self.source.window(current_time_sec, 1) is not None
+        if source_live or (self.audio_loaded and self.pcm_data is not None):
             raw_spectrum = self._compute_real_fft(current_time_sec, num_bars)
         else:
             raw_spectrum = self._compute_procedural_spectrum(current_time_sec, num_bars)
@@ -114,32 +225,43 @@ class SpectrumDataEngine:
         return np.clip(self.heights, 0.0, 1.0)
 
     def _compute_real_fft(self, current_time: float, num_bars: int) -> np.ndarray:
-        if self.pcm_data is None:
-            return np.zeros(num_bars, dtype=np.float32)
-
-        center_idx = int(current_time * self.sample_rate)
         window_size = 2048
-        half = window_size // 2
+        # Live sources keep their FFT up to date as samples arrive; use it instead of transforming per frame
+        magnitudes = getattr(self.source, "magnitudes", None)
+        precomputed = magnitudes(window_size) if magnitudes is not None else None
+        if precomputed is not None:
+            rms_energy, fft_vals = precomputed
+            sample_rate = self.source.sample_rate
+        else:
+            chunk = self.source.window(current_time, window_size) if self.source is not None else None
+            sample_rate = self.source.sample_rate if chunk is not None else self.sample_rate
+            if chunk is None:
+                if self.pcm_data is None:
+                    return np.zeros(num_bars, dtype=np.float32)
+
+                center_idx = int(current_time * self.sample_rate)
+                half = window_size // 2
 
-        start = max(0, center_idx - half)
-        end = min(len(self.pcm_data), center_idx + half)
+                start = max(0, center_idx - half)
+                end = min(len(self.pcm_data), center_idx + half)
 
-        chunk = self.pcm_data[start:end]
-        if len(chunk) < window_size:
-            chunk = np.pad(chunk, (0, window_size - len(chunk)))
+                chunk = self.pcm_data[start:end]
+                if len(chunk) < window_size:
+                    chunk = np.pad(chunk, (0, window_size - len(chunk)))
+
+            rms_energy = np.sqrt(np.mean(chunk ** 2))
+            if rms_energy < 0.005:
+                return np.zeros(num_bars, dtype=np.float32)
+            fft_vals = np.abs(np.fft.rfft(chunk * np.hanning(len(chunk))))
 
-        rms_energy = np.sqrt(np.mean(chunk ** 2))
         if rms_energy < 0.005:
             return np.zeros(num_bars, dtype=np.float32)
 
-        windowed = chunk * np.hanning(len(chunk))
-        fft_vals = np.abs(np.fft.rfft(windowed))
-
         bands = np.zeros(num_bars, dtype=np.float32)
         fft_len = len(fft_vals)
         
         min_freq = 40.0
-        max_freq = min(10000.0, self.sample_rate / 2.0)
+        max_freq = min(10000.0, sample_rate / 2.0)
         log_min = math.log10(min_freq)
         log_max = math.log10(max_freq)
 
@@ -147,8 +269,8 @@ class SpectrumDataEngine:
             f_start = 10 ** (log_min + (log_max - log_min) * (i / num_bars))
             f_end = 10 ** (log_min + (log_max - log_min) * ((i + 1) / num_bars))
             
-            bin_start = max(0, min(fft_len - 1, int(f_start * window_size / self.sample_rate)))
-            bin_end = max(bin_start + 1, min(fft_len, int(f_end * window_size / self.sample_rate)))
+            bin_start = max(0, min(fft_len - 1, int(f_start * window_size / sample_rate)))
+            bin_end = max(bin_start + 1, min(fft_len, int(f_end * window_size / sample_rate)))
             
             val = float(np.mean(fft_vals[bin_start:bin_end])) if bin_end > bin_start else 0.0
             
@@ -158,6 +280,28 @@ class SpectrumDataEngine:
 
         return bands
 
+    def get_waveform_window(self, current_time_sec: float, num_samples: int) -> Optional[np.ndarray]:
+        """Return the PCM samples centered on the playback position (zero-padded at the edges), or None without audio."""
+        if self.source is not None and num_samples > 0:
+            window = self.source.window(current_time_sec, num_samples)
+            if window is not None:
+                return window
+        if not self.audio_loaded or self.pcm_data is None or num_samples < 1:
+            return None
+
+        center_idx = int(current_time_sec * self.sample_rate)
+        start = center_idx - num_samples // 2
+        end = start + num_samples
+        total = len(self.pcm_data)
+        if start >= 0 and end <= total:
+            return self.pcm_data[start:end]
+
+        window = np.zeros(num_samples, dtype=np.float32)
+        src_start, src_end = max(0, start), min(total, end)
+        if src_end > src_start:
+            window[src_start - start:src_end - start] = self.pcm_data[src_start:src_end]
+        return window
+
     def _compute_procedural_spectrum(self, t: float, num_bars: int) -> np.ndarray:
         """Procedural fallback simulation with toned down height."""
         spectrum = np.zeros(num_bars, dtype=np.float32)
@@ -183,14 +327,28 @@ class AudioSpectrumVisualizer:
         [" ", "⠁", "⠉", "⠋", "⠛", "⠟", "⠿", "⣿"],
     ]
 
+    # Code-point lookup tables for the vectorized grid renderers
+    BAR_SUBBLOCK_CODES = np.array([ord(c) for c in BAR_SUBBLOCKS], dtype=np.uint32)
+    BRAILLE_CODES = np.array([[ord(c) for c in row] for row in BRAILLE_MAP], dtype=np.uint32)
+
+    # PCM samples shown across the full oscilloscope width (~93 ms at 22.05 kHz)
+    WAVE_WINDOW_SAMPLES = 2048
+
     def __init__(self, num_bars: int = 40):
         self.num_bars = num_bars
         self.engine = SpectrumDataEngine(num_bars)
         self.mirror_mode: bool = False
+        self.particles = ParticleSystem(capacity=4096)
+        self._last_particle_step: float = 0.0
+        # Smooth RGB gradients instead of stepped theme colours (set by players on truecolor terminals)
+        self.truecolor: bool = False
 
     def load_audio_file(self, file_path: Path):
         self.engine.load_audio_file(file_path)
 
+    def load_growing_file(self, file_path: Path, finished: threading.Event):
+        self.engine.load_growing_file(file_path, finished)
+
     def render(
         self,
         current_time_sec: float,
@@ -200,7 +358,9 @@ class AudioSpectrumVisualizer:
         theme_name: str = "cava",
         is_playing: bool = True,
         mirror: bool = False,
-    ) -> str:
+        frame_dt: Optional[float] = None,
+    ) -> Text:
+        """`frame_dt` fixes the particle time step (headless benchmarks); by default it follows the monotonic clock."""
         theme = get_theme(theme_name)
         height = max(4, height)
         width = max(20, width)
@@ -220,7 +380,7 @@ class AudioSpectrumVisualizer:
         elif mode == VisualizerMode.MIRROR:
             return self._render_mirror_grid(heights, width, height, theme, bar_width)
         elif mode == VisualizerMode.PARTICLES:
-            return self._render_particles_grid(heights, width, height, theme, is_playing)
+            return self._render_particles_grid(heights, width, height, theme, is_playing, frame_dt)
         else:
             return self._render_bars_grid(heights, width, height, theme, bar_width)
 
@@ -231,33 +391,23 @@ class AudioSpectrumVisualizer:
         height: int,
         theme: Theme,
         bar_width: int
-    ) -> str:
+    ) -> Text:
         num_bars = len(heights)
-        grid_lines = []
-
-        for row in range(height - 1, -1, -1):
-            row_color = theme.get_row_color(row, height)
-            row_chars = []
-
-            for i in range(num_bars):
-                val = heights[i] * height
 
-                bar_char = " "
-                if val >= row + 1:
-                    bar_char = "█"
-                elif val > row:
-                    fraction = val - row
-                    sub_idx = int(fraction * 8)
-                    sub_idx = max(0, min(8, sub_idx))
-                    bar_char = self.BAR_SUBBLOCKS[sub_idx]
+        # fill[r, i]: how much of cell (row r counted from the top, bar i) the bar covers
+        row_floor = np.arange(height - 1, -1, -1, dtype=np.float32)[:, None]
+        fill = (heights.astype(np.float32) * height)[None, :] - row_floor
+        sub_idx = np.clip((fill * 8).astype(np.int32), 0, 8)
+        cells = np.where(fill >= 1.0, ord("█"), np.where(fill > 0.0, self.BAR_SUBBLOCK_CODES[sub_idx], ord(" ")))
 
-                cell = bar_char * bar_width
-                row_chars.append(f"[{row_color}]{cell}[/{row_color}]")
+        # Each bar is bar_width cells wide, bars are separated by one blank column
+        grid = np.full((height, num_bars, bar_width + 1), ord(" "), dtype=np.uint32)
+        grid[:, :, :bar_width] = cells[:, :, None]
+        line_width = num_bars * (bar_width + 1) - 1
+        grid = np.ascontiguousarray(grid.reshape(height, -1)[:, :line_width])
+        row_strings = grid.view(f"<U{line_width}").ravel().tolist()
 
-            line_str = " ".join(row_chars)
-            grid_lines.append(f"  {line_str}")
-
-        return "\n".join(grid_lines)
+        return self._styled_rows(row_strings, self._row_styles(theme, height), indent="  ")
 
     def _render_mirror_grid(
         self,
@@ -266,7 +416,7 @@ class AudioSpectrumVisualizer:
         height: int,
         theme: Theme,
         bar_width: int
-    ) -> str:
+    ) -> Text:
         half_n = len(heights) // 2
         left_side = heights[:half_n]
         mirrored_heights = np.concatenate([left_side[::-1], left_side])
@@ -278,33 +428,27 @@ class AudioSpectrumVisualizer:
         width: int,
         height: int,
         theme: Theme
-    ) -> str:
-        num_bars = len(heights)
-        grid_lines = []
-
-        for row in range(height - 1, -1, -1):
-            row_color = theme.get_row_color(row, height)
-            row_chars = []
-
-            for i in range(0, num_bars - 1, 2):
-                val1 = heights[i] * height
-                val2 = heights[i + 1] * height
+    ) -> Text:
+        num_pairs = len(heights) // 2
+        scaled = heights[:num_pairs * 2].astype(np.float32) * height
+        row_floor = np.arange(height - 1, -1, -1, dtype=np.float32)[:, None]
 
-                sub1 = max(0, min(7, int((val1 - row) * 7))) if val1 > row else 0
-                sub2 = max(0, min(7, int((val2 - row) * 7))) if val2 > row else 0
+        # Sub-cell levels 0..7 of the left / right bar of each pair in every row (top row first)
+        fill1 = scaled[0::2][None, :] - row_floor
+        fill2 = scaled[1::2][None, :] - row_floor
+        sub1 = np.where(fill1 > 0.0, np.clip((fill1 * 7).astype(np.int32), 0, 7), 0)
+        sub2 = np.where(fill2 > 0.0, np.clip((fill2 * 7).astype(np.int32), 0, 7), 0)
 
-                b_char = self.BRAILLE_MAP[0][sub1] if sub1 > 0 else " "
-                if sub2 > 0 and sub1 > 0:
-                    b_char = "⣿"
-                elif sub2 > 0:
-                    b_char = self.BRAILLE_MAP[1][sub2]
+        cells = np.where(sub1 > 0, self.BRAILLE_CODES[0][sub1], ord(" "))
+        cells = np.where(sub2 > 0, np.where(sub1 > 0, ord("⣿"), self.BRAILLE_CODES[1][sub2]), cells)
 
-                row_chars.append(f"[{row_color}]{b_char}[/{row_color}]")
+        grid = np.full((height, num_pairs, 2), ord(" "), dtype=np.uint32)
+        grid[:, :, 0] = cells
+        line_width = max(0, num_pairs * 2 - 1)
+        grid = np.ascontiguousarray(grid.reshape(height, -1)[:, :line_width])
+        row_strings = grid.view(f"<U{line_width}").ravel().tolist() if line_width else [""] * height
 
-            line_str = " ".join(row_chars)
-            grid_lines.append(f"  {line_str}")
-
-        return "\n".join(grid_lines)
+        return self._styled_rows(row_strings, self._row_styles(theme, height), indent="  ")
 
     def _render_waveform_grid(
         self,
@@ -313,26 +457,44 @@ class AudioSpectrumVisualizer:
         height: int,
         theme: Theme,
         is_playing: bool
-    ) -> str:
-        grid_lines = []
-        mid_row = height // 2
+    ) -> Text:
+        """
+        Oscilloscope of the decoded PCM around the playback position.
+        The window is decimated to one min/max pair per column so transients stay visible,
+        then rasterized with array ops: cost depends on width x height, not on how many cells are lit.
+        """
+        samples_per_col = max(1, self.WAVE_WINDOW_SAMPLES // width)
+        window = self.engine.get_waveform_window(t, samples_per_col * width) if is_playing else None
+
+        if window is not None:
+            cols = window.reshape(width, samples_per_col)
+            col_min = cols.min(axis=1)
+            col_max = cols.max(axis=1)
+            peak = float(max(-col_min.min(), col_max.max()))
+            gain = 1.0 / max(0.25, peak)
+            col_min = col_min * gain
+            col_max = col_max * gain
+        elif is_playing:
+            # No decoded audio (e.g. live MPRIS playback): animated synthetic trace
+            x = np.arange(width, dtype=np.float32) / float(width)
+            col_min = col_max = np.sin(x * 12.0 + t * 10.0) * 0.8
+        else:
+            col_min = col_max = np.zeros(width, dtype=np.float32)
 
-        for row in range(height - 1, -1, -1):
-            row_color = theme.get_row_color(row, height)
-            line_chars = []
+        # Amplitude [-1, 1] -> row index (0 = bottom)
+        scale = (height - 1) / 2.0
+        lo = np.clip(np.rint((np.clip(col_min, -1.0, 1.0) + 1.0) * scale), 0, height - 1).astype(np.int32)
+        hi = np.clip(np.rint((np.clip(col_max, -1.0, 1.0) + 1.0) * scale), 0, height - 1).astype(np.int32)
 
-            for col in range(width):
-                x = col / float(width)
-                wave_y = mid_row + (math.sin(x * 12.0 + t * 10.0) * (height / 2.5) if is_playing else 0)
-                
-                if int(wave_y) == row:
-                    line_chars.append(f"[{row_color}]━[/{row_color}]")
-                else:
-                    line_chars.append(" ")
+        rows = np.arange(height - 1, -1, -1, dtype=np.int32)[:, None]
+        lit = (rows >= lo[None, :]) & (rows <= hi[None, :])
+        glyph = np.where(hi > lo, ord("┃"), ord("━")).astype(np.uint32)
+        codes = np.where(lit, glyph[None, :], np.uint32(ord(" "))).astype(np.uint32)
 
-            grid_lines.append("".join(line_chars))
+        # Each row of code points reinterpreted as one fixed-width unicode string
+        row_strings = np.ascontiguousarray(codes).view(f"<U{width}").ravel().tolist()
 
-        return "\n".join(grid_lines)
+        return self._styled_rows(row_strings, self._row_styles(theme, height))
 
     def _render_particles_grid(
         self,
@@ -340,6 +502,50 @@ class AudioSpectrumVisualizer:
         width: int,
         height: int,
         theme: Theme,
-        is_playing: bool
-    ) -> str:
-        return self._render_bars_grid(heights, width, height, theme, bar_width=1)
+        is_playing: bool,
+        frame_dt: Optional[float] = None
+    ) -> Text:
+        now = time.monotonic()
+        dt = (now - self._last_particle_step) if self._last_particle_step else 0.033
+        self._last_particle_step = now
+        if frame_dt is not None:
+            dt = frame_dt
+
+        palette = get_theme_tables(theme, height).palette_styles
+        energies = heights if is_playing else np.zeros_like(heights)
+        self.particles.step(energies, dt, num_colors=len(palette))
+        codes, colors = self.particles.rasterize(width, height)
+
+        row_strings = np.ascontiguousarray(codes).view(f"<U{width}").ravel().tolist()
+        spans: List[Span] = []
+        for row_idx in np.flatnonzero(colors.max(axis=1) >= 0).tolist():
+            # Runs of equal palette index become one span each; empty runs stay unstyled
+            row_colors = colors[row_idx]
+            offset = row_idx * (width + 1)
+            bounds = np.flatnonzero(np.diff(row_colors)) + 1
+            starts = [0] + bounds.tolist()
+            ends = bounds.tolist() + [width]
+            for start, end in zip(starts, ends):
+                color_idx = int(row_colors[start])
+                if color_idx >= 0:
+                    spans.append(Span(offset + start, offset + end, palette[color_idx]))
+
+        return Text("\n".join(row_strings), spans=spans, no_wrap=True)
+
+    def _row_styles(self, theme: Theme, height: int) -> List[Style]:
+        """Bottom-up row styles: the interpolated gradient on truecolor terminals, the stepped theme colours otherwise."""
+        tables = get_theme_tables(theme, height)
+        return tables.gradient_styles if self.truecolor else tables.row_styles
+
+    @staticmethod
+    def _styled_rows(row_strings: List[str], row_styles: List[Style], indent: str = "") -> Text:
+        """Join top-down `row_strings` into one Text with a single span per row (row_styles is bottom-up)."""
+        spans: List[Span] = []
+        pos = 0
+        for row_str, style in zip(row_strings, reversed(row_styles)):
+            start = pos + len(indent)
+            pos = start + len(row_str)
+            spans.append(Span(start, pos, style))
+            pos += 1
+        plain = "\n".join(indent + row_str for row_str in row_strings) if indent else "\n".join(row_strings)
+        return Text(plain, spans=spans, no_wrap=True)
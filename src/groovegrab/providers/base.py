@@ -3,12 +3,19 @@ Abstract Base Provider Protocol
 """
 
 from abc import ABC, abstractmethod
-from typing import List, Union
-from groovegrab.core.models import TrackInfo, PlaylistInfo
+from typing import Any, Dict, List, Union
+from groovegrab.core.models import TrackInfo, PlaylistInfo, project_raw_metadata
 
 
 class BaseProvider(ABC):
     """Abstract Base Class for all GrooveGrab extractors/providers."""
+
+    # Keep the whole provider payload in TrackInfo.raw_metadata instead of its projection (debugging)
+    keep_raw_metadata: bool = False
+
+    def raw_metadata(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        """What a parsed track keeps of its provider `payload` (see RAW_METADATA_FIELDS)."""
+        return dict(payload) if self.keep_raw_metadata else project_raw_metadata(payload)
     
     @property
     @abstractmethod
@@ -13,7 +13,8 @@ from groovegrab.core.exceptions import ProviderError
 
 
 class ProviderRegistry:
-    def __init__(self):
+    def __init__(self, keep_raw_metadata: bool = False):
+        self.keep_raw_metadata = keep_raw_metadata
         self.providers: List[BaseProvider] = [
             YouTubeProvider(),
             SpotifyProvider(),
@@ -21,8 +22,11 @@ class ProviderRegistry:
             SoundCloudProvider(),
         ]
         self.default_provider = YouTubeProvider()
+        for provider in self.providers + [self.default_provider]:
+            provider.keep_raw_metadata = keep_raw_metadata
 
     def register_provider(self, provider: BaseProvider) -> None:
+        provider.keep_raw_metadata = self.keep_raw_metadata
         self.providers.insert(0, provider)
 
     def find_provider(self, query_or_url: str) -> BaseProvider:
@@ -96,7 +96,7 @@ class SpotifyProvider(BaseProvider):
                 webpage_url=original_url,
                 provider_name=self.name,
                 media_type=MediaType.AUDIO,
-                raw_metadata=entity
+                raw_metadata=self.raw_metadata(entity)
             )
 
         # Album / Playlist
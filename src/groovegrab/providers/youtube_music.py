@@ -154,7 +154,7 @@ class YouTubeProvider(BaseProvider):
             webpage_url=webpage_url,
             provider_name=self.name,
             media_type=MediaType.AUDIO,
-            raw_metadata=info
+            raw_metadata=self.raw_metadata(info)
         )
 
     def _get_thumbnail(self, info: dict) -> str:
@@ -0,0 +1,220 @@
+"""
+asyncio Download Queue Engine
+Same tasks, storage, leases and `on_progress` callbacks as TaskQueueManager, but every lyric and cover request
+runs on one shared httpx.AsyncClient, so hundreds can be in flight, while the heavy stage (yt-dlp extraction,
+download and FFmpeg transcode) runs in its own bounded executor and blocking light work (file probes, SQLite,
+tagging) in another. Lyrics and artwork of a task are fetched while it waits for or runs its download.
+"""
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from functools import partial
+from typing import AsyncIterator, Callable, List, Optional, Tuple
+
+import httpx
+
+from groovegrab.core.models import DownloadOptions, DownloadStatus, DownloadTask, Stage, TrackInfo
+from groovegrab.queue.storage import LEASE_SEC, TaskStorage
+from groovegrab.queue.task_queue import DEFAULT_UNAVAILABLE_TTL_DAYS, StageRecorder, TaskQueueManager, _lyrics_bytes
+
+# Tasks started at once: each prefetches its lyrics and cover, so this also bounds that memory
+DEFAULT_TASKS_IN_FLIGHT = 64
+DEFAULT_HTTP_CONNECTIONS = 128
+DEFAULT_IO_WORKERS = 8
+
+
+class AsyncSession:
+    """The shared HTTP client and the two executors of one engine run."""
+
+    def __init__(self, client: httpx.AsyncClient, heavy: ThreadPoolExecutor, io: ThreadPoolExecutor):
+        self.client = client
+        self._heavy = heavy
+        self._io = io
+
+    async def heavy(self, fn: Callable, *args, **kwargs):
+        return await asyncio.get_running_loop().run_in_executor(self._heavy, partial(fn, *args, **kwargs))
+
+    async def io(self, fn: Callable, *args, **kwargs):
+        return await asyncio.get_running_loop().run_in_executor(self._io, partial(fn, *args, **kwargs))
+
+
+class AsyncTaskQueueManager(TaskQueueManager):
+    """
+    asyncio engine over the TaskQueueManager machinery. `concurrent_downloads` limits only yt-dlp / FFmpeg;
+    `tasks_in_flight` how many tasks are started (and prefetching metadata) at once; `http_connections` the
+    shared client's connection pool. Pass `http_client` to reuse a client (it is not closed).
+    """
+
+    def __init__(
+        self,
+        storage: Optional[TaskStorage] = None,
+        lease_sec: float = LEASE_SEC,
+        unavailable_ttl_days: int = DEFAULT_UNAVAILABLE_TTL_DAYS,
+        tasks_in_flight: int = DEFAULT_TASKS_IN_FLIGHT,
+        http_connections: int = DEFAULT_HTTP_CONNECTIONS,
+        io_workers: int = DEFAULT_IO_WORKERS,
+        http_client: Optional[httpx.AsyncClient] = None
+    ):
+        super().__init__(storage, lease_sec=lease_sec, unavailable_ttl_days=unavailable_ttl_days)
+        self.tasks_in_flight = tasks_in_flight
+        self.http_connections = http_connections
+        self.io_workers = io_workers
+        self.http_client = http_client
+
+    @asynccontextmanager
+    async def session(self, concurrent_downloads: int) -> AsyncIterator[AsyncSession]:
+        heavy = ThreadPoolExecutor(max_workers=concurrent_downloads, thread_name_prefix="groovegrab-heavy")
+        io = ThreadPoolExecutor(max_workers=self.io_workers, thread_name_prefix="groovegrab-io")
+        try:
+            if self.http_client is not None:
+                yield AsyncSession(self.http_client, heavy, io)
+            else:
+                limits = httpx.Limits(max_connections=self.http_connections, max_keepalive_connections=32)
+                async with httpx.AsyncClient(limits=limits, follow_redirects=True) as client:
+                    yield AsyncSession(client, heavy, io)
+        finally:
+            heavy.shutdown(wait=True)
+            io.shutdown(wait=True)
+
+    async def process_tracks_async(
+        self,
+        tracks: List[TrackInfo],
+        options: DownloadOptions,
+        on_progress: Optional[Callable[[DownloadTask], None]] = None,
+        batch_id: Optional[str] = None
+    ) -> List[DownloadTask]:
+        tasks = await asyncio.to_thread(self.create_tasks, tracks, options, batch_id)
+        return await self.run_tasks_async(tasks, options.concurrent_downloads, on_progress)
+
+    async def run_tasks_async(
+        self,
+        tasks: List[DownloadTask],
+        concurrent_downloads: int,
+        on_progress: Optional[Callable[[DownloadTask], None]] = None
+    ) -> List[DownloadTask]:
+        """Run `tasks` (already saved), returning them in completion order like `run_tasks`."""
+        results = []
+        gate = asyncio.Semaphore(self.tasks_in_flight)
+        async with self.session(concurrent_downloads) as session:
+            async def run_one(task: DownloadTask) -> DownloadTask:
+                async with gate:
+                    return await self._run_and_save(task, on_progress, session)
+
+            for future in asyncio.as_completed([run_one(task) for task in tasks]):
+                results.append(await future)
+        return results
+
+    async def drain_async(
+        self,
+        concurrent_downloads: int,
+        batch_id: Optional[str] = None,
+        on_progress: Optional[Callable[[DownloadTask], None]] = None,
+        follow: bool = False,
+        poll_interval: float = 1.0
+    ) -> List[DownloadTask]:
+        """`drain` on this engine: keeps up to `tasks_in_flight` claimed tasks running."""
+        results = []
+        running = set()
+        async with self.session(concurrent_downloads) as session:
+            try:
+                while True:
+                    if len(running) < self.tasks_in_flight:
+                        for task in await session.io(self.claim, self.tasks_in_flight - len(running), batch_id):
+                            task.status = DownloadStatus.PENDING
+                            task.progress = 0.0
+                            task.speed = None
+                            task.eta = None
+                            task.error_message = None
+                            running.add(asyncio.ensure_future(self._run_and_save(task, on_progress, session)))
+
+                    if not running:
+                        if not (follow or await session.io(self.storage.count_unfinished, batch_id)):
+                            break
+                        await asyncio.sleep(poll_interval)
+                        continue
+
+                    done, running = await asyncio.wait(running, timeout=poll_interval, return_when=asyncio.FIRST_COMPLETED)
+                    results.extend(future.result() for future in done)
+            finally:
+                if running:
+                    await asyncio.gather(*running, return_exceptions=True)
+                await session.io(self.storage.release_leases, self.owner)
+        return results
+
+    async def _run_and_save(
+        self,
+        task: DownloadTask,
+        on_progress: Optional[Callable[[DownloadTask], None]],
+        session: AsyncSession
+    ) -> DownloadTask:
+        task = await self._execute_single_task_async(task, on_progress, session)
+        await session.io(self.storage.save_task, task)
+        return task
+
+    async def _execute_single_task_async(
+        self,
+        task: DownloadTask,
+        on_progress: Optional[Callable[[DownloadTask], None]],
+        session: AsyncSession
+    ) -> DownloadTask:
+        """The steps of `_execute_single_task`, blocking ones on the executors, with lyrics and artwork prefetched."""
+        clock = StageRecorder(task)
+        prefetch: List[asyncio.Task] = []
+        try:
+            # 0. Check if file already downloaded
+            existing_file = await session.io(self._skip_check, task, clock)
+            if existing_file:
+                # Guarantee .lrc exists alongside audio file
+                synced_lrc = None
+                if await session.io(self._needs_lrc, task, existing_file):
+                    synced_lrc, _ = await self._fetch_lyrics_async(task, clock, session)
+                await session.io(self._finish_skipped, task, existing_file, synced_lrc, on_progress)
+                return task
+
+            if await session.io(self._known_unavailable, task, on_progress):
+                return task
+
+            # Lyrics and artwork only need the metadata: fetch them while the download waits for a slot and runs
+            lyrics_job = cover_job = None
+            if task.options.fetch_lyrics:
+                lyrics_job = asyncio.ensure_future(self._fetch_lyrics_async(task, clock, session))
+                prefetch.append(lyrics_job)
+            if task.options.embed_cover:
+                cover_job = asyncio.ensure_future(self._fetch_cover_async(task, clock, session))
+                prefetch.append(cover_job)
+
+            # 1. Downloading Audio: queued for a heavy slot, the extract stage starts when the executor runs it
+            self._set_status(task, DownloadStatus.DOWNLOADING, 10.0, on_progress)
+            file_path = await session.heavy(self._download, task, clock, on_progress)
+
+            # 2. / 3. Lyrics and cover art
+            synced_lrc, plain_lyrics = await lyrics_job if lyrics_job else (None, None)
+            cover_data = await cover_job if cover_job else None
+            await session.io(
+                self._finish_download, task, file_path, synced_lrc, plain_lyrics, cover_data, on_progress, clock
+            )
+
+        except Exception as e:
+            await session.io(self._fail, task, e, on_progress)
+        finally:
+            for job in prefetch:
+                job.cancel()
+
+        return task
+
+    async def _fetch_lyrics_async(
+        self, task: DownloadTask, clock: StageRecorder, session: AsyncSession
+    ) -> Tuple[Optional[str], Optional[str]]:
+        with clock.stage(Stage.LYRICS) as timing:
+            synced_lrc, plain_lyrics = await self.lyric_fetcher.fetch_lyrics_async(task.track, session.client)
+            timing.bytes = _lyrics_bytes(synced_lrc, plain_lyrics)
+        return synced_lrc, plain_lyrics
+
+    async def _fetch_cover_async(
+        self, task: DownloadTask, clock: StageRecorder, session: AsyncSession
+    ) -> Optional[bytes]:
+        with clock.stage(Stage.COVER) as timing:
+            cover_data = await self.tagger.fetch_cover_async(task.track.cover_url, session.client)
+            timing.bytes = len(cover_data) if cover_data else None
+        return cover_data
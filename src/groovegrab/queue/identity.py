@@ -0,0 +1,70 @@
+"""
+Canonical Track Identity
+Stable keys for "is this the same recording?", independent of which playlist, folder or provider spelling a track
+arrived with: the provider's own id, the YouTube video id, and normalized primary-artist / title (matched together
+with the duration by the track index).
+"""
+
+import re
+import unicodedata
+from typing import List, Optional
+
+from groovegrab.core.models import TrackInfo
+
+# A duration-less metadata key still matches; otherwise durations must agree within this many seconds
+DURATION_TOLERANCE_SEC = 3
+
+YOUTUBE_ID_REGEX = re.compile(r"(?:[?&]v=|youtu\.be/|/shorts/|/embed/)([A-Za-z0-9_-]{11})(?![A-Za-z0-9_-])")
+ARTIST_SPLIT_REGEX = re.compile(r"\s*(?:,|&|;|/|\bx\b|\bfeat\.?|\bft\.?|\bfeaturing\b)\s*", re.IGNORECASE)
+# Upload decorations, not part of the recording's name; remix / live / acoustic tags are kept on purpose
+NOISE_TAG_REGEX = re.compile(
+    r"[\(\[\{][^\)\]\}]*\b(?:official|video|audio|lyrics?|visuali[sz]er|hd|hq|4k|mv|m/v)\b[^\)\]\}]*[\)\]\}]",
+    re.IGNORECASE,
+)
+FEATURING_REGEX = re.compile(r"\s+(?:feat\.?|ft\.?|featuring)\s+.*$", re.IGNORECASE)
+WORD_REGEX = re.compile(r"\w+", re.UNICODE)
+
+
+def normalize_text(text: str) -> str:
+    """Casefolded, accent-free words joined by single spaces (punctuation dropped)."""
+    text = unicodedata.normalize("NFKD", text or "").casefold()
+    text = "".join(ch for ch in text if not unicodedata.combining(ch))
+    return " ".join(WORD_REGEX.findall(text))
+
+
+def primary_artist(artist: str) -> str:
+    parts = [p for p in ARTIST_SPLIT_REGEX.split(artist or "") if p and p.strip()]
+    return normalize_text(parts[0] if parts else artist)
+
+
+def youtube_video_id(*urls: Optional[str]) -> Optional[str]:
+    for url in urls:
+        if url and ("youtube" in url or "youtu.be" in url):
+            match = YOUTUBE_ID_REGEX.search(url)
+            if match:
+                return match.group(1)
+    return None
+
+
+def metadata_key(track: TrackInfo) -> Optional[str]:
+    title = normalize_text(FEATURING_REGEX.sub("", NOISE_TAG_REGEX.sub(" ", track.title or "")))
+    artist = primary_artist(track.artist)
+    if not title:
+        return None
+    return f"meta:{artist}|{title}"
+
+
+def track_keys(track: TrackInfo) -> List[str]:
+    """Every canonical key of `track`, most specific first."""
+    keys = []
+    provider_id = (track.raw_metadata or {}).get("id")
+    if provider_id:
+        keys.append(f"{normalize_text(track.provider_name).replace(' ', '_')}:{provider_id}")
+    video_id = youtube_video_id(track.stream_url, track.webpage_url)
+    if video_id:
+        keys.append(f"youtube:{video_id}")
+    meta = metadata_key(track)
+    if meta:
+        keys.append(meta)
+    # Providers that report the YouTube id as their own id yield the same key twice
+    return list(dict.fromkeys(keys))
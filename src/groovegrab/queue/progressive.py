@@ -0,0 +1,321 @@
+"""
+Progressive (Stream-and-Play) Downloads
+The resolved audio stream is fetched into a cache file that the player follows while it grows; once the stream is
+complete it is transcoded, tagged and saved into the library in the background like any other queue download.
+Playlists are downloaded in play order behind the first track and appended to the player's queue as they finish.
+"""
+
+import threading
+import uuid
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, BinaryIO, Callable, Dict, List, Optional
+
+import httpx
+
+from groovegrab.core.exceptions import ExtractionError
+from groovegrab.core.models import TrackInfo, DownloadOptions, DownloadTask, DownloadStatus
+from groovegrab.player.playlist import LazyPlaylist, PlaylistItem
+from groovegrab.queue.task_queue import TaskQueueManager
+
+# Sequential range requests: googlevideo throttles single unranged downloads to roughly real time
+STREAM_CHUNK_BYTES = 1024 * 1024
+# Playback starts once this much audio is on disk (seconds at the stream bitrate, never less than MIN_BUFFER_BYTES)
+MIN_BUFFER_SEC = 4.0
+MIN_BUFFER_BYTES = 128 * 1024
+
+
+def _content_range_total(header: Optional[str]) -> Optional[int]:
+    """`bytes 0-1023/4096` -> 4096 (None when absent or `*`)."""
+    if not header or "/" not in header:
+        return None
+    total = header.rsplit("/", 1)[1].strip()
+    return int(total) if total.isdigit() else None
+
+
+class ProgressiveDownload:
+    """
+    One track downloaded for immediate playback. `ready` fires once enough audio is buffered, `finished` once the
+    stream file is complete and `finalized` once the tagged library file has been written (or the task failed).
+    """
+
+    def __init__(
+        self,
+        track: TrackInfo,
+        options: DownloadOptions,
+        queue_manager: Optional[TaskQueueManager] = None,
+        cache_dir: Optional[Path] = None,
+        stream: Optional[Dict[str, Any]] = None,
+        on_progress: Optional[Callable[[DownloadTask], None]] = None,
+    ):
+        self.queue_manager = queue_manager or TaskQueueManager()
+        self.cache_dir = cache_dir or Path.home() / ".cache" / "groovegrab" / "streams"
+        self.task = DownloadTask(id=str(uuid.uuid4()), track=track, options=options, status=DownloadStatus.RESOLVING)
+        # Pre-resolved stream (url, http_headers, ext, abr, filesize); resolved through yt-dlp when omitted
+        self.stream = stream
+        self.on_progress = on_progress
+
+        self.stream_path: Optional[Path] = None
+        self.bytes_written = 0
+        self.total_bytes: Optional[int] = None
+        self.error: Optional[str] = None
+
+        self.ready = threading.Event()
+        self.finished = threading.Event()
+        self.finalized = threading.Event()
+        self._ready_bytes = MIN_BUFFER_BYTES
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> "ProgressiveDownload":
+        self.queue_manager.hold_tasks([self.task])
+        # Not a daemon: the library copy is still written if the player exits before the download completes
+        self._thread = threading.Thread(target=self._run, name="groovegrab-progressive")
+        self._thread.start()
+        return self
+
+    def wait_ready(self, timeout: Optional[float] = None) -> bool:
+        """Block until playback can start. False if the download failed or timed out first."""
+        self.ready.wait(timeout)
+        return self.ready.is_set() and self.error is None and self.bytes_written > 0
+
+    def wait_finalized(self, timeout: Optional[float] = None) -> DownloadTask:
+        self.finalized.wait(timeout)
+        return self.task
+
+    @property
+    def output_path(self) -> Optional[Path]:
+        if self.task.status == DownloadStatus.COMPLETED and self.task.output_path:
+            return Path(self.task.output_path)
+        return None
+
+    def cleanup(self):
+        """Delete the stream cache file (and any lyrics saved beside it) once the library copy exists."""
+        if not self.finalized.is_set() or self.stream_path is None:
+            return
+        for path in (self.stream_path, self.stream_path.with_suffix(".lrc")):
+            try:
+                path.unlink(missing_ok=True)
+            except OSError:
+                pass
+
+    def _notify(self):
+        if self.on_progress:
+            self.on_progress(self.task)
+
+    def _run(self):
+        try:
+            try:
+                if self.stream is None:
+                    self.stream = self.queue_manager.downloader.resolve_audio_stream(self.task.track)
+                abr = self.stream.get("abr") or 0
+                self._ready_bytes = max(MIN_BUFFER_BYTES, int(abr * 1000 / 8 * MIN_BUFFER_SEC))
+                self.total_bytes = self.stream.get("filesize")
+
+                target = self.queue_manager.downloader.target_path(self.task.track, self.task.options, "part")
+                self.cache_dir.mkdir(parents=True, exist_ok=True)
+                self.stream_path = self.cache_dir / f"{target.stem}.{self.stream.get('ext') or 'webm'}"
+
+                self.task.status = DownloadStatus.DOWNLOADING
+                self.task.progress = 10.0
+                self._notify()
+                self._fetch(self.stream["url"], self.stream.get("http_headers") or {})
+            except Exception as e:
+                self.error = str(e)
+                self.queue_manager.record_failure(self.task, e)
+                self.queue_manager.storage.save_task(self.task)
+                self._notify()
+            finally:
+                self.ready.set()
+                self.finished.set()
+
+            if self.error is None and self.stream_path is not None:
+                self.queue_manager.finalize_stream_download(self.task, self.stream_path, self.on_progress)
+                if self.task.status in (DownloadStatus.FAILED, DownloadStatus.UNAVAILABLE):
+                    self.error = self.task.error_message
+        finally:
+            self.finalized.set()
+
+    def _fetch(self, url: str, headers: Dict[str, str]):
+        with httpx.Client(headers=headers, follow_redirects=True, timeout=30.0) as client, \
+                open(self.stream_path, "wb") as out:
+            position = 0
+            while True:
+                range_header = {"Range": f"bytes={position}-{position + STREAM_CHUNK_BYTES - 1}"}
+                with client.stream("GET", url, headers=range_header) as resp:
+                    resp.raise_for_status()
+                    if resp.status_code != 206:
+                        if position:
+                            raise ExtractionError("Stream server stopped honouring range requests")
+                        # Range ignored: the body is the whole file
+                        self.total_bytes = int(resp.headers.get("content-length") or 0) or self.total_bytes
+                        self._write_body(resp, out)
+                        return
+                    self.total_bytes = _content_range_total(resp.headers.get("content-range")) or self.total_bytes
+                    received = self._write_body(resp, out)
+
+                position += received
+                if received == 0:
+                    return
+                if self.total_bytes is not None and position >= self.total_bytes:
+                    return
+                if self.total_bytes is None and received < STREAM_CHUNK_BYTES:
+                    return
+
+    def _write_body(self, resp: httpx.Response, out: BinaryIO) -> int:
+        received = 0
+        for piece in resp.iter_bytes(65536):
+            out.write(piece)
+            # Flush every piece: the player and the spectrum decoder read this file while it grows
+            out.flush()
+            received += len(piece)
+            self.bytes_written += len(piece)
+            if self.total_bytes:
+                self.task.progress = min(80.0, 10.0 + self.bytes_written / self.total_bytes * 70.0)
+                self._notify()
+            if not self.ready.is_set() and self.bytes_written >= self._ready_bytes:
+                self.ready.set()
+        return received
+
+
+class PlaylistDownloadSession:
+    """
+    Downloads a whole playlist for immediate playback. The first track is streamed (or downloaded on its own)
+    before anything else starts, the rest go through the download queue in playlist order, and finished tracks
+    are appended to `playlist` in that same order. `complete` fires once every track was appended or failed.
+    """
+
+    def __init__(
+        self,
+        tracks: List[TrackInfo],
+        options: DownloadOptions,
+        queue_manager: Optional[TaskQueueManager] = None,
+        stream_first: bool = True,
+        cache_dir: Optional[Path] = None,
+    ):
+        self.tracks = list(tracks)
+        self.options = options
+        self.queue_manager = queue_manager or TaskQueueManager()
+        self.stream_first = stream_first
+        self.cache_dir = cache_dir
+
+        self.playlist = LazyPlaylist.from_items([])
+        # Stream cache files still being written -> set once complete (TerminalPlayer(growing_files=...))
+        self.growing_files: Dict[Path, threading.Event] = {}
+        self.complete = threading.Event()
+        self.first_stream: Optional[ProgressiveDownload] = None
+        self.failed: List[DownloadTask] = []
+
+        self._lock = threading.Lock()
+        self._changed = threading.Condition(self._lock)
+        self._finished: Dict[int, Optional[PlaylistItem]] = {}
+        self._next_index = 0
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._futures: List[Future] = []
+        self._thread: Optional[threading.Thread] = None
+        self._cancelled = False
+
+    def start(self) -> "PlaylistDownloadSession":
+        if not self.tracks:
+            self.complete.set()
+            return self
+        self._thread = threading.Thread(target=self._run, name="groovegrab-playlist")
+        self._thread.start()
+        return self
+
+    def wait_first(self, timeout: Optional[float] = None) -> bool:
+        """Block until the first playable track is in `playlist`. False if every track failed (or timed out)."""
+        with self._changed:
+            self._changed.wait_for(lambda: len(self.playlist) > 0 or self.complete.is_set(), timeout)
+        return len(self.playlist) > 0
+
+    def pending_count(self) -> int:
+        with self._lock:
+            return len(self.tracks) - self._next_index
+
+    def wait_finished(self):
+        """Wait for every queued download (and the streamed track's library copy) to be written."""
+        if self._thread:
+            self._thread.join()
+        for future in self._futures:
+            if not future.cancelled():
+                future.exception()
+        if self.first_stream:
+            self.first_stream.wait_finalized()
+            if self.first_stream.output_path:
+                self.first_stream.cleanup()
+
+    def cancel(self):
+        """Drop downloads that have not started yet; running ones finish normally."""
+        self._cancelled = True
+        if self._executor:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+        with self._changed:
+            for idx in range(len(self.tracks)):
+                self._finished.setdefault(idx, None)
+            self._advance()
+
+    def _run(self):
+        existing = None
+        if not self.options.overwrite:
+            existing = self.queue_manager.find_existing(self.tracks[0], self.options)
+
+        queued = list(range(len(self.tracks)))
+        if self.stream_first and existing is None:
+            first = self.tracks[0]
+            self.first_stream = ProgressiveDownload(
+                first, self.options, queue_manager=self.queue_manager, cache_dir=self.cache_dir
+            ).start()
+            # The rest of the playlist waits until the first track is buffered, so it gets the bandwidth
+            if self.first_stream.wait_ready() and self.first_stream.stream_path is not None:
+                stream_path = self.first_stream.stream_path
+                self.growing_files[stream_path] = self.first_stream.finished
+                lrc_path = self.queue_manager.downloader.target_path(first, self.options, "lrc")
+                self._deliver(0, (stream_path, first, lrc_path))
+                queued = queued[1:]
+
+        if self._cancelled:
+            return
+        tasks = self.queue_manager.create_tasks([self.tracks[idx] for idx in queued], self.options)
+        self._executor = ThreadPoolExecutor(
+            max_workers=min(self.options.concurrent_downloads, len(tasks)) or 1,
+            thread_name_prefix="groovegrab-playlist",
+        )
+        # Submitted in play order: the worker pool picks up the current and next tracks first
+        for idx, task in zip(queued, tasks):
+            try:
+                future = self._executor.submit(self.queue_manager.run_task, task)
+            except RuntimeError:
+                # cancel() already shut the pool down
+                break
+            future.add_done_callback(lambda f, idx=idx: self._task_done(idx, f))
+            self._futures.append(future)
+        self._executor.shutdown(wait=False)
+
+    def _task_done(self, idx: int, future: Future):
+        if future.cancelled() or future.exception() is not None:
+            self._deliver(idx, None)
+            return
+        task: DownloadTask = future.result()
+        if task.status in (DownloadStatus.FAILED, DownloadStatus.UNAVAILABLE) or not task.output_path:
+            self._deliver(idx, None, failed=task)
+            return
+        audio_path = Path(task.output_path)
+        self._deliver(idx, (audio_path, task.track, audio_path.with_suffix(".lrc")))
+
+    def _deliver(self, idx: int, item: Optional[PlaylistItem], failed: Optional[DownloadTask] = None):
+        with self._changed:
+            if failed is not None:
+                self.failed.append(failed)
+            self._finished.setdefault(idx, item)
+            self._advance()
+
+    def _advance(self):
+        # Append in playlist order: a later track that finishes early waits for the ones before it
+        while self._next_index in self._finished:
+            item = self._finished.pop(self._next_index)
+            if item is not None:
+                self.playlist.append(item)
+            self._next_index += 1
+        if self._next_index >= len(self.tracks):
+            self.complete.set()
+        self._changed.notify_all()
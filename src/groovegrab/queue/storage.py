@@ -1,18 +1,412 @@
 """
 SQLite Database Storage for Download History & Queue State
+The schema is versioned with `PRAGMA user_version`: migrations run once per database, and everything the
+history views filter or display lives in indexed columns, so listing tasks never has to decode `task_json`.
+Payloads are stored as JSON text, or zlib-compressed JSON blobs when compression is enabled; both decode.
 """
 
 import json
+import os
+import re
 import sqlite3
+import time
+import uuid
+import zlib
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
-from typing import List, Optional
+from typing import Callable, Dict, Iterable, Iterator, List, NamedTuple, Optional, Sequence, Tuple, Union
 from platformdirs import user_data_dir
 
-from groovegrab.core.models import DownloadTask, DownloadStatus
+from groovegrab.core.models import DownloadTask, DownloadStatus, Stage, StageTiming, TrackInfo, project_raw_metadata
+from groovegrab.queue.identity import DURATION_TOLERANCE_SEC, track_keys
+
+TERMINAL_STATUSES = (
+    DownloadStatus.COMPLETED, DownloadStatus.SKIPPED, DownloadStatus.FAILED, DownloadStatus.UNAVAILABLE,
+)
+DONE_STATUSES = (DownloadStatus.COMPLETED, DownloadStatus.SKIPPED)
+COMPACT_PAGE_ROWS = 500
+LEASE_SEC = 60.0
+# A task whose lease expired this many times (its worker died mid-run each time) is no longer handed out
+MAX_CLAIM_ATTEMPTS = 5
+
+
+def _sql_in(statuses: Sequence[DownloadStatus]) -> str:
+    return "(" + ", ".join(f"'{status.value}'" for status in statuses) + ")"
+
+
+# SQL `IN` lists: tasks that are finished, that produced a file, and that `resume` never retries
+_TERMINAL_SQL = _sql_in(TERMINAL_STATUSES)
+_DONE_SQL = _sql_in(DONE_STATUSES)
+_SETTLED_SQL = _sql_in(DONE_STATUSES + (DownloadStatus.UNAVAILABLE,))
+
+
+class TaskRow(NamedTuple):
+    """One history row, read straight from the indexed columns (no JSON decoding)."""
+    id: str
+    title: str
+    artist: str
+    provider: str
+    status: str
+    output_path: Optional[str]
+    error_message: Optional[str]
+    webpage_url: Optional[str]
+    audio_format: Optional[str]
+    bytes: Optional[int]
+    created_at: str
+    updated_at: Optional[str]
+    started_at: Optional[str]
+    finished_at: Optional[str]
+
+
+ROW_COLUMNS = ", ".join(TaskRow._fields)
+
+
+class BatchRow(NamedTuple):
+    """One `dl` invocation and how far its tasks got."""
+    id: str
+    title: str
+    source: Optional[str]
+    created_at: str
+    total: int
+    done: int
+    failed: int
+    unavailable: int
+    unfinished: int
+
+    @property
+    def resumable(self) -> bool:
+        return self.failed + self.unfinished > 0
+
+
+class CompactResult(NamedTuple):
+    pruned: int
+    slimmed: int
+    size_before: int
+    size_after: int
+
+
+class StageStats(NamedTuple):
+    stage: str
+    count: int
+    failed: int
+    p50_ms: Optional[float]
+    p95_ms: Optional[float]
+    bytes: Optional[int]
+    bytes_per_sec: Optional[float]
+
+
+class GroupStats(NamedTuple):
+    """
+    Per provider / per format task outcomes (failure_rate counts failed and unavailable tasks); latencies are
+    whole-task (last stage end) times.
+    """
+    key: Optional[str]
+    tasks: int
+    completed: int
+    skipped: int
+    failed: int
+    unavailable: int
+    failure_rate: Optional[float]
+    p50_ms: Optional[float]
+    p95_ms: Optional[float]
+    download_bytes: Optional[int]
+    download_bytes_per_sec: Optional[float]
+
+
+def since_timestamp(value: str) -> str:
+    """
+    `--since` value -> UTC timestamp in the column format (`YYYY-MM-DD HH:MM:SS`).
+    Accepts relative ages (`90m`, `12h`, `7d`, `2w`) and ISO dates / datetimes.
+    """
+    value = value.strip()
+    match = re.fullmatch(r"(\d+)\s*([mhdw])", value.lower())
+    if match:
+        amount, unit = int(match.group(1)), match.group(2)
+        delta = {"m": timedelta(minutes=amount), "h": timedelta(hours=amount),
+                 "d": timedelta(days=amount), "w": timedelta(weeks=amount)}[unit]
+        moment = datetime.now(timezone.utc) - delta
+    else:
+        try:
+            moment = datetime.fromisoformat(value)
+        except ValueError:
+            raise ValueError(f"Invalid time '{value}' (use e.g. 12h, 7d or 2026-01-31)")
+        if moment.tzinfo is not None:
+            moment = moment.astimezone(timezone.utc)
+    return moment.strftime("%Y-%m-%d %H:%M:%S")
+
+
+# ---------------------------------------------------------------------- payload codec
+
+def encode_payload(payload_json: str, compress: bool) -> Union[str, bytes]:
+    return zlib.compress(payload_json.encode("utf-8"), 6) if compress else payload_json
+
+
+def decode_payload(payload: Union[str, bytes]) -> str:
+    """JSON text of a stored payload (raises ValueError for anything unreadable)."""
+    if isinstance(payload, bytes):
+        try:
+            return zlib.decompress(payload).decode("utf-8")
+        except (zlib.error, UnicodeDecodeError) as e:
+            raise ValueError(f"Corrupt compressed task payload: {e}")
+    return payload
+
+
+def _decode_task(payload: Union[str, bytes]) -> Optional[DownloadTask]:
+    try:
+        return DownloadTask.model_validate_json(decode_payload(payload))
+    except ValueError:
+        # A corrupt historical row must not make the history command unusable.
+        return None
+
+
+# ---------------------------------------------------------------------- migrations
+
+def _column_names(conn: sqlite3.Connection, table: str) -> List[str]:
+    return [row[1] for row in conn.execute(f"PRAGMA table_info({table})")]
+
+
+def _migrate_v1(conn: sqlite3.Connection):
+    """Indexed status / provider / URL / format / size / timestamp columns, backfilled from task_json."""
+    # Databases created before versioning already have this table (user_version 0)
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS download_tasks (
+                id TEXT PRIMARY KEY,
+                title TEXT NOT NULL,
+                artist TEXT NOT NULL,
+                provider TEXT NOT NULL,
+                status TEXT NOT NULL,
+                output_path TEXT,
+                error_message TEXT,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                task_json TEXT NOT NULL
+            )
+    """)
+    existing = set(_column_names(conn, "download_tasks"))
+    for column, decl in (
+        ("webpage_url", "TEXT"),
+        ("audio_format", "TEXT"),
+        ("bytes", "INTEGER"),
+        ("updated_at", "TIMESTAMP"),
+        ("started_at", "TIMESTAMP"),
+        ("finished_at", "TIMESTAMP"),
+    ):
+        if column not in existing:
+            conn.execute(f"ALTER TABLE download_tasks ADD COLUMN {column} {decl}")
+
+    conn.execute("""
+        UPDATE download_tasks SET
+            webpage_url = json_extract(task_json, '$.track.webpage_url'),
+            audio_format = json_extract(task_json, '$.options.audio_format'),
+            updated_at = created_at,
+            finished_at = CASE WHEN status IN ('completed', 'skipped', 'failed') THEN created_at END
+        WHERE json_valid(task_json)
+    """)
+
+    conn.execute("DROP INDEX IF EXISTS idx_download_tasks_created_at")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_download_tasks_created ON download_tasks(created_at, id)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_download_tasks_status ON download_tasks(status, created_at)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_download_tasks_provider ON download_tasks(provider, created_at)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_download_tasks_webpage_url ON download_tasks(webpage_url)")
+
+
+def _migrate_v2(conn: sqlite3.Connection):
+    """Batches: every `dl` run groups its tasks so an interrupted run can be resumed from the database."""
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS batches (
+            id TEXT PRIMARY KEY,
+            title TEXT NOT NULL,
+            source TEXT,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+    if "batch_id" not in _column_names(conn, "download_tasks"):
+        conn.execute("ALTER TABLE download_tasks ADD COLUMN batch_id TEXT REFERENCES batches(id)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_download_tasks_batch ON download_tasks(batch_id, status)")
+
+
+def _migrate_v3(conn: sqlite3.Connection):
+    """Filter indexes that also cover the keyset order, so filtered pages never sort in a temp b-tree."""
+    conn.execute("DROP INDEX IF EXISTS idx_download_tasks_status")
+    conn.execute("DROP INDEX IF EXISTS idx_download_tasks_provider")
+    conn.execute("CREATE INDEX idx_download_tasks_status ON download_tasks(status, created_at, id)")
+    conn.execute(
+        "CREATE INDEX idx_download_tasks_provider ON download_tasks(provider COLLATE NOCASE, created_at, id)"
+    )
+
+
+def _migrate_v4(conn: sqlite3.Connection):
+    """Per-stage timings (monotonic ms since the task started) and byte counts for every task run."""
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS task_stages (
+            task_id TEXT NOT NULL,
+            stage TEXT NOT NULL,
+            start_ms REAL NOT NULL,
+            end_ms REAL NOT NULL,
+            bytes INTEGER,
+            ok INTEGER NOT NULL DEFAULT 1,
+            PRIMARY KEY (task_id, stage)
+        ) WITHOUT ROWID
+    """)
+
+
+def _migrate_v5(conn: sqlite3.Connection):
+    """Global index of downloaded files by canonical track key, backfilled from finished history rows."""
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS track_index (
+            key TEXT NOT NULL,
+            output_path TEXT NOT NULL,
+            duration INTEGER,
+            bytes INTEGER,
+            audio_format TEXT,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            PRIMARY KEY (key, output_path)
+        ) WITHOUT ROWID
+    """)
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_track_index_path ON track_index(output_path)")
+    # Columns only (no payload decoding): provider ids and durations arrive as tracks are downloaded again
+    rows = conn.execute(
+        "SELECT title, artist, webpage_url, output_path, bytes, audio_format FROM download_tasks "
+        f"WHERE status IN {_DONE_SQL} AND output_path IS NOT NULL ORDER BY rowid"
+    ).fetchall()
+    conn.executemany(
+        "INSERT OR REPLACE INTO track_index (key, output_path, duration, bytes, audio_format) VALUES (?, ?, NULL, ?, ?)",
+        [
+            (key, row[3], row[4], row[5])
+            for row in rows
+            for key in track_keys(TrackInfo(title=row[0], artist=row[1], webpage_url=row[2]))
+        ],
+    )
+
+
+def _migrate_v6(conn: sqlite3.Connection):
+    """Lets `queue --watch` fetch only the rows written since its last refresh."""
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_download_tasks_updated ON download_tasks(updated_at)")
+
+
+def _migrate_v7(conn: sqlite3.Connection):
+    """Work-queue leases: which process owns an unfinished task until when, and how often it was claimed."""
+    existing = set(_column_names(conn, "download_tasks"))
+    for column, decl in (
+        ("track_key", "TEXT"),
+        ("lease_owner", "TEXT"),
+        ("lease_expires_at", "REAL"),
+        ("attempts", "INTEGER NOT NULL DEFAULT 0"),
+    ):
+        if column not in existing:
+            conn.execute(f"ALTER TABLE download_tasks ADD COLUMN {column} {decl}")
+    # Older rows get a key of their own: they never block (or are blocked by) another task
+    conn.execute("UPDATE download_tasks SET track_key = id WHERE track_key IS NULL")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_download_tasks_track_key ON download_tasks(track_key, status)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_download_tasks_lease_owner ON download_tasks(lease_owner)")
+
+
+def _migrate_v8(conn: sqlite3.Connection):
+    """Failure memo: sources (URL or search query) known to be permanently unavailable, until `expires_at`."""
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS source_failures (
+            key TEXT PRIMARY KEY,
+            reason TEXT NOT NULL,
+            failed_at REAL NOT NULL,
+            expires_at REAL NOT NULL
+        ) WITHOUT ROWID
+    """)
+
+
+# Schema version -> migration that produces it from the previous version
+MIGRATIONS: Dict[int, Callable[[sqlite3.Connection], None]] = {
+    1: _migrate_v1,
+    2: _migrate_v2,
+    3: _migrate_v3,
+    4: _migrate_v4,
+    5: _migrate_v5,
+    6: _migrate_v6,
+    7: _migrate_v7,
+    8: _migrate_v8,
+}
+SCHEMA_VERSION = max(MIGRATIONS)
+
+
+class HistoryWatcher:
+    """
+    Incremental history reader for live views. Holds one read connection; `poll` costs a single
+    `PRAGMA data_version` read while nothing is written, and otherwise fetches only the rows whose
+    `updated_at` is at or after the newest one already seen.
+    """
+
+    def __init__(
+        self,
+        storage: "TaskStorage",
+        status: Optional[DownloadStatus] = None,
+        provider: Optional[str] = None,
+        since: Optional[str] = None,
+    ):
+        self.storage = storage
+        self.status = DownloadStatus(status).value if status is not None else None
+        # status is checked per row: a row that leaves the filtered status must still be reported
+        self._clauses, self._params = storage._row_filters(None, provider, since)
+        self._conn = storage._get_connection()
+        self._version: Optional[int] = None
+        self._high_water = ""
+        # Ids already reported with updated_at == _high_water (the next `>=` query returns them again)
+        self._at_high_water: set = set()
+
+    def _data_version(self) -> int:
+        return self._conn.execute("PRAGMA data_version").fetchone()[0]
+
+    def snapshot(self, limit: int = 50) -> List[TaskRow]:
+        """Newest matching rows; also sets the baseline for the following polls."""
+        self._version = self._data_version()
+        clauses, params = list(self._clauses), list(self._params)
+        if self.status is not None:
+            clauses.append("status = ?")
+            params.append(self.status)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        rows = [TaskRow(*row) for row in self._conn.execute(
+            f"SELECT {ROW_COLUMNS} FROM download_tasks {where} ORDER BY created_at DESC, id DESC LIMIT ?",
+            (*params, limit),
+        )]
+        newest = self._conn.execute("SELECT MAX(updated_at) FROM download_tasks").fetchone()[0]
+        self._high_water = newest or ""
+        self._at_high_water = {
+            row[0] for row in self._conn.execute("SELECT id FROM download_tasks WHERE updated_at = ?", (newest,))
+        }
+        return rows
+
+    def poll(self) -> Optional[List[TaskRow]]:
+        """Rows changed since the last poll (those no longer matching the status filter included); None if idle."""
+        version = self._data_version()
+        if version == self._version:
+            return None
+        self._version = version
+        clauses = self._clauses + ["updated_at >= ?"]
+        rows = [
+            TaskRow(*row) for row in self._conn.execute(
+                f"SELECT {ROW_COLUMNS} FROM download_tasks WHERE {' AND '.join(clauses)}",
+                (*self._params, self._high_water),
+            )
+            if not (row["updated_at"] == self._high_water and row["id"] in self._at_high_water)
+        ]
+        if rows:
+            newest = max(row.updated_at for row in rows)
+            if newest != self._high_water:
+                self._high_water, self._at_high_water = newest, set()
+            self._at_high_water.update(row.id for row in rows if row.updated_at == newest)
+        return rows
+
+    def matches(self, row: TaskRow) -> bool:
+        return self.status is None or row.status == self.status
+
+    def close(self):
+        self._conn.close()
 
 
 class TaskStorage:
-    def __init__(self, db_path: Optional[Path] = None):
+    def __init__(
+        self,
+        db_path: Optional[Path] = None,
+        compress: bool = False,
+        keep_raw_metadata: bool = False,
+    ):
         if not db_path:
             try:
                 data_dir = Path(user_data_dir("groovegrab"))
@@ -23,6 +417,9 @@ class TaskStorage:
                 data_dir.mkdir(parents=True, exist_ok=True)
                 db_path = data_dir / "groovegrab.db"
         self.db_path = db_path
+        self.compress = compress
+        # By default rows store only the projection of `track.raw_metadata` (see RAW_METADATA_FIELDS)
+        self.keep_raw_metadata = keep_raw_metadata
         self._init_db()
 
     def _get_connection(self) -> sqlite3.Connection:
@@ -33,64 +430,626 @@ class TaskStorage:
         return conn
 
     def _init_db(self):
+        conn = self._get_connection()
+        try:
+            # Up-to-date databases cost a single pragma read
+            if conn.execute("PRAGMA user_version").fetchone()[0] >= SCHEMA_VERSION:
+                return
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                # Another process may have migrated while we waited for the write lock
+                version = conn.execute("PRAGMA user_version").fetchone()[0]
+                for target in range(version + 1, SCHEMA_VERSION + 1):
+                    MIGRATIONS[target](conn)
+                    conn.execute(f"PRAGMA user_version = {target}")
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                raise
+        finally:
+            conn.close()
+
+    def save_task(self, task: DownloadTask) -> None:
+        self.save_tasks([task])
+
+    def save_tasks(
+        self,
+        tasks: Iterable[DownloadTask],
+        lease_owner: Optional[str] = None,
+        lease_sec: float = LEASE_SEC,
+    ) -> None:
+        """
+        Upsert tasks (and the stage timings of those that carry any) in a single transaction. New rows are leased
+        to `lease_owner` when given; a terminal status releases the lease of an existing row.
+        """
+        tasks = list(tasks)
+        params = [self._task_params(task) for task in tasks]
+        lease = (lease_owner, time.time() + lease_sec if lease_owner else None)
         with self._get_connection() as conn:
-            conn.execute("""
-                CREATE TABLE IF NOT EXISTS download_tasks (
-                        id TEXT PRIMARY KEY,
-                        title TEXT NOT NULL,
-                        artist TEXT NOT NULL,
-                        provider TEXT NOT NULL,
-                        status TEXT NOT NULL,
-                        output_path TEXT,
-                        error_message TEXT,
-                        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                        task_json TEXT NOT NULL
-                    )
-            """)
-            conn.execute(
-                "CREATE INDEX IF NOT EXISTS idx_download_tasks_created_at "
-                "ON download_tasks(created_at DESC)"
+            conn.executemany(f"""
+                INSERT INTO download_tasks
+                (id, title, artist, provider, status, output_path, error_message,
+                 webpage_url, audio_format, bytes, batch_id, track_key, updated_at, started_at, finished_at, task_json,
+                 lease_owner, lease_expires_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, strftime('%Y-%m-%d %H:%M:%f', 'now'),
+                        CASE WHEN ? THEN CURRENT_TIMESTAMP END,
+                        CASE WHEN ? THEN CURRENT_TIMESTAMP END, ?, ?, ?)
+                ON CONFLICT(id) DO UPDATE SET
+                    title = excluded.title,
+                    artist = excluded.artist,
+                    provider = excluded.provider,
+                    status = excluded.status,
+                    output_path = excluded.output_path,
+                    error_message = excluded.error_message,
+                    webpage_url = excluded.webpage_url,
+                    audio_format = excluded.audio_format,
+                    bytes = excluded.bytes,
+                    batch_id = excluded.batch_id,
+                    updated_at = excluded.updated_at,
+                    started_at = COALESCE(download_tasks.started_at, excluded.started_at),
+                    finished_at = excluded.finished_at,
+                    task_json = excluded.task_json,
+                    lease_owner = CASE WHEN excluded.status IN {_TERMINAL_SQL}
+                                       THEN NULL ELSE download_tasks.lease_owner END,
+                    lease_expires_at = CASE WHEN excluded.status IN {_TERMINAL_SQL}
+                                            THEN NULL ELSE download_tasks.lease_expires_at END
+            """, [row + lease for row in params])
+
+            # Finished files join the global track index under every canonical key of their track
+            conn.executemany(
+                "INSERT OR REPLACE INTO track_index (key, output_path, duration, bytes, audio_format) VALUES (?, ?, ?, ?, ?)",
+                [
+                    (key, task.output_path, task.track.duration, row[9], Path(task.output_path).suffix[1:] or None)
+                    for task, row in zip(tasks, params)
+                    if task.status in DONE_STATUSES and task.output_path
+                    for key in track_keys(task.track)
+                ],
             )
+
+            timed = [task for task in tasks if task.stages]
+            if timed:
+                # A rerun (resume) replaces the timings of the previous attempt
+                conn.executemany("DELETE FROM task_stages WHERE task_id = ?", [(task.id,) for task in timed])
+                conn.executemany(
+                    "INSERT OR REPLACE INTO task_stages (task_id, stage, start_ms, end_ms, bytes, ok) VALUES (?, ?, ?, ?, ?, ?)",
+                    [
+                        (task.id, timing.stage.value, timing.start_ms, timing.end_ms, timing.bytes, timing.ok)
+                        for task in timed for timing in task.stages
+                    ],
+                )
             conn.commit()
 
-    def save_task(self, task: DownloadTask) -> None:
+    def _task_params(self, task: DownloadTask) -> tuple:
+        started = task.status != DownloadStatus.PENDING
+        finished = task.status in TERMINAL_STATUSES
+        size = None
+        if finished and task.output_path:
+            try:
+                size = os.stat(task.output_path).st_size
+            except OSError:
+                pass
+        return (
+            task.id,
+            task.track.title,
+            task.track.artist,
+            task.track.provider_name,
+            task.status.value,
+            task.output_path,
+            task.error_message,
+            task.track.webpage_url,
+            task.options.audio_format.value,
+            size,
+            task.batch_id,
+            (track_keys(task.track) or [task.id])[0],
+            started,
+            finished,
+            encode_payload(json.dumps(self._task_payload(task)), self.compress),
+        )
+
+    def _task_payload(self, task: DownloadTask) -> dict:
+        if self.keep_raw_metadata:
+            # Stage timings live in task_stages
+            return task.model_dump(mode="json", exclude={"stages"})
+        data = task.model_dump(mode="json", exclude={"stages": True, "track": {"raw_metadata"}})
+        data["track"]["raw_metadata"] = project_raw_metadata(task.track.raw_metadata)
+        return data
+
+    @staticmethod
+    def _row_filters(
+        status: Optional[DownloadStatus], provider: Optional[str], since: Optional[str]
+    ) -> Tuple[List[str], List[str]]:
+        clauses, params = [], []
+        if status is not None:
+            clauses.append("status = ?")
+            params.append(DownloadStatus(status).value)
+        if provider:
+            clauses.append("provider = ? COLLATE NOCASE")
+            params.append(provider)
+        if since:
+            clauses.append("created_at >= ?")
+            params.append(since)
+        return clauses, params
+
+    def query_rows(
+        self,
+        status: Optional[DownloadStatus] = None,
+        provider: Optional[str] = None,
+        since: Optional[str] = None,
+        limit: int = 50,
+    ) -> List[TaskRow]:
+        """Newest-first history rows filtered in SQL (`since` is a column-format timestamp, see since_timestamp)."""
+        if limit < 1:
+            return []
+        clauses, params = self._row_filters(status, provider, since)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        with self._get_connection() as conn:
+            rows = conn.execute(
+                f"SELECT {ROW_COLUMNS} FROM download_tasks {where} ORDER BY created_at DESC, id DESC LIMIT ?",
+                (*params, limit),
+            ).fetchall()
+        return [TaskRow(*row) for row in rows]
+
+    def iter_rows(
+        self,
+        status: Optional[DownloadStatus] = None,
+        provider: Optional[str] = None,
+        since: Optional[str] = None,
+        page_size: int = 1000,
+    ) -> Iterator[TaskRow]:
+        """
+        Every matching row, newest first, fetched in keyset pages on (created_at, id): each page is an index
+        seek past the last row seen, so memory stays at one page and no read transaction spans the whole walk.
+        """
+        clauses, params = self._row_filters(status, provider, since)
+        cursor: Optional[Tuple[str, str]] = None
+        conn = self._get_connection()
+        try:
+            while True:
+                page_clauses, page_params = list(clauses), list(params)
+                if cursor is not None:
+                    page_clauses.append("(created_at, id) < (?, ?)")
+                    page_params.extend(cursor)
+                where = f"WHERE {' AND '.join(page_clauses)}" if page_clauses else ""
+                rows = conn.execute(
+                    f"SELECT {ROW_COLUMNS} FROM download_tasks {where} ORDER BY created_at DESC, id DESC LIMIT ?",
+                    (*page_params, page_size),
+                ).fetchall()
+                for row in rows:
+                    yield TaskRow(*row)
+                if len(rows) < page_size:
+                    return
+                cursor = (rows[-1]["created_at"], rows[-1]["id"])
+        finally:
+            conn.close()
+
+    def get_task(self, task_id: str) -> Optional[DownloadTask]:
+        """Full task (decoded from task_json) by id or unique id prefix; None if missing, ambiguous or unreadable."""
+        # Prefix range on the primary key
         with self._get_connection() as conn:
-            conn.execute("""
-                    INSERT INTO download_tasks
-                    (id, title, artist, provider, status, output_path, error_message, task_json)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-                    ON CONFLICT(id) DO UPDATE SET
-                        title = excluded.title,
-                        artist = excluded.artist,
-                        provider = excluded.provider,
-                        status = excluded.status,
-                        output_path = excluded.output_path,
-                        error_message = excluded.error_message,
-                        task_json = excluded.task_json
-                """, (
-                    task.id,
-                    task.track.title,
-                    task.track.artist,
-                    task.track.provider_name,
-                    task.status.value,
-                    task.output_path,
-                    task.error_message,
-                    json.dumps(task.model_dump(mode="json"))
-                ))
+            rows = conn.execute(
+                "SELECT task_json FROM download_tasks WHERE id >= ? AND id < ? LIMIT 2", (task_id, task_id + "\uffff")
+            ).fetchall()
+        if len(rows) != 1:
+            return None
+        task = _decode_task(rows[0]["task_json"])
+        if task is not None:
+            with self._get_connection() as conn:
+                stages = conn.execute(
+                    "SELECT stage, start_ms, end_ms, bytes, ok FROM task_stages WHERE task_id = ? ORDER BY start_ms",
+                    (task.id,),
+                ).fetchall()
+            task.stages = [
+                StageTiming(stage=r[0], start_ms=r[1], end_ms=r[2], bytes=r[3], ok=bool(r[4])) for r in stages
+            ]
+        return task
+
+    # ------------------------------------------------------------------ batches
+
+    def create_batch(self, title: str, source: Optional[str] = None) -> str:
+        batch_id = str(uuid.uuid4())
+        with self._get_connection() as conn:
+            conn.execute("INSERT INTO batches (id, title, source) VALUES (?, ?, ?)", (batch_id, title, source))
             conn.commit()
+        return batch_id
+
+    def _batch_rows(self, where: str = "", params: tuple = (), having: str = "", limit: int = 20) -> List[BatchRow]:
+        with self._get_connection() as conn:
+            rows = conn.execute(f"""
+                SELECT b.id, b.title, b.source, b.created_at,
+                       COUNT(t.id) AS total,
+                       COALESCE(SUM(t.status IN {_DONE_SQL}), 0) AS done,
+                       COALESCE(SUM(t.status = 'failed'), 0) AS failed,
+                       COALESCE(SUM(t.status = 'unavailable'), 0) AS unavailable,
+                       COALESCE(SUM(t.status NOT IN {_TERMINAL_SQL}), 0) AS unfinished
+                FROM batches b LEFT JOIN download_tasks t ON t.batch_id = b.id
+                {where}
+                GROUP BY b.id {having}
+                ORDER BY b.created_at DESC, b.rowid DESC
+                LIMIT ?
+            """, (*params, limit)).fetchall()
+        return [BatchRow(*row) for row in rows]
+
+    def list_batches(self, limit: int = 20, resumable_only: bool = False) -> List[BatchRow]:
+        """Newest-first batches with per-status task counts (one grouped query over the batch index)."""
+        return self._batch_rows(having="HAVING failed + unfinished > 0" if resumable_only else "", limit=limit)
+
+    def find_batch(self, batch_id: Optional[str] = None) -> Optional[BatchRow]:
+        """Batch by id or unique id prefix; without an id, the newest batch that still has work left."""
+        if batch_id is None:
+            batches = self.list_batches(limit=1, resumable_only=True)
+        else:
+            batches = self._batch_rows("WHERE b.id >= ? AND b.id < ?", (batch_id, batch_id + "\uffff"), limit=2)
+        return batches[0] if len(batches) == 1 else None
+
+    def load_resumable_tasks(self, batch_id: str) -> List[DownloadTask]:
+        """Unfinished and failed tasks of a batch, rebuilt from storage in their original order."""
+        with self._get_connection() as conn:
+            rows = conn.execute(
+                "SELECT task_json FROM download_tasks "
+                f"WHERE batch_id = ? AND status NOT IN {_SETTLED_SQL} ORDER BY rowid",
+                (batch_id,),
+            ).fetchall()
+        return [task for task in map(_decode_task, (row["task_json"] for row in rows)) if task is not None]
 
     def list_tasks(self, limit: int = 50) -> List[DownloadTask]:
         if limit < 1:
             return []
         with self._get_connection() as conn:
             rows = conn.execute(
-                "SELECT task_json FROM download_tasks ORDER BY created_at DESC LIMIT ?", (limit,)
+                "SELECT task_json FROM download_tasks ORDER BY created_at DESC, id DESC LIMIT ?", (limit,)
             ).fetchall()
-        tasks = []
-        for row in rows:
+        return [task for task in map(_decode_task, (row["task_json"] for row in rows)) if task is not None]
+
+    # ------------------------------------------------------------------ work queue leases
+
+    def claim_tasks(
+        self,
+        owner: str,
+        limit: int = 1,
+        batch_id: Optional[str] = None,
+        lease_sec: float = LEASE_SEC,
+    ) -> List[DownloadTask]:
+        """
+        Atomically lease up to `limit` unfinished tasks that nobody holds (or whose lease expired), oldest first.
+        A task whose canonical track key another unfinished task holds a live lease on is not claimable, and at
+        most one copy per key is claimed at a time, so overlapping playlists in different processes never
+        download the same song twice: the duplicates wait, then hit the track index. Abandoned copies (no live
+        lease, e.g. of an interrupted batch) never block a copy in the claimed scope.
+        """
+        now = time.time()
+        conn = self._get_connection()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                rows = conn.execute(f"""
+                    UPDATE download_tasks
+                    SET lease_owner = :owner, lease_expires_at = :expires, attempts = attempts + 1
+                    WHERE id IN (
+                        SELECT t.id FROM download_tasks t
+                        WHERE t.status NOT IN {_TERMINAL_SQL}
+                          AND (t.lease_expires_at IS NULL OR t.lease_expires_at < :now)
+                          AND (:batch IS NULL OR t.batch_id = :batch)
+                          AND t.attempts < :max_attempts
+                          AND NOT EXISTS (
+                              SELECT 1 FROM download_tasks x
+                              WHERE x.track_key = t.track_key AND x.lease_expires_at >= :now
+                                AND x.status NOT IN {_TERMINAL_SQL}
+                          )
+                          AND t.rowid = (
+                              SELECT MIN(y.rowid) FROM download_tasks y
+                              WHERE y.track_key = t.track_key AND y.attempts < :max_attempts
+                                AND (y.lease_expires_at IS NULL OR y.lease_expires_at < :now)
+                                AND (:batch IS NULL OR y.batch_id = :batch)
+                                AND y.status NOT IN {_TERMINAL_SQL}
+                          )
+                        ORDER BY t.rowid
+                        LIMIT :limit
+                    )
+                    RETURNING task_json
+                """, {
+                    "owner": owner, "expires": now + lease_sec, "now": now, "batch": batch_id,
+                    "max_attempts": MAX_CLAIM_ATTEMPTS, "limit": limit,
+                }).fetchall()
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                raise
+        finally:
+            conn.close()
+        return [task for task in map(_decode_task, (row[0] for row in rows)) if task is not None]
+
+    def count_unfinished(self, batch_id: Optional[str] = None) -> int:
+        """Unfinished tasks (of a batch) that are, or will become, claimable by some worker."""
+        with self._get_connection() as conn:
+            return conn.execute(
+                "SELECT COUNT(*) FROM download_tasks "
+                f"WHERE status NOT IN {_TERMINAL_SQL} AND attempts < ? AND (? IS NULL OR batch_id = ?)",
+                (MAX_CLAIM_ATTEMPTS, batch_id, batch_id),
+            ).fetchone()[0]
+
+    def heartbeat(self, owner: str, lease_sec: float = LEASE_SEC) -> int:
+        """Extend every unfinished lease `owner` holds; returns how many it still holds."""
+        with self._get_connection() as conn:
+            renewed = conn.execute(
+                "UPDATE download_tasks SET lease_expires_at = ? "
+                f"WHERE lease_owner = ? AND status NOT IN {_TERMINAL_SQL}",
+                (time.time() + lease_sec, owner),
+            ).rowcount
+            conn.commit()
+        return renewed
+
+    def release_leases(self, owner: str) -> int:
+        """
+        Hand `owner`'s unfinished tasks back to the queue (graceful shutdown), as pending. The claims' attempts
+        are given back: only leases that expired count towards MAX_CLAIM_ATTEMPTS.
+        """
+        with self._get_connection() as conn:
+            released = conn.execute(
+                "UPDATE download_tasks "
+                "SET lease_owner = NULL, lease_expires_at = NULL, status = 'pending', attempts = MAX(attempts - 1, 0) "
+                f"WHERE lease_owner = ? AND status NOT IN {_TERMINAL_SQL}",
+                (owner,),
+            ).rowcount
+            conn.commit()
+        return released
+
+    def requeue_batch(self, batch_id: str, owner: Optional[str] = None) -> int:
+        """
+        Make a batch's failed tasks and its abandoned ones (lease expired, or held by `owner`) claimable again,
+        with a fresh attempt budget. Tasks another live process is working on are left alone.
+        """
+        with self._get_connection() as conn:
+            requeued = conn.execute(f"""
+                UPDATE download_tasks
+                SET status = 'pending', error_message = NULL, lease_owner = NULL, lease_expires_at = NULL, attempts = 0
+                WHERE batch_id = ? AND status NOT IN {_SETTLED_SQL}
+                  AND (lease_owner IS NULL OR lease_owner = ? OR lease_expires_at < ?)
+            """, (batch_id, owner, time.time())).rowcount
+            conn.commit()
+        return requeued
+
+    # ------------------------------------------------------------------ source failure memo
+
+    def record_source_failure(self, keys: Iterable[str], reason: str, ttl_sec: float) -> None:
+        """Remember that the sources `keys` are permanently unavailable (`reason`) for the next `ttl_sec` seconds."""
+        now = time.time()
+        with self._get_connection() as conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO source_failures (key, reason, failed_at, expires_at) VALUES (?, ?, ?, ?)",
+                [(key, reason, now, now + ttl_sec) for key in dict.fromkeys(keys) if key],
+            )
+            conn.commit()
+
+    def find_source_failure(self, keys: Iterable[str]) -> Optional[str]:
+        """Reason recorded for the first of `keys` still remembered as unavailable, else None."""
+        keys = [key for key in keys if key]
+        if not keys:
+            return None
+        placeholders = ", ".join("?" for _ in keys)
+        with self._get_connection() as conn:
+            row = conn.execute(
+                f"SELECT reason FROM source_failures WHERE key IN ({placeholders}) AND expires_at > ? LIMIT 1",
+                (*keys, time.time()),
+            ).fetchone()
+        return row[0] if row else None
+
+    def forget_source_failures(self, expired_only: bool = True) -> int:
+        """Drop expired failure memos (or all of them, so every known-dead source is retried once)."""
+        with self._get_connection() as conn:
+            if expired_only:
+                deleted = conn.execute("DELETE FROM source_failures WHERE expires_at <= ?", (time.time(),)).rowcount
+            else:
+                deleted = conn.execute("DELETE FROM source_failures").rowcount
+            conn.commit()
+        return deleted
+
+    # ------------------------------------------------------------------ track index
+
+    def find_indexed_track(self, track: TrackInfo, preferred_format: Optional[str] = None) -> Optional[Path]:
+        """
+        A downloaded file for `track` from any folder, looked up by canonical key (id keys exactly, the metadata
+        key within DURATION_TOLERANCE_SEC). Only the hit is stat()ed; entries whose file is gone are dropped.
+        """
+        keys = track_keys(track)
+        if not keys:
+            return None
+        placeholders = ", ".join("?" for _ in keys)
+        with self._get_connection() as conn:
+            rows = conn.execute(f"""
+                SELECT DISTINCT output_path, audio_format = ? AS preferred, updated_at FROM track_index
+                WHERE key IN ({placeholders})
+                  AND (key NOT LIKE 'meta:%' OR duration IS NULL OR ? IS NULL OR abs(duration - ?) <= ?)
+                ORDER BY preferred DESC, updated_at DESC
+            """, (preferred_format, *keys, track.duration, track.duration, DURATION_TOLERANCE_SEC)).fetchall()
+
+            stale = []
             try:
-                tasks.append(DownloadTask.model_validate_json(row["task_json"]))
-            except ValueError:
-                # A corrupt historical row must not make the history command unusable.
-                continue
-        return tasks
+                for row in rows:
+                    path = Path(row[0])
+                    try:
+                        if path.stat().st_size > 1024:
+                            return path
+                    except OSError:
+                        pass
+                    stale.append((row[0],))
+                return None
+            finally:
+                if stale:
+                    conn.executemany("DELETE FROM track_index WHERE output_path = ?", stale)
+                    conn.commit()
+
+    # ------------------------------------------------------------------ stats
+
+    def stage_stats(self, since: Optional[str] = None, provider: Optional[str] = None) -> List[StageStats]:
+        """Count, failures, nearest-rank p50 / p95 latency and throughput per stage, computed in SQL."""
+        clauses, params = self._row_filters(None, provider, since)
+        where = f"WHERE {' AND '.join('t.' + c for c in clauses)}" if clauses else ""
+        with self._get_connection() as conn:
+            rows = conn.execute(f"""
+                WITH timed AS (
+                    SELECT s.stage, s.end_ms - s.start_ms AS ms, s.bytes, s.ok
+                    FROM task_stages s JOIN download_tasks t ON t.id = s.task_id
+                    {where}
+                ), ranked AS (
+                    SELECT *, ROW_NUMBER() OVER (PARTITION BY stage ORDER BY ms) AS rn,
+                              COUNT(*) OVER (PARTITION BY stage) AS n
+                    FROM timed
+                )
+                SELECT stage, COUNT(*), SUM(NOT ok),
+                       MIN(CASE WHEN rn >= 0.50 * n THEN ms END),
+                       MIN(CASE WHEN rn >= 0.95 * n THEN ms END),
+                       SUM(bytes),
+                       SUM(bytes) * 1000.0 / NULLIF(SUM(CASE WHEN bytes IS NOT NULL THEN ms END), 0)
+                FROM ranked GROUP BY stage
+            """, params).fetchall()
+        order = {stage.value: i for i, stage in enumerate(Stage)}
+        return sorted((StageStats(*row) for row in rows), key=lambda r: order.get(r.stage, len(order)))
+
+    def group_stats(self, by: str = "provider", since: Optional[str] = None) -> List[GroupStats]:
+        """Outcomes, failure rate, whole-task p50 / p95 and download throughput grouped by provider or audio_format."""
+        if by not in ("provider", "audio_format"):
+            raise ValueError(f"Cannot group history stats by '{by}'")
+        clauses, params = self._row_filters(None, None, since)
+        where = f"WHERE {' AND '.join('t.' + c for c in clauses)}" if clauses else ""
+        with self._get_connection() as conn:
+            rows = conn.execute(f"""
+                WITH totals AS (
+                    SELECT task_id, MAX(end_ms) AS ms,
+                           SUM(CASE WHEN stage = 'download' THEN bytes END) AS dl_bytes,
+                           SUM(CASE WHEN stage = 'download' AND bytes IS NOT NULL THEN end_ms - start_ms END) AS dl_ms
+                    FROM task_stages GROUP BY task_id
+                ), base AS (
+                    SELECT t.{by} AS key, t.status, totals.ms, totals.dl_bytes, totals.dl_ms
+                    FROM download_tasks t LEFT JOIN totals ON totals.task_id = t.id
+                    {where}
+                ), ranked AS (
+                    SELECT *, ROW_NUMBER() OVER (PARTITION BY key ORDER BY ms IS NULL, ms) AS rn,
+                              COUNT(ms) OVER (PARTITION BY key) AS n
+                    FROM base
+                )
+                SELECT key, COUNT(*),
+                       SUM(status = 'completed'), SUM(status = 'skipped'), SUM(status = 'failed'),
+                       SUM(status = 'unavailable'),
+                       SUM(status IN ('failed', 'unavailable')) * 1.0 / NULLIF(SUM(status IN {_TERMINAL_SQL}), 0),
+                       MIN(CASE WHEN ms IS NOT NULL AND rn >= 0.50 * n THEN ms END),
+                       MIN(CASE WHEN ms IS NOT NULL AND rn >= 0.95 * n THEN ms END),
+                       SUM(dl_bytes),
+                       SUM(dl_bytes) * 1000.0 / NULLIF(SUM(dl_ms), 0)
+                FROM ranked GROUP BY key ORDER BY COUNT(*) DESC, key
+            """, params).fetchall()
+        return [GroupStats(*row) for row in rows]
+
+    # ------------------------------------------------------------------ retention & compaction
+
+    def size_bytes(self) -> int:
+        """Database file plus its write-ahead log."""
+        total = 0
+        for path in (Path(self.db_path), Path(f"{self.db_path}-wal")):
+            try:
+                total += path.stat().st_size
+            except OSError:
+                pass
+        return total
+
+    def prune(
+        self,
+        older_than: Optional[str] = None,
+        keep_last: Optional[int] = None,
+        statuses: Sequence[DownloadStatus] = TERMINAL_STATUSES,
+    ) -> int:
+        """
+        Delete rows in `statuses` created before `older_than` (column-format timestamp) or beyond the newest
+        `keep_last` rows. Either policy alone is enough to delete a row; with neither, nothing is pruned.
+        """
+        policies, params = [], []
+        if older_than:
+            policies.append("created_at < ?")
+            params.append(older_than)
+        if keep_last is not None:
+            policies.append(
+                "(created_at, id) < (SELECT created_at, id FROM download_tasks "
+                "ORDER BY created_at DESC, id DESC LIMIT 1 OFFSET ?)"
+            )
+            params.append(max(0, keep_last - 1))
+        if not policies or not statuses:
+            return 0
+
+        placeholders = ", ".join("?" for _ in statuses)
+        with self._get_connection() as conn:
+            deleted = conn.execute(
+                f"DELETE FROM download_tasks WHERE status IN ({placeholders}) AND ({' OR '.join(policies)})",
+                (*(DownloadStatus(s).value for s in statuses), *params),
+            ).rowcount
+            if deleted:
+                conn.execute(
+                    "DELETE FROM batches WHERE NOT EXISTS (SELECT 1 FROM download_tasks t WHERE t.batch_id = batches.id)"
+                )
+                conn.execute(
+                    "DELETE FROM task_stages WHERE NOT EXISTS (SELECT 1 FROM download_tasks t WHERE t.id = task_stages.task_id)"
+                )
+            conn.commit()
+        return deleted
+
+    def slim_finished_payloads(self) -> int:
+        """
+        Project `track.raw_metadata` (for YouTube the whole yt-dlp info dict) of completed and skipped rows down
+        to RAW_METADATA_FIELDS and re-encode them with the current codec. Walks the table in rowid pages;
+        returns the rows rewritten.
+        """
+        rewritten = 0
+        last_rowid = 0
+        conn = self._get_connection()
+        try:
+            while True:
+                rows = conn.execute(
+                    "SELECT rowid, task_json FROM download_tasks WHERE status IN (?, ?) AND rowid > ? "
+                    "ORDER BY rowid LIMIT ?",
+                    (*(s.value for s in DONE_STATUSES), last_rowid, COMPACT_PAGE_ROWS),
+                ).fetchall()
+                if not rows:
+                    return rewritten
+                last_rowid = rows[-1][0]
+
+                updates = []
+                for rowid, payload in rows:
+                    try:
+                        data = json.loads(decode_payload(payload))
+                    except ValueError:
+                        continue
+                    track = data.get("track") or {}
+                    slim = project_raw_metadata(track.get("raw_metadata"))
+                    if track.get("raw_metadata", {}) == slim and isinstance(payload, bytes) == self.compress:
+                        continue
+                    track["raw_metadata"] = slim
+                    updates.append((encode_payload(json.dumps(data), self.compress), rowid))
+                if updates:
+                    conn.executemany("UPDATE download_tasks SET task_json = ? WHERE rowid = ?", updates)
+                    conn.commit()
+                    rewritten += len(updates)
+        finally:
+            conn.close()
+
+    def vacuum(self):
+        """Rebuild the file without free pages and truncate the WAL back to zero bytes."""
+        conn = self._get_connection()
+        try:
+            conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+            conn.execute("VACUUM")
+            conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        finally:
+            conn.close()
+
+    def compact(
+        self,
+        older_than: Optional[str] = None,
+        keep_last: Optional[int] = None,
+        statuses: Sequence[DownloadStatus] = TERMINAL_STATUSES,
+        vacuum: bool = True,
+    ) -> CompactResult:
+        size_before = self.size_bytes()
+        pruned = self.prune(older_than=older_than, keep_last=keep_last, statuses=statuses)
+        self.forget_source_failures()
+        slimmed = self.slim_finished_payloads()
+        if vacuum:
+            self.vacuum()
+        return CompactResult(pruned, slimmed, size_before, self.size_bytes())
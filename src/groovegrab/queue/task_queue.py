@@ -3,46 +3,212 @@ Multi-threaded Task Queue Execution Manager
 Downloads audio files and automatically saves synchronized .lrc lyrics alongside every track for full playlists and single songs.
 """
 
+import os
+import socket
+import threading
+import time
 import uuid
-from concurrent.futures import ThreadPoolExecutor, as_completed
-from typing import List, Callable, Optional
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, as_completed, wait
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator, List, Callable, Optional, Tuple
 
-from groovegrab.core.models import TrackInfo, DownloadOptions, DownloadTask, DownloadStatus
+from groovegrab.core.exceptions import is_permanent_failure
+from groovegrab.core.models import TrackInfo, DownloadOptions, DownloadTask, DownloadStatus, Stage, StageTiming
 from groovegrab.engines.ytdlp_engine import YtDlpEngine
+from groovegrab.engines.ffmpeg_converter import FfmpegHelper
 from groovegrab.engines.metadata_tagger import MetadataTagger
 from groovegrab.engines.lyric_fetcher import LyricFetcher
-from groovegrab.queue.storage import TaskStorage
+from groovegrab.queue.storage import LEASE_SEC, TaskStorage
+
+# Days a permanently unavailable source is skipped without retrying (0: always retry)
+DEFAULT_UNAVAILABLE_TTL_DAYS = 30
+
+
+class StageRecorder:
+    """Appends monotonic per-stage timings (ms since the task started) to `task.stages`."""
+
+    def __init__(self, task: DownloadTask):
+        self.task = task
+        self.origin = time.monotonic()
+        task.stages = []
+
+    def now_ms(self) -> float:
+        return (time.monotonic() - self.origin) * 1000.0
+
+    def add(self, stage: Stage, start_ms: float, end_ms: float, size: Optional[int] = None, ok: bool = True):
+        self.task.stages.append(StageTiming(stage=stage, start_ms=start_ms, end_ms=end_ms, bytes=size, ok=ok))
+
+    @contextmanager
+    def stage(self, stage: Stage) -> Iterator[StageTiming]:
+        """Time the block; set `.bytes` on the yielded timing to record a byte count."""
+        timing = StageTiming(stage=stage, start_ms=self.now_ms(), end_ms=0.0)
+        try:
+            yield timing
+        except Exception:
+            timing.ok = False
+            raise
+        finally:
+            timing.end_ms = self.now_ms()
+            self.task.stages.append(timing)
+
+
+def _file_size(path: Path) -> Optional[int]:
+    try:
+        return path.stat().st_size
+    except OSError:
+        return None
+
+
+def _lyrics_bytes(synced_lrc: Optional[str], plain_lyrics: Optional[str]) -> Optional[int]:
+    return len((synced_lrc or plain_lyrics or "").encode("utf-8")) or None
+
+
+class LeaseKeeper:
+    """
+    Heartbeat thread renewing the leases one queue manager holds, every third of the lease; it exits on its own
+    once the owner holds none and is restarted by the next claim.
+    """
+
+    def __init__(self, storage: TaskStorage, owner: str, lease_sec: float = LEASE_SEC):
+        self.storage = storage
+        self.owner = owner
+        self.lease_sec = lease_sec
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+
+    def ensure_running(self):
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._beat, name="groovegrab-lease-keeper", daemon=True)
+                self._thread.start()
+
+    def _beat(self):
+        while True:
+            time.sleep(self.lease_sec / 3)
+            # The renewal and the decision to exit are one step for ensure_running: leases taken before it asks
+            # are renewed here, and leases taken after the thread gave up find it gone and start a new one
+            with self._lock:
+                try:
+                    held = self.storage.heartbeat(self.owner, self.lease_sec)
+                except Exception:
+                    # Database busy past its timeout: the lease still has two thirds left, try again next beat
+                    continue
+                if not held:
+                    self._thread = None
+                    return
 
 
 class TaskQueueManager:
-    def __init__(self, storage: Optional[TaskStorage] = None):
+    def __init__(
+        self,
+        storage: Optional[TaskStorage] = None,
+        lease_sec: float = LEASE_SEC,
+        unavailable_ttl_days: int = DEFAULT_UNAVAILABLE_TTL_DAYS
+    ):
         self.downloader = YtDlpEngine()
         self.tagger = MetadataTagger()
         self.lyric_fetcher = LyricFetcher()
         self.storage = storage or TaskStorage()
+        # 0 turns the failure memo off: every failure is retried on the next run
+        self.unavailable_ttl_sec = unavailable_ttl_days * 86400.0
+        # Lease owner identity of this queue manager; unique across processes and hosts sharing the database
+        self.owner = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self.lease_sec = lease_sec
+        self.lease_keeper = LeaseKeeper(self.storage, self.owner, lease_sec)
 
     def process_tracks(
         self,
         tracks: List[TrackInfo],
         options: DownloadOptions,
-        on_progress: Optional[Callable[[DownloadTask], None]] = None
+        on_progress: Optional[Callable[[DownloadTask], None]] = None,
+        batch_id: Optional[str] = None
     ) -> List[DownloadTask]:
-        tasks = [
-            DownloadTask(
-                id=str(uuid.uuid4()),
-                track=track,
-                options=options,
-                status=DownloadStatus.PENDING
-            )
-            for track in tracks
-        ]
+        tasks = self.create_tasks(tracks, options, batch_id=batch_id)
+        return self.run_tasks(tasks, options.concurrent_downloads, on_progress)
 
-        # Save initial pending states
-        for task in tasks:
-            self.storage.save_task(task)
+    def resume_batch(
+        self,
+        batch_id: str,
+        on_progress: Optional[Callable[[DownloadTask], None]] = None,
+        concurrent_downloads: Optional[int] = None
+    ) -> List[DownloadTask]:
+        """
+        Requeue the failed and abandoned tasks of a stored batch (no provider resolve) and drain the batch.
+        Tasks another live process holds stay with it.
+        """
+        if not self.storage.requeue_batch(batch_id, self.owner):
+            return []
+        if concurrent_downloads is None:
+            tasks = self.storage.load_resumable_tasks(batch_id)
+            concurrent_downloads = tasks[0].options.concurrent_downloads if tasks else 1
+        return self.drain(concurrent_downloads, batch_id=batch_id, on_progress=on_progress)
+
+    def drain(
+        self,
+        concurrent_downloads: int,
+        batch_id: Optional[str] = None,
+        on_progress: Optional[Callable[[DownloadTask], None]] = None,
+        follow: bool = False,
+        poll_interval: float = 1.0,
+        stop: Optional[threading.Event] = None
+    ) -> List[DownloadTask]:
+        """
+        Claim and run queued tasks (of one batch, or all of them) until none is left unfinished, keeping up to
+        `concurrent_downloads` in flight. Tasks leased by other processes are waited for, not duplicated; with
+        `follow`, keep polling for new work until `stop` is set. Unstarted leases are released on the way out.
+        """
+        results = []
+        stop = stop or threading.Event()
+        running = {}
+        try:
+            with ThreadPoolExecutor(max_workers=concurrent_downloads) as executor:
+                while True:
+                    if not stop.is_set() and len(running) < concurrent_downloads:
+                        for task in self.claim(concurrent_downloads - len(running), batch_id):
+                            task.status = DownloadStatus.PENDING
+                            task.progress = 0.0
+                            task.speed = None
+                            task.eta = None
+                            task.error_message = None
+                            running[executor.submit(self._execute_single_task, task, on_progress)] = task
+
+                    if not running:
+                        if stop.is_set() or not (follow or self.storage.count_unfinished(batch_id)):
+                            break
+                        stop.wait(poll_interval)
+                        continue
 
+                    done, _ = wait(running, timeout=poll_interval, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        running.pop(future)
+                        task = future.result()
+                        results.append(task)
+                        self.storage.save_task(task)
+        finally:
+            self.storage.release_leases(self.owner)
+        return results
+
+    def claim(self, limit: int, batch_id: Optional[str] = None) -> List[DownloadTask]:
+        """Lease up to `limit` queued tasks to this manager (see TaskStorage.claim_tasks) and keep them alive."""
+        tasks = self.storage.claim_tasks(self.owner, limit, batch_id, self.lease_sec)
+        if tasks:
+            self.lease_keeper.ensure_running()
+        return tasks
+
+    def hold_tasks(self, tasks: List[DownloadTask]):
+        """Persist `tasks` leased to this manager, so queue workers leave them to it."""
+        self.storage.save_tasks(tasks, lease_owner=self.owner, lease_sec=self.lease_sec)
+        self.lease_keeper.ensure_running()
+
+    def run_tasks(
+        self,
+        tasks: List[DownloadTask],
+        concurrent_downloads: int,
+        on_progress: Optional[Callable[[DownloadTask], None]] = None
+    ) -> List[DownloadTask]:
         results = []
-        max_workers = min(options.concurrent_downloads, len(tasks)) or 1
+        max_workers = min(concurrent_downloads, len(tasks)) or 1
 
         with ThreadPoolExecutor(max_workers=max_workers) as executor:
             future_to_task = {
@@ -57,76 +223,271 @@ class TaskQueueManager:
 
         return results
 
+    def create_tasks(
+        self,
+        tracks: List[TrackInfo],
+        options: DownloadOptions,
+        batch_id: Optional[str] = None,
+        leased: bool = True
+    ) -> List[DownloadTask]:
+        """
+        Build and persist pending tasks for `tracks` (in order). By default they are leased to this manager,
+        which runs them itself; `leased=False` only enqueues them for `drain` / `groovegrab worker`.
+        """
+        tasks = [
+            DownloadTask(
+                id=str(uuid.uuid4()),
+                track=track,
+                options=options,
+                status=DownloadStatus.PENDING,
+                batch_id=batch_id
+            )
+            for track in tracks
+        ]
+
+        # Save initial pending states
+        if leased:
+            self.hold_tasks(tasks)
+        else:
+            self.storage.save_tasks(tasks)
+        return tasks
+
+    def find_existing(self, track: TrackInfo, options: DownloadOptions) -> Optional[Path]:
+        """Already-downloaded file for `track`: the global track index first, then the output-folder probe."""
+        return (
+            self.storage.find_indexed_track(track, options.audio_format.value)
+            or self.downloader.find_existing_file(track, options)
+        )
+
+    def source_keys(self, track: TrackInfo) -> List[str]:
+        """Keys a permanent failure of `track` is remembered under: the yt-dlp source and the provider page."""
+        return list(dict.fromkeys(filter(None, [self.downloader.source_key(track), track.webpage_url])))
+
+    def record_failure(self, task: DownloadTask, error: Exception):
+        """
+        Mark `task` failed with `error`. Permanent causes (see is_permanent_failure) mark it UNAVAILABLE
+        instead and are remembered, so runs within the TTL skip the source without extracting it again.
+        """
+        task.error_message = str(error)
+        if self.unavailable_ttl_sec and is_permanent_failure(error):
+            task.status = DownloadStatus.UNAVAILABLE
+            self.storage.record_source_failure(self.source_keys(task.track), task.error_message, self.unavailable_ttl_sec)
+        else:
+            task.status = DownloadStatus.FAILED
+
+    def run_task(
+        self,
+        task: DownloadTask,
+        on_progress: Optional[Callable[[DownloadTask], None]] = None
+    ) -> DownloadTask:
+        """Execute one pending task on the calling thread and persist its final state."""
+        task = self._execute_single_task(task, on_progress)
+        self.storage.save_task(task)
+        return task
+
     def _execute_single_task(
         self,
         task: DownloadTask,
         on_progress: Optional[Callable[[DownloadTask], None]] = None
     ) -> DownloadTask:
+        clock = StageRecorder(task)
         try:
             # 0. Check if file already downloaded
-            if not task.options.overwrite:
-                existing_file = self.downloader.find_existing_file(task.track, task.options)
-                if existing_file:
-                    # Guarantee .lrc exists alongside audio file
-                    if task.options.fetch_lyrics:
-                        lrc_file = existing_file.with_suffix(".lrc")
-                        if not lrc_file.exists():
-                            synced_lrc, _ = self.lyric_fetcher.fetch_lyrics(task.track)
-                            if synced_lrc:
-                                self.lyric_fetcher.save_lrc_file(existing_file, synced_lrc)
-
-                    task.status = DownloadStatus.SKIPPED
-                    task.output_path = str(existing_file)
-                    task.progress = 100.0
-                    if on_progress:
-                        on_progress(task)
-                    return task
+            existing_file = self._skip_check(task, clock)
+            if existing_file:
+                # Guarantee .lrc exists alongside audio file
+                synced_lrc = self._fetch_lyrics(task, clock)[0] if self._needs_lrc(task, existing_file) else None
+                self._finish_skipped(task, existing_file, synced_lrc, on_progress)
+                return task
+
+            if self._known_unavailable(task, on_progress):
+                return task
 
             # 1. Downloading Audio
-            task.status = DownloadStatus.DOWNLOADING
-            task.progress = 10.0
-            if on_progress:
-                on_progress(task)
-
-            def ytdlp_hook(d):
-                if d.get('status') == 'downloading':
-                    total = d.get('total_bytes') or d.get('total_bytes_estimate') or 1
-                    downloaded = d.get('downloaded_bytes', 0)
-                    task.progress = min(80.0, 10.0 + (downloaded / total) * 70.0)
-                    task.speed = d.get('_speed_str', '')
-                    task.eta = d.get('_eta_str', '')
-                    if on_progress:
-                        on_progress(task)
+            self._set_status(task, DownloadStatus.DOWNLOADING, 10.0, on_progress)
+            file_path = self._download(task, clock, on_progress)
+            self._post_process(task, file_path, on_progress, clock)
 
-            file_path = self.downloader.download_track(task.track, task.options, progress_hook=ytdlp_hook)
-            task.output_path = str(file_path)
+        except Exception as e:
+            self._fail(task, e, on_progress)
+
+        return task
+
+    # ------------------------------------------------------------------ pipeline steps (shared with the asyncio engine)
+
+    @staticmethod
+    def _set_status(
+        task: DownloadTask,
+        status: DownloadStatus,
+        progress: float,
+        on_progress: Optional[Callable[[DownloadTask], None]] = None
+    ):
+        task.status = status
+        task.progress = progress
+        if on_progress:
+            on_progress(task)
+
+    def _skip_check(self, task: DownloadTask, clock: StageRecorder) -> Optional[Path]:
+        """The already-downloaded file of `task`, unless it overwrites."""
+        if task.options.overwrite:
+            return None
+        with clock.stage(Stage.SKIP_CHECK):
+            return self.find_existing(task.track, task.options)
+
+    @staticmethod
+    def _needs_lrc(task: DownloadTask, existing_file: Path) -> bool:
+        return task.options.fetch_lyrics and not existing_file.with_suffix(".lrc").exists()
+
+    def _finish_skipped(
+        self,
+        task: DownloadTask,
+        existing_file: Path,
+        synced_lrc: Optional[str],
+        on_progress: Optional[Callable[[DownloadTask], None]] = None
+    ):
+        if synced_lrc:
+            self.lyric_fetcher.save_lrc_file(existing_file, synced_lrc)
+        task.output_path = str(existing_file)
+        self._set_status(task, DownloadStatus.SKIPPED, 100.0, on_progress)
+
+    def _known_unavailable(self, task: DownloadTask, on_progress: Optional[Callable[[DownloadTask], None]] = None) -> bool:
+        """Known-dead source (removed, private, geo-blocked): finish `task` without extraction or yt-dlp retries."""
+        if not self.unavailable_ttl_sec:
+            return False
+        reason = self.storage.find_source_failure(self.source_keys(task.track))
+        if not reason:
+            return False
+        task.status = DownloadStatus.UNAVAILABLE
+        task.error_message = reason
+        if on_progress:
+            on_progress(task)
+        return True
 
-            # 2. Synced Lyrics Fetching (.lrc saved alongside audio file in playlist folder)
-            synced_lrc, plain_lyrics = None, None
-            if task.options.fetch_lyrics:
-                synced_lrc, plain_lyrics = self.lyric_fetcher.fetch_lyrics(task.track)
-                if synced_lrc:
-                    self.lyric_fetcher.save_lrc_file(file_path, synced_lrc)
-
-            # 3. ID3 / Vorbis Metadata & Cover Art Tagging
-            if task.options.embed_cover:
-                task.status = DownloadStatus.TAGGING
-                task.progress = 90.0
+    def _download(
+        self,
+        task: DownloadTask,
+        clock: StageRecorder,
+        on_progress: Optional[Callable[[DownloadTask], None]] = None
+    ) -> Path:
+        # yt-dlp extracts, downloads and runs FFmpegExtractAudio in one call: its progress hooks mark
+        # where extraction ends (first hook) and where transcoding starts ("finished")
+        marks = {"call": clock.now_ms(), "first": None, "finished": None, "bytes": None}
+
+        def ytdlp_hook(d):
+            if marks["first"] is None:
+                marks["first"] = clock.now_ms()
+            if d.get('status') == 'finished':
+                marks["finished"] = clock.now_ms()
+                marks["bytes"] = d.get('total_bytes') or d.get('downloaded_bytes')
+            if d.get('status') == 'downloading':
+                total = d.get('total_bytes') or d.get('total_bytes_estimate') or 1
+                downloaded = d.get('downloaded_bytes', 0)
+                task.progress = min(80.0, 10.0 + (downloaded / total) * 70.0)
+                task.speed = d.get('_speed_str', '')
+                task.eta = d.get('_eta_str', '')
                 if on_progress:
                     on_progress(task)
-                
-                lyrics_to_embed = plain_lyrics or synced_lrc
-                self.tagger.tag_file(file_path, task.track, lyrics=lyrics_to_embed)
 
-            task.status = DownloadStatus.COMPLETED
-            task.progress = 100.0
-            if on_progress:
-                on_progress(task)
+        try:
+            file_path = self.downloader.download_track(task.track, task.options, progress_hook=ytdlp_hook)
+        except Exception:
+            self._add_download_stages(clock, marks, ok=False)
+            raise
+        self._add_download_stages(clock, marks, ok=True, output=file_path)
+        task.output_path = str(file_path)
+        return file_path
+
+    def _fetch_lyrics(self, task: DownloadTask, clock: StageRecorder) -> Tuple[Optional[str], Optional[str]]:
+        with clock.stage(Stage.LYRICS) as timing:
+            synced_lrc, plain_lyrics = self.lyric_fetcher.fetch_lyrics(task.track)
+            timing.bytes = _lyrics_bytes(synced_lrc, plain_lyrics)
+        return synced_lrc, plain_lyrics
+
+    def _fetch_cover(self, task: DownloadTask, clock: StageRecorder) -> Optional[bytes]:
+        with clock.stage(Stage.COVER) as timing:
+            cover_data = self.tagger.fetch_cover(task.track.cover_url)
+            timing.bytes = len(cover_data) if cover_data else None
+        return cover_data
+
+    def _fail(self, task: DownloadTask, error: Exception, on_progress: Optional[Callable[[DownloadTask], None]] = None):
+        self.record_failure(task, error)
+        if on_progress:
+            on_progress(task)
+
+    @staticmethod
+    def _add_download_stages(clock: StageRecorder, marks: dict, ok: bool, output: Optional[Path] = None):
+        end = clock.now_ms()
+        first, finished = marks["first"], marks["finished"]
+        clock.add(Stage.EXTRACT, marks["call"], first if first is not None else end, ok=ok or first is not None)
+        if first is not None:
+            clock.add(Stage.DOWNLOAD, first, finished if finished is not None else end, marks["bytes"],
+                      ok=ok or finished is not None)
+        if finished is not None:
+            clock.add(Stage.TRANSCODE, finished, end, _file_size(output) if output else None, ok=ok)
+
+    def finalize_stream_download(
+        self,
+        task: DownloadTask,
+        source_path: Path,
+        on_progress: Optional[Callable[[DownloadTask], None]] = None
+    ) -> DownloadTask:
+        """
+        Finish a task whose raw audio stream was fetched outside yt-dlp (progressive playback):
+        transcode it into the library as `Artist - Title.<format>`, then fetch lyrics and tag like a normal download.
+        """
+        clock = StageRecorder(task)
+        try:
+            self._set_status(task, DownloadStatus.CONVERTING, 80.0, on_progress)
+
+            audio_format = task.options.audio_format.value
+            file_path = self.downloader.target_path(task.track, task.options, audio_format)
+            with clock.stage(Stage.TRANSCODE) as timing:
+                FfmpegHelper.transcode_audio(source_path, file_path, audio_format, task.options.audio_bitrate.value)
+                timing.bytes = _file_size(file_path)
+            task.output_path = str(file_path)
+
+            self._post_process(task, file_path, on_progress, clock)
 
         except Exception as e:
-            task.status = DownloadStatus.FAILED
-            task.error_message = str(e)
-            if on_progress:
-                on_progress(task)
+            self._fail(task, e, on_progress)
 
+        self.storage.save_task(task)
         return task
+
+    def _post_process(
+        self,
+        task: DownloadTask,
+        file_path: Path,
+        on_progress: Optional[Callable[[DownloadTask], None]] = None,
+        clock: Optional[StageRecorder] = None
+    ):
+        clock = clock or StageRecorder(task)
+        synced_lrc, plain_lyrics = self._fetch_lyrics(task, clock) if task.options.fetch_lyrics else (None, None)
+        cover_data = self._fetch_cover(task, clock) if task.options.embed_cover else None
+        self._finish_download(task, file_path, synced_lrc, plain_lyrics, cover_data, on_progress, clock)
+
+    def _finish_download(
+        self,
+        task: DownloadTask,
+        file_path: Path,
+        synced_lrc: Optional[str],
+        plain_lyrics: Optional[str],
+        cover_data: Optional[bytes],
+        on_progress: Optional[Callable[[DownloadTask], None]],
+        clock: StageRecorder
+    ):
+        """Write the fetched lyrics and artwork to a downloaded file and complete `task`."""
+        # 2. Synced Lyrics (.lrc saved alongside audio file in playlist folder)
+        if synced_lrc:
+            self.lyric_fetcher.save_lrc_file(file_path, synced_lrc)
+
+        # 3. ID3 / Vorbis Metadata & Cover Art Tagging
+        if task.options.embed_cover:
+            self._set_status(task, DownloadStatus.TAGGING, 90.0, on_progress)
+            with clock.stage(Stage.TAG) as timing:
+                self.tagger.tag_file(
+                    file_path, task.track, lyrics=plain_lyrics or synced_lrc, cover_data=cover_data, fetch_cover=False
+                )
+                timing.bytes = _file_size(file_path)
+
+        self._set_status(task, DownloadStatus.COMPLETED, 100.0, on_progress)
@@ -75,6 +75,15 @@ class PlaylistProgressDashboard:
             console.print(f"[bold red]  [Failed]:[/bold red] {title_str} [dim]({err_msg})[/dim]")
             return
 
+        # Handle known-dead sources (not retried until their failure memo expires)
+        if task.status == DownloadStatus.UNAVAILABLE:
+            if task_id in self.task_map:
+                self.progress.remove_task(self.task_map[task_id])
+                del self.task_map[task_id]
+            self.progress.advance(self.overall_id, 1)
+            console.print(f"[bold magenta]  [Unavailable]:[/bold magenta] {title_str} [dim]({task.error_message})[/dim]")
+            return
+
         # Handle active tracks
         if task_id not in self.task_map:
             desc = f"[bold cyan]Downloading[/bold cyan] {title_str}"
@@ -97,8 +106,11 @@ def print_tasks_summary(tasks: List[DownloadTask]):
     completed = sum(1 for t in tasks if t.status == DownloadStatus.COMPLETED)
     skipped = sum(1 for t in tasks if t.status == DownloadStatus.SKIPPED)
     failed = sum(1 for t in tasks if t.status == DownloadStatus.FAILED)
+    unavailable = sum(1 for t in tasks if t.status == DownloadStatus.UNAVAILABLE)
     
     console.print()
     console.print(f"[bold green][Download finished]: {completed} downloaded, {skipped} skipped (already exist), {failed} failed.[/bold green]")
+    if unavailable > 0:
+        console.print(f"[bold magenta][Unavailable] {unavailable} track(s) are removed, private or blocked at the source and will not be retried for a while.[/bold magenta]")
     if failed > 0:
         console.print(f"[bold red][Warning] {failed} track(s) failed during download. Re-run command to retry failed tracks.[/bold red]")
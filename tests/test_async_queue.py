@@ -0,0 +1,111 @@
+"""
+Unit Tests for the asyncio Download Queue Engine
+"""
+
+import asyncio
+import threading
+import time
+from pathlib import Path
+
+import httpx
+import pytest
+
+from groovegrab.core.models import DownloadOptions, DownloadStatus, Stage, TrackInfo
+from groovegrab.queue.async_queue import AsyncTaskQueueManager
+from groovegrab.queue.storage import TaskStorage
+
+
+def make_manager(tmp_path, handler, **kwargs):
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    queue_mgr = AsyncTaskQueueManager(
+        storage=TaskStorage(tmp_path / "history.db"), unavailable_ttl_days=30, http_client=client, **kwargs
+    )
+    queue_mgr.lyric_fetcher.cache_dir = tmp_path / "lyrics-cache"
+    queue_mgr.lyric_fetcher.cache_dir.mkdir()
+    return queue_mgr
+
+
+def test_async_engine_downloads_and_reports_progress_like_the_threaded_one(tmp_path):
+    async def handler(request):
+        return httpx.Response(200, json={"syncedLyrics": f"[00:01.00]{request.url.params['track_name']}"})
+
+    queue_mgr = make_manager(tmp_path, handler)
+
+    def download_track(track, options, progress_hook=None):
+        progress_hook({"status": "downloading", "downloaded_bytes": 50, "total_bytes": 100})
+        progress_hook({"status": "finished", "total_bytes": 100})
+        path = Path(options.output_dir) / f"{track.artist} - {track.title}.mp3"
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(b"\0" * 2048)
+        return path
+
+    queue_mgr.downloader.download_track = download_track
+    options = DownloadOptions(output_dir=str(tmp_path / "library"), embed_cover=False)
+    seen = []
+
+    results = asyncio.run(queue_mgr.process_tracks_async(
+        [TrackInfo(title=f"Song {i}", artist="Band") for i in range(5)], options,
+        on_progress=lambda task: seen.append((task.track.title, task.status)),
+    ))
+
+    assert sorted(t.status for t in results) == [DownloadStatus.COMPLETED] * 5
+    assert ("Song 0", DownloadStatus.DOWNLOADING) in seen and ("Song 0", DownloadStatus.COMPLETED) in seen
+    assert (tmp_path / "library" / "Band - Song 3.lrc").read_text() == "[00:01.00]Song 3"
+    stored = queue_mgr.storage.get_task(results[0].id)
+    assert stored.status == DownloadStatus.COMPLETED
+    assert {timing.stage for timing in stored.stages} >= {Stage.LYRICS, Stage.EXTRACT, Stage.DOWNLOAD, Stage.TRANSCODE}
+
+
+def test_http_requests_are_not_limited_by_the_download_slots(tmp_path):
+    in_flight = peak = 0
+
+    async def handler(request):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.05)
+        in_flight -= 1
+        return httpx.Response(404)
+
+    queue_mgr = make_manager(tmp_path, handler, tasks_in_flight=40)
+    queue_mgr.lyric_fetcher._query_syncedlyrics = lambda title, artist: None
+    running, heavy_peak, lock = [0], [0], threading.Lock()
+
+    def download_track(track, options, progress_hook=None):
+        with lock:
+            running[0] += 1
+            heavy_peak[0] = max(heavy_peak[0], running[0])
+        time.sleep(0.01)
+        with lock:
+            running[0] -= 1
+        raise RuntimeError("HTTP Error 503")
+
+    queue_mgr.downloader.download_track = download_track
+    options = DownloadOptions(output_dir=str(tmp_path / "library"), concurrent_downloads=2, embed_cover=False)
+    tracks = [TrackInfo(title=f"Song {i}", artist="Band") for i in range(40)]
+
+    results = asyncio.run(queue_mgr.process_tracks_async(tracks, options))
+
+    assert [t.status for t in results] == [DownloadStatus.FAILED] * 40
+    assert heavy_peak[0] <= 2
+    assert peak >= 20
+
+
+def test_async_engine_skips_existing_files_and_known_unavailable_sources(tmp_path):
+    async def handler(request):
+        return httpx.Response(200, json={"syncedLyrics": "[00:01.00]Old"})
+
+    queue_mgr = make_manager(tmp_path, handler)
+    library = tmp_path / "library"
+    library.mkdir()
+    (library / "Band - Old.mp3").write_bytes(b"\0" * 2048)
+    gone = TrackInfo(title="Gone", artist="Band", webpage_url="https://www.youtube.com/watch?v=abcdefghijk")
+    queue_mgr.storage.record_source_failure(queue_mgr.source_keys(gone), "Video unavailable", ttl_sec=3600)
+    queue_mgr.downloader.download_track = lambda *args, **kwargs: pytest.fail("nothing should be downloaded")
+    options = DownloadOptions(output_dir=str(library), embed_cover=False)
+
+    results = asyncio.run(queue_mgr.process_tracks_async([TrackInfo(title="Old", artist="Band"), gone], options))
+
+    statuses = {task.track.title: task.status for task in results}
+    assert statuses == {"Old": DownloadStatus.SKIPPED, "Gone": DownloadStatus.UNAVAILABLE}
+    assert (library / "Band - Old.lrc").read_text() == "[00:01.00]Old"
@@ -0,0 +1,74 @@
+"""
+Unit Tests for the Failure Memo of Permanently Unavailable Sources
+"""
+
+from groovegrab.core.exceptions import ExtractionError, ProviderError, TranscodeError, is_permanent_failure
+from groovegrab.core.models import DownloadOptions, DownloadStatus, TrackInfo
+from groovegrab.queue.storage import TaskStorage
+from groovegrab.queue.task_queue import TaskQueueManager
+
+
+def test_failures_are_classified_permanent_or_transient():
+    assert is_permanent_failure(ExtractionError("Extraction failed for X: ERROR: [youtube] abc: Video unavailable"))
+    assert is_permanent_failure(ExtractionError("ERROR: [youtube] abc: Private video. Sign in if you've been granted access"))
+    assert is_permanent_failure(ProviderError("The uploader has not made this video available in your country"))
+    assert not is_permanent_failure(ExtractionError("ERROR: unable to download video data: HTTP Error 403: Forbidden"))
+    assert not is_permanent_failure(ExtractionError("Read timed out"))
+    assert not is_permanent_failure(ExtractionError("ERROR: unable to download webpage: HTTP Error 404: Not Found"))
+    assert not is_permanent_failure(ProviderError("No search results for 'Band - Song'"))
+    assert not is_permanent_failure(TranscodeError("Video unavailable"))
+
+
+def test_known_unavailable_sources_are_short_circuited(tmp_path):
+    storage = TaskStorage(tmp_path / "history.db")
+    queue_mgr = TaskQueueManager(storage=storage, unavailable_ttl_days=30)
+    calls = []
+
+    def download_track(track, options, progress_hook=None):
+        calls.append(track.title)
+        raise ExtractionError(f"Extraction failed for {track.title}: ERROR: [youtube] abc: Video unavailable")
+
+    queue_mgr.downloader.download_track = download_track
+    options = DownloadOptions(output_dir=str(tmp_path / "library"), fetch_lyrics=False, embed_cover=False)
+    track = TrackInfo(title="Gone", artist="Band", webpage_url="https://www.youtube.com/watch?v=abcdefghijk")
+
+    first = queue_mgr.process_tracks([track], options)
+    again = queue_mgr.process_tracks([track], options)
+
+    assert calls == ["Gone"]
+    assert [t.status for t in first + again] == [DownloadStatus.UNAVAILABLE] * 2
+    assert "Video unavailable" in again[0].error_message
+    assert storage.find_source_failure([track.webpage_url]) is not None
+
+
+def test_transient_failures_and_expired_memos_are_retried(tmp_path):
+    storage = TaskStorage(tmp_path / "history.db")
+    storage.record_source_failure(["https://example.com/a"], "Video unavailable", ttl_sec=-1)
+    assert storage.find_source_failure(["https://example.com/a"]) is None
+    assert storage.forget_source_failures() == 1
+
+    queue_mgr = TaskQueueManager(storage=storage, unavailable_ttl_days=30)
+    task = queue_mgr.create_tasks([TrackInfo(title="Flaky", artist="Band")], DownloadOptions(output_dir=str(tmp_path)))[0]
+    queue_mgr.record_failure(task, ExtractionError("HTTP Error 429: Too Many Requests"))
+    assert task.status == DownloadStatus.FAILED
+    assert storage.find_source_failure(queue_mgr.source_keys(task.track)) is None
+
+
+def test_unavailable_tasks_are_counted_in_batches_and_stats(tmp_path):
+    storage = TaskStorage(tmp_path / "history.db")
+    queue_mgr = TaskQueueManager(storage=storage, unavailable_ttl_days=30)
+    batch_id = storage.create_batch("Mix")
+    statuses = [DownloadStatus.COMPLETED, DownloadStatus.FAILED, DownloadStatus.UNAVAILABLE, DownloadStatus.PENDING]
+    tracks = [TrackInfo(title=f"Song {i}", artist="Band", provider_name="YouTube") for i in range(len(statuses))]
+    tasks = queue_mgr.create_tasks(tracks, DownloadOptions(output_dir=str(tmp_path)), batch_id=batch_id, leased=False)
+    for task, status in zip(tasks, statuses):
+        task.status = status
+    storage.save_tasks(tasks)
+
+    batch = storage.find_batch(batch_id)
+    assert (batch.done, batch.failed, batch.unavailable, batch.unfinished) == (1, 1, 1, 1)
+    assert batch.done + batch.failed + batch.unavailable + batch.unfinished == batch.total
+
+    (youtube,) = storage.group_stats(by="provider")
+    assert (youtube.completed, youtube.failed, youtube.unavailable) == (1, 1, 1)
+    assert youtube.failure_rate == 2 / 3
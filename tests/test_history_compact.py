@@ -0,0 +1,48 @@
+"""
+Unit Tests for History Retention, Compaction & the Compressed Payload Codec
+"""
+
+from groovegrab.core.models import DownloadOptions, DownloadStatus, DownloadTask, TrackInfo
+from groovegrab.queue.storage import TaskStorage
+
+
+def make_task(i: int, status: DownloadStatus) -> DownloadTask:
+    return DownloadTask(
+        id=f"task-{i:02d}",
+        track=TrackInfo(title=f"Song {i}", artist="Band", raw_metadata={"formats": [{"url": "x" * 500}] * 20}),
+        options=DownloadOptions(output_dir="/tmp/downloads"),
+        status=status,
+    )
+
+
+def test_prune_applies_age_and_count_policies_to_selected_statuses(tmp_path):
+    storage = TaskStorage(tmp_path / "history.db", compress=False)
+    storage.save_tasks([make_task(i, DownloadStatus.FAILED if i == 1 else DownloadStatus.COMPLETED) for i in range(6)])
+    with storage._get_connection() as conn:
+        conn.execute("UPDATE download_tasks SET created_at = '2026-01-0' || (1 + CAST(substr(id, 6) AS INTEGER))")
+
+    assert storage.prune() == 0
+    assert storage.prune(older_than="2026-01-02", statuses=[DownloadStatus.FAILED]) == 0
+    assert storage.prune(older_than="2026-01-02") == 1  # task-00
+    # Count policy: keep the newest 3; the failed row is protected by the status filter
+    assert storage.prune(keep_last=3, statuses=[DownloadStatus.COMPLETED]) == 1
+    assert [row.id for row in storage.query_rows()] == ["task-05", "task-04", "task-03", "task-01"]
+
+
+def test_compact_slims_finished_payloads_and_switches_codec(tmp_path):
+    db_path = tmp_path / "history.db"
+    storage = TaskStorage(db_path, compress=False, keep_raw_metadata=True)
+    storage.save_tasks([make_task(i, DownloadStatus.COMPLETED) for i in range(40)] + [make_task(99, DownloadStatus.PENDING)])
+
+    compressed = TaskStorage(db_path, compress=True)
+    result = compressed.compact()
+
+    assert result.pruned == 0 and result.slimmed == 40
+    assert result.size_after < result.size_before
+    assert compressed.compact(vacuum=False).slimmed == 0  # already slim and compressed
+    with compressed._get_connection() as conn:
+        assert {row[0] for row in conn.execute("SELECT typeof(task_json) FROM download_tasks")} == {"blob", "text"}
+
+    tasks = {task.id: task for task in storage.list_tasks(100)}  # plain reader decodes both codecs
+    assert tasks["task-00"].track.raw_metadata == {} and tasks["task-00"].track.title == "Song 0"
+    assert tasks["task-99"].track.raw_metadata["formats"]  # unfinished rows keep everything
@@ -0,0 +1,53 @@
+"""
+Unit Tests for Keyset-Paginated History Iteration & Streaming Export
+"""
+
+import csv
+import io
+import json
+
+from groovegrab.cli.queue import export_rows
+from groovegrab.core.models import DownloadOptions, DownloadStatus, DownloadTask, ExportFormat, TrackInfo
+from groovegrab.queue.storage import TaskStorage
+
+
+def fill_history(tmp_path, count):
+    storage = TaskStorage(tmp_path / "history.db")
+    for i in range(count):
+        storage.save_task(DownloadTask(
+            id=f"task-{i:03d}",
+            track=TrackInfo(title=f"Song {i}", artist="Band", provider_name="YouTube" if i % 2 else "Spotify"),
+            options=DownloadOptions(output_dir="/tmp/downloads"),
+            status=DownloadStatus.FAILED if i % 3 == 0 else DownloadStatus.PENDING,
+        ))
+    with storage._get_connection() as conn:
+        # Many rows share a timestamp: the id tiebreaker must keep pages from skipping or repeating rows
+        conn.execute("UPDATE download_tasks SET created_at = '2026-01-0' || (1 + CAST(substr(id, 6) AS INTEGER) % 3)")
+    return storage
+
+
+def test_iter_rows_pages_through_ties_in_keyset_order(tmp_path):
+    storage = fill_history(tmp_path, 25)
+
+    rows = list(storage.iter_rows(page_size=4))
+    keys = [(row.created_at, row.id) for row in rows]
+    assert len(rows) == 25 and keys == sorted(keys, reverse=True)
+
+    youtube_failed = storage.iter_rows(status=DownloadStatus.FAILED, provider="youtube", page_size=2)
+    expected = [row.id for row in rows if row.status == "failed" and row.provider == "YouTube"]
+    assert [row.id for row in youtube_failed] == expected and len(expected) == 4
+
+
+def test_export_streams_jsonl_and_csv(tmp_path):
+    storage = fill_history(tmp_path, 5)
+
+    out = io.StringIO()
+    export_rows(storage.iter_rows(page_size=2), ExportFormat.JSONL, out)
+    records = [json.loads(line) for line in out.getvalue().splitlines()]
+    assert len(records) == 5 and records[0]["title"] and "task_json" not in records[0]
+
+    out = io.StringIO()
+    export_rows(storage.iter_rows(page_size=2), ExportFormat.CSV, out)
+    table = list(csv.DictReader(io.StringIO(out.getvalue())))
+    assert [r["id"] for r in table] == [r["id"] for r in records]
+    assert table[0]["status"] in ("pending", "failed")
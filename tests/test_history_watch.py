@@ -0,0 +1,51 @@
+"""
+Unit Tests for the Incremental History Watcher Behind `queue --watch`
+"""
+
+from groovegrab.core.models import DownloadOptions, DownloadStatus, DownloadTask, TrackInfo
+from groovegrab.queue.storage import HistoryWatcher, TaskStorage
+
+
+def make_task(task_id: str, status: DownloadStatus = DownloadStatus.PENDING) -> DownloadTask:
+    return DownloadTask(
+        id=task_id,
+        track=TrackInfo(title=task_id, artist="Band"),
+        options=DownloadOptions(output_dir="/tmp/downloads"),
+        status=status,
+    )
+
+
+def test_watcher_is_idle_until_another_connection_writes(tmp_path):
+    writer = TaskStorage(tmp_path / "history.db")
+    writer.save_tasks([make_task("a"), make_task("b")])
+    with writer._get_connection() as conn:
+        conn.execute("UPDATE download_tasks SET updated_at = '2026-01-01 00:00:00'")
+
+    watcher = HistoryWatcher(TaskStorage(tmp_path / "history.db"))
+    try:
+        assert {row.id for row in watcher.snapshot()} == {"a", "b"}
+        assert watcher.poll() is None and watcher.poll() is None
+
+        writer.save_task(make_task("b", DownloadStatus.DOWNLOADING))
+        writer.save_task(make_task("c"))
+        changed = watcher.poll()
+        assert {row.id for row in changed} == {"b", "c"}
+        assert next(row for row in changed if row.id == "b").status == "downloading"
+        assert watcher.poll() is None
+    finally:
+        watcher.close()
+
+
+def test_watcher_reports_rows_leaving_the_status_filter(tmp_path):
+    storage = TaskStorage(tmp_path / "history.db")
+    storage.save_task(make_task("a", DownloadStatus.DOWNLOADING))
+    watcher = HistoryWatcher(TaskStorage(tmp_path / "history.db"), status=DownloadStatus.DOWNLOADING)
+    try:
+        (row,) = watcher.snapshot()
+        assert watcher.matches(row)
+
+        storage.save_task(make_task("a", DownloadStatus.COMPLETED))
+        (changed,) = watcher.poll()
+        assert changed.status == "completed" and not watcher.matches(changed)
+    finally:
+        watcher.close()
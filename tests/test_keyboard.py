@@ -0,0 +1,51 @@
+"""
+Unit Tests for the Incremental Escape-Sequence Decoder and Selector Keyboard Reader
+"""
+
+import os
+import selectors
+import time
+
+from groovegrab.player.keyboard import EscapeSequenceDecoder, NonBlockingKeyboard, coalesce_keys
+
+
+def test_decoder_handles_sequences_split_across_reads():
+    decoder = EscapeSequenceDecoder()
+
+    assert decoder.feed(b"q \x1b[") == ["q", "SPACE"]
+    assert decoder.feed(b"C\x1bO") == ["RIGHT"]
+    assert decoder.feed(b"D") == ["LEFT"]
+
+    # Mouse wheel reports (SGR and X10) map to scroll keys, other reports are ignored
+    assert decoder.feed(b"\x1b[<64;10;5M\x1b[<65;10;5M\x1b[<35;1;1m") == ["UP", "DOWN"]
+    assert decoder.feed(b"\x1b[M`!!\x1b[Ma!!") == ["UP", "DOWN"]
+
+    # A standalone ESC never produces a key (so it cannot quit the player)
+    assert decoder.feed(b"\x1b") == []
+    decoder.flush()
+    assert decoder.feed(b"v") == ["v"]
+
+
+def test_held_keys_are_coalesced_per_frame():
+    assert coalesce_keys(["RIGHT"] * 12) == ["RIGHT"]
+    assert coalesce_keys(["RIGHT", "RIGHT", "SPACE", "RIGHT"]) == ["RIGHT", "SPACE", "RIGHT"]
+
+
+def test_wait_keys_wakes_on_input_and_drains_all_bytes():
+    read_fd, write_fd = os.pipe()
+    kbd = NonBlockingKeyboard()
+    kbd.fd = read_fd
+    kbd.selector = selectors.DefaultSelector()
+    kbd.selector.register(read_fd, selectors.EVENT_READ)
+    try:
+        os.write(write_fd, b"\x1b[C" * 20 + b"t")
+        started = time.monotonic()
+        keys = kbd.wait_keys(1.0)
+        assert time.monotonic() - started < 0.5
+        assert keys == ["RIGHT", "t"]
+
+        assert kbd.wait_keys(0.01) == []
+    finally:
+        kbd.__exit__(None, None, None)
+        os.close(read_fd)
+        os.close(write_fd)
@@ -0,0 +1,69 @@
+"""
+Unit Tests for the Lazy, Compact Playlist
+"""
+
+from pathlib import Path
+
+import pytest
+
+from groovegrab.core.models import TrackInfo
+from groovegrab.library.index import LibraryIndex
+from groovegrab.player.playlist import LazyPlaylist
+
+
+def test_playlist_from_paths_builds_items_on_demand():
+    calls = []
+    paths = [Path(f"/music/Artist - Song {i:03d}.mp3") for i in reversed(range(100))]
+    playlist = LazyPlaylist.from_paths(paths)
+    original_resolve = playlist._resolve
+    playlist._resolve = lambda idx: calls.append(idx) or original_resolve(idx)
+
+    assert len(playlist) == 100
+    audio_path, track_info, lrc_path = playlist[3]
+    assert audio_path == Path("/music/Artist - Song 003.mp3")
+    assert (track_info.artist, track_info.title) == ("Artist", "Song 003")
+    assert lrc_path == Path("/music/Artist - Song 003.lrc")
+    playlist[3]
+    assert calls == [3]
+    assert playlist.position_of(Path("/music/Artist - Song 042.mp3")) == 42
+
+
+def test_shuffle_keeps_current_track_and_covers_every_item():
+    playlist = LazyPlaylist.from_paths(Path(f"/music/{i:03d}.mp3") for i in range(50))
+    current = playlist[17][0]
+
+    assert playlist.shuffle(keep_first=17, seed=1) == 0
+    assert playlist[0][0] == current
+    assert sorted(item[0] for item in playlist) == [Path(f"/music/{i:03d}.mp3") for i in range(50)]
+
+    assert playlist.unshuffle(keep=0) == 17
+    assert playlist[17][0] == current
+
+
+def test_playlist_from_library_index(tmp_path):
+    library = tmp_path / "music"
+    library.mkdir()
+    for name in ("B - Two.mp3", "A - One.mp3"):
+        (library / name).write_bytes(b"x")
+    index = LibraryIndex(tmp_path / "library.db", read_tags=False)
+    index.refresh(library)
+
+    playlist = LazyPlaylist.from_index(index, library)
+    assert len(playlist) == 2
+    assert [item[1].title for item in playlist] == ["One", "Two"]
+
+
+def test_item_playlist_grows_in_order_and_while_shuffled():
+    playlist = LazyPlaylist.from_items([])
+    for i in range(3):
+        playlist.append((Path(f"/music/{i}.mp3"), TrackInfo(title=str(i)), None))
+    assert [item[0].name for item in playlist] == ["0.mp3", "1.mp3", "2.mp3"]
+
+    playlist.shuffle(keep_first=1, seed=3)
+    playlist.append((Path("/music/3.mp3"), TrackInfo(title="3"), None))
+    assert len(playlist) == 4
+    assert playlist[0][0].name == "1.mp3"
+    assert playlist[3][0].name == "3.mp3"
+
+    with pytest.raises(TypeError):
+        LazyPlaylist.from_paths([Path("/music/a.mp3")]).append(playlist[0])
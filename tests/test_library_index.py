@@ -0,0 +1,62 @@
+"""
+Unit Tests for the Persistent Local Library Index
+"""
+
+import os
+from pathlib import Path
+
+from groovegrab.library.index import LibraryIndex
+
+
+def _touch(path: Path, data: bytes = b"x"):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(data)
+
+
+def _bump_mtime(path: Path):
+    st = os.stat(path)
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+
+
+def test_index_builds_and_searches_library(tmp_path):
+    library = tmp_path / "music"
+    _touch(library / "Queen" / "Queen - Bohemian Rhapsody.mp3")
+    _touch(library / "Queen" / "Queen - Bohemian Rhapsody.lrc", b"[00:01.00]Is this the real life\n")
+    _touch(library / "Daft Punk - One More Time.flac")
+    _touch(library / "notes.txt")
+
+    index = LibraryIndex(tmp_path / "library.db", read_tags=False)
+    assert index.refresh(library) == 2
+
+    tracks = index.tracks_under(library)
+    assert [(t.artist, t.title) for t in tracks] == [("Daft Punk", "One More Time"), ("Queen", "Bohemian Rhapsody")]
+    assert [t.has_lyrics for t in tracks] == [False, True]
+
+    assert [t.title for t in index.search("bohem")] == ["Bohemian Rhapsody"]
+    assert [t.title for t in index.search("punk one")] == ["One More Time"]
+    # Mid-word substring still matches via the file-name fallback
+    assert [t.title for t in index.search("ore tim")] == ["One More Time"]
+    assert index.search("nothing here") == []
+
+
+def test_refresh_only_touches_changed_folders(tmp_path):
+    library = tmp_path / "music"
+    _touch(library / "a" / "Artist - One.mp3")
+    _touch(library / "b" / "Artist - Two.mp3")
+    index = LibraryIndex(tmp_path / "library.db", read_tags=False)
+    index.refresh(library)
+    assert index.refresh(library) == 0
+
+    _touch(library / "b" / "Artist - Three.mp3")
+    (library / "a" / "Artist - One.mp3").unlink()
+    _bump_mtime(library / "a")
+    _bump_mtime(library / "b")
+    assert index.refresh(library) == 2
+    assert [t.title for t in index.tracks_under(library)] == ["Three", "Two"]
+
+    for child in (library / "b").iterdir():
+        child.unlink()
+    (library / "b").rmdir()
+    _bump_mtime(library)
+    index.refresh(library)
+    assert index.tracks_under(library) == []
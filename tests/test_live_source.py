@@ -0,0 +1,76 @@
+"""
+Unit Tests for the Live PCM Source (FIFO fed by a synthetic generator)
+"""
+
+import os
+import threading
+import time
+
+import numpy as np
+
+from groovegrab.player.live_source import LivePcmSource
+from groovegrab.player.visualizer import SpectrumDataEngine
+
+
+def _feed_sine(fifo_path, freq_hz, seconds, stop: threading.Event, sample_rate=44100):
+    t = np.arange(int(sample_rate * seconds)) / sample_rate
+    mono = (0.5 * 32767 * np.sin(2 * np.pi * freq_hz * t)).astype(np.int16)
+    stereo = np.repeat(mono, 2).tobytes()
+    with open(fifo_path, "wb") as fifo:
+        for start in range(0, len(stereo), 4096):
+            if stop.is_set():
+                break
+            fifo.write(stereo[start:start + 4096])
+
+
+def _wait_for(predicate, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.01)
+    return False
+
+
+def test_fifo_source_tracks_the_real_spectrum(tmp_path):
+    fifo = tmp_path / "visualizer.fifo"
+    os.mkfifo(fifo)
+    source = LivePcmSource(fifo_path=fifo)
+    assert source.start()
+    stop = threading.Event()
+    feeder = threading.Thread(target=_feed_sine, args=(fifo, 1000.0, 1.0, stop), daemon=True)
+    feeder.start()
+    try:
+        assert _wait_for(lambda: source.ring.write_pos >= 44100 // 2)
+        rms, mags = source.magnitudes(2048)
+        assert 0.3 < rms < 0.4
+        # The strongest bin is the generator's tone
+        assert abs(np.argmax(mags) * 44100 / 2048 - 1000.0) < 44100 / 2048
+
+        engine = SpectrumDataEngine(num_bars=32)
+        engine.attach_source(source)
+        bars = engine._compute_real_fft(0.0, 32)
+        assert bars.max() > 0.3
+        peak_freq = 10 ** (np.log10(40.0) + (np.log10(10000.0) - np.log10(40.0)) * (np.argmax(bars) + 0.5) / 32)
+        assert 700.0 < peak_freq < 1400.0
+    finally:
+        stop.set()
+        feeder.join(timeout=2.0)
+        source.stop()
+    assert not source.running
+
+
+def test_unconnected_source_keeps_the_procedural_fallback(tmp_path):
+    fifo = tmp_path / "idle.fifo"
+    os.mkfifo(fifo)
+    source = LivePcmSource(fifo_path=fifo)
+    source.start()
+    try:
+        engine = SpectrumDataEngine(num_bars=16)
+        engine.attach_source(source)
+        assert source.window(0.0, 16) is None and source.magnitudes(2048) is None
+        assert engine.update(1.0, 16).max() > 0.0
+    finally:
+        source.stop()
+    assert not source.running
+    assert LivePcmSource.from_spec("none") is None
@@ -0,0 +1,48 @@
+"""
+Unit Tests for the Parsed Lyrics Cache and Per-Directory .lrc Index
+"""
+
+import os
+
+from groovegrab.player.lyrics_cache import LyricsCache
+
+
+ENHANCED_LRC = "[00:01.00]<00:01.00>Hello <00:01.50>world\n[00:03.00]Second line\n"
+
+
+def test_cache_hits_memory_then_disk_and_keeps_words(tmp_path):
+    lrc = tmp_path / "song.lrc"
+    lrc.write_text(ENHANCED_LRC, encoding="utf-8")
+    cache_dir = tmp_path / "cache"
+
+    cache = LyricsCache(cache_dir=cache_dir)
+    first = cache.load(lrc)
+    assert cache.load(lrc) is first
+    assert len(list(cache_dir.glob("*.json"))) == 1
+
+    # A fresh instance restores the timeline from disk, word tags included
+    restored = LyricsCache(cache_dir=cache_dir).load(lrc)
+    assert [line.text for line in restored] == ["Hello world", "Second line"]
+    assert [(w.word, w.start_sec, w.end_sec) for w in restored[0].words] == [("Hello", 1.0, 1.5), ("world", 1.5, 3.0)]
+
+
+def test_changed_file_is_reparsed(tmp_path):
+    lrc = tmp_path / "song.lrc"
+    lrc.write_text("[00:01.00]Old\n", encoding="utf-8")
+    cache = LyricsCache(cache_dir=tmp_path / "cache")
+    assert cache.load(lrc)[0].text == "Old"
+
+    lrc.write_text("[00:01.00]New text\n", encoding="utf-8")
+    st = os.stat(lrc)
+    os.utime(lrc, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+    assert cache.load(lrc)[0].text == "New text"
+
+
+def test_directory_index_prefers_exact_stem(tmp_path):
+    (tmp_path / "Artist - Song (Live).lrc").write_text("[00:01.00]Live\n", encoding="utf-8")
+    (tmp_path / "artist - song.lrc").write_text("[00:01.00]Studio\n", encoding="utf-8")
+    cache = LyricsCache(cache_dir=tmp_path / "cache")
+
+    candidates = list(cache.find_lrc_candidates(tmp_path / "Artist - Song.mp3"))
+    assert [p.name for p in candidates] == ["artist - song.lrc", "Artist - Song (Live).lrc"]
+    assert list(cache.find_lrc_candidates(tmp_path / "Unrelated.mp3")) == []
@@ -0,0 +1,130 @@
+"""
+Unit Tests for the Shared PCM Ring Buffer and the In-Process PCM Audio Engine
+"""
+
+import subprocess
+import sys
+import threading
+import time
+
+import numpy as np
+
+from groovegrab.player.pcm_engine import FileSink, PcmAudioEngine, PipeSink
+from groovegrab.player.pcm_ring import PcmRing
+
+
+def test_blocking_ring_waits_for_the_consumer_and_keeps_history():
+    ring = PcmRing(capacity_frames=100, channels=2, history_frames=20)
+    frames = np.arange(300, dtype=np.int16).repeat(2).reshape(-1, 2)
+
+    writer = threading.Thread(target=ring.write, args=(frames,), daemon=True)
+    writer.start()
+    time.sleep(0.05)
+    assert ring.write_pos == 100 and writer.is_alive()  # full: the writer sleeps
+
+    consumed = []
+    for _ in range(2):
+        consumed.append(ring.read(64, timeout=1.0))
+        time.sleep(0.05)
+    assert np.array_equal(np.concatenate(consumed), frames[:128])
+    # Room opens up only behind the history the spectrum still needs
+    assert ring.write_pos == 128 - 20 + 100
+
+    window = ring.window_mono(ring.read_pos - 10, 20)
+    np.testing.assert_allclose(window * 32768.0, np.arange(118, 138))
+
+    ring.reset()
+    writer.join(timeout=1.0)
+    assert not writer.is_alive()
+    assert ring.write_pos == 0 and ring.read(10, timeout=0.01).shape == (0, 2)
+
+
+def test_overwriting_ring_keeps_the_latest_frames():
+    ring = PcmRing(capacity_frames=64, channels=1, overwrite=True)
+    for start in range(0, 500, 37):
+        ring.write(np.arange(start, min(start + 37, 500), dtype=np.int16))
+
+    assert ring.write_pos == 500
+    np.testing.assert_allclose(ring.latest_mono(64) * 32768.0, np.arange(436, 500))
+    # Overwritten and future frames read as silence
+    assert not ring.window_mono(0, 10).any()
+    assert not ring.window_mono(500, 10).any()
+
+
+def test_engine_sink_plays_ring_with_volume_and_sample_clock(tmp_path):
+    out = tmp_path / "out.raw"
+    engine = PcmAudioEngine(sink=FileSink(out), sample_rate=1000, channels=2)
+    frames = np.full((2500, 2), 10000, dtype=np.int16)
+    engine.volume = 0.5
+    engine.is_loaded = True
+
+    engine._ensure_sink()
+    engine.ring.write(frames)
+    engine.ring.mark_eof()
+    engine._sink_thread.join(timeout=5.0)
+
+    assert engine.finished and not engine.is_busy()
+    played = np.frombuffer(out.read_bytes(), dtype=np.int16)
+    assert len(played) == frames.size and np.all(played == 5000)
+    assert engine.get_position_sec() == 2.5
+    window = engine.window(2.0, 100)
+    assert window is not None and window.shape == (100,)
+
+
+class SlowPlayerSink(PipeSink):
+    """A PipeSink whose player reads nothing for a while, then copies the audio to a file."""
+
+    def __init__(self, out):
+        super().__init__("cat")
+        self.out = out
+
+    def _command(self):
+        copy = f"shutil.copyfileobj(sys.stdin.buffer, open({str(self.out)!r}, 'wb'))"
+        return [sys.executable, "-c", f"import shutil, sys, time; time.sleep(0.3); {copy}"]
+
+
+def test_pipe_sink_counts_the_pipe_in_its_latency_and_plays_out_the_track_end(tmp_path):
+    out = tmp_path / "out.raw"
+    sink = SlowPlayerSink(out)
+    engine = PcmAudioEngine(sink=sink, sample_rate=1000, channels=2)
+    frames = np.full((3000, 2), 1000, dtype=np.int16)
+    engine.volume = 1.0
+    engine.is_loaded = True
+
+    engine._ensure_sink()
+    engine.ring.write(frames)
+    engine.ring.mark_eof()
+    engine._sink_thread.join(timeout=5.0)
+
+    assert engine.finished
+    assert sink.latency_sec > sink.device_latency_sec
+    assert out.read_bytes() == frames.tobytes()
+
+
+def test_growing_file_decoder_stops_following_once_the_download_completes(tmp_path):
+    audio = tmp_path / "stream.part"
+    audio.write_bytes(b"\0")
+    out = tmp_path / "out.raw"
+    engine = PcmAudioEngine(sink=FileSink(out), sample_rate=1000, channels=2)
+    script = (
+        "import sys, time\n"
+        "import numpy as np\n"
+        "start, follow = int(float(sys.argv[1]) * 1000), sys.argv[2] == '1'\n"
+        "frames = np.arange(start, 1000 if follow else 3000, dtype=np.int16).repeat(2)\n"
+        "sys.stdout.buffer.write(frames.tobytes()); sys.stdout.flush()\n"
+        "time.sleep(30 if follow else 0)\n"  # ffmpeg -follow waiting at the end of the file so far
+    )
+    engine._spawn_decoder = lambda offset, follow: subprocess.Popen(
+        [sys.executable, "-c", script, str(offset), "1" if follow else "0"], stdout=subprocess.PIPE
+    )
+    downloaded = threading.Event()
+
+    started = time.monotonic()
+    assert engine.load_and_play(audio, growing=downloaded)
+    time.sleep(0.3)
+    downloaded.set()
+    engine._sink_thread.join(timeout=10.0)
+
+    assert engine.finished and time.monotonic() - started < 5.0
+    played = np.frombuffer(out.read_bytes(), dtype=np.int16).reshape(-1, 2)[:, 0]
+    np.testing.assert_array_equal(played, (np.arange(3000) * engine.volume).astype(np.int16))
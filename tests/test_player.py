@@ -1,11 +1,12 @@
 """
-Unit Tests for Synced LRC Parser, Typewriter Animator, and TimingChain
+Unit Tests for Synced LRC Parser, Typewriter Animator, TimingChain and LyricTimeline
 """
 
 import numpy as np
-from groovegrab.player.lrc_parser import LrcParser, LrcLine
+from groovegrab.player.lrc_parser import LrcParser, LrcLine, LrcLineRecord
 from groovegrab.player.typewriter import TypewriterAnimator
 from groovegrab.player.timing_chain import TimingChain
+from groovegrab.player.lyric_timeline import LyricTimeline
 
 
 def test_lrc_parsing():
@@ -23,6 +24,31 @@ def test_lrc_parsing():
     assert lines[1].timestamp_sec == 18.50
 
 
+def test_enhanced_lrc_word_timings_and_offset():
+    parser = LrcParser()
+    sample_lrc = """
+[ar:Someone]
+[offset:+500]
+[00:10.00]<00:10.00>Hold <00:10.50>on <00:11.20>tight <00:12.00>
+[00:14.00][00:30.00]<00:14.00>Again <00:14.80>
+"""
+    lines = parser.parse_text(sample_lrc)
+
+    assert [line.timestamp_sec for line in lines] == [10.5, 14.5, 30.5]
+    assert isinstance(lines[0], LrcLineRecord)
+    assert lines[0].text == "Hold on tight"
+    assert [(w.word, w.start_sec, w.end_sec) for w in lines[0].words] == [
+        ("Hold", 10.5, 11.0), ("on", 11.0, 11.7), ("tight", 11.7, 12.5)
+    ]
+    # A repeated timestamp shifts its word timings to that occurrence
+    assert lines[2].words[0].start_sec == 30.5
+
+    models = LrcParser.to_models(lines)
+    assert isinstance(models[0], LrcLine)
+    assert models[0].words[1].word == "on"
+    assert models[0].end_sec == 14.5
+
+
 def test_typewriter_animator():
     animator = TypewriterAnimator()
     line = LrcLine(timestamp_sec=10.0, end_sec=15.0, text="Hello World")
@@ -53,3 +79,25 @@ def test_timing_chain():
     idx, active = tc.find_active_line(lyrics, 5.6)
     assert idx == 0
     assert active.text == "First line"
+
+
+def test_lyric_timeline_cursor_and_couplets():
+    lyrics = [
+        LrcLine(timestamp_sec=2.0, end_sec=4.0, text="One"),
+        LrcLine(timestamp_sec=4.0, end_sec=6.0, text="Two"),
+        LrcLine(timestamp_sec=6.0, end_sec=8.0, text="Three"),
+    ]
+    timeline = LyricTimeline(lyrics)
+
+    assert timeline.active_index(1.0) is None
+    assert [timeline.active_index(t) for t in (2.0, 3.9, 4.0, 7.5)] == [0, 0, 1, 2]
+
+    # Seeking backwards falls back to bisect
+    assert timeline.active_index(2.5) == 0
+    assert timeline.couplets == [(0, 1), (0, 1), (2, None)]
+
+    assert timeline.render_couplet(1.0, "cyan") == " \n "
+    top, bottom = timeline.render_couplet(5.9, "cyan").split("\n")
+    assert "One" in top and "Two" in bottom
+    top, bottom = timeline.render_couplet(7.9, "cyan").split("\n")
+    assert "Three" in top and bottom == " "
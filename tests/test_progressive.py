@@ -0,0 +1,119 @@
+"""
+Unit Tests for Progressive (Stream-and-Play) Downloads, Playlist Sessions and the Growing PCM Buffer
+"""
+
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+
+from groovegrab.core.models import DownloadOptions, TrackInfo
+from groovegrab.player.audio_driver import AudioDriver
+from groovegrab.player.visualizer import GrowingPcmBuffer
+from groovegrab.queue.progressive import STREAM_CHUNK_BYTES, PlaylistDownloadSession, ProgressiveDownload
+from groovegrab.queue.storage import TaskStorage
+from groovegrab.queue.task_queue import TaskQueueManager
+
+
+def test_growing_pcm_buffer_handles_split_samples_and_keeps_old_views():
+    samples = (np.arange(-3000, 3000, dtype=np.int16) * 5).astype(np.int16)
+    raw = samples.tobytes()
+
+    buffer = GrowingPcmBuffer(initial_samples=16)
+    buffer.feed(raw[:101])  # odd byte count: the last half sample waits for the next chunk
+    early = buffer.view()
+    assert len(early) == 50
+    for start in range(101, len(raw), 777):
+        buffer.feed(raw[start:start + 777])
+
+    assert len(buffer) == len(samples)
+    np.testing.assert_allclose(buffer.view(), samples.astype(np.float32) / 32768.0)
+    # Views handed out earlier stay valid after the storage grew
+    np.testing.assert_allclose(early, samples[:50].astype(np.float32) / 32768.0)
+
+
+def test_playback_is_ready_before_the_stream_finishes(tmp_path):
+    payload = os.urandom(STREAM_CHUNK_BYTES * 2 + 12345)
+    gate = threading.Event()
+
+    class RangeHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            start, end = (int(v) for v in self.headers["Range"].split("=")[1].split("-"))
+            if start > 0:
+                gate.wait(10)  # hold everything after the first chunk until the test lets go
+            body = payload[start:end + 1]
+            self.send_response(206)
+            self.send_header("Content-Range", f"bytes {start}-{start + len(body) - 1}/{len(payload)}")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), RangeHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        options = DownloadOptions(output_dir=str(tmp_path / "library"), fetch_lyrics=False, embed_cover=False)
+        session = ProgressiveDownload(
+            TrackInfo(title="Song", artist="Band"),
+            options,
+            queue_manager=TaskQueueManager(storage=TaskStorage(db_path=tmp_path / "history.db")),
+            cache_dir=tmp_path / "streams",
+            stream={"url": f"http://127.0.0.1:{server.server_port}/audio", "ext": "webm", "abr": 128},
+        ).start()
+
+        assert session.wait_ready(timeout=10)
+        assert not session.finished.is_set()
+        assert session.stream_path.name == "Band - Song.webm"
+        buffered = session.stream_path.read_bytes()
+        assert buffered and payload.startswith(buffered)
+
+        gate.set()
+        session.wait_finalized(timeout=30)
+        assert session.finished.is_set() and session.finalized.is_set()
+        assert session.total_bytes == len(payload)
+        assert session.stream_path.read_bytes() == payload
+    finally:
+        gate.set()
+        server.shutdown()
+
+
+def test_playlist_session_appends_tracks_in_playlist_order(tmp_path):
+    library = tmp_path / "library"
+    library.mkdir()
+    tracks = [TrackInfo(title=f"Song {i}", artist="Band") for i in range(3)]
+    for track in tracks:
+        (library / f"Band - {track.title}.mp3").write_bytes(b"\0" * 2048)
+
+    options = DownloadOptions(output_dir=str(library), fetch_lyrics=False, embed_cover=False, concurrent_downloads=4)
+    session = PlaylistDownloadSession(
+        tracks,
+        options,
+        queue_manager=TaskQueueManager(storage=TaskStorage(db_path=tmp_path / "history.db")),
+        stream_first=False,
+    ).start()
+
+    assert session.wait_first(timeout=10)
+    session.wait_finished()
+    assert session.complete.is_set() and session.pending_count() == 0
+    assert [item[1].title for item in session.playlist] == ["Song 0", "Song 1", "Song 2"]
+    assert session.playlist[1][0] == library / "Band - Song 1.mp3"
+
+
+def test_external_player_stops_following_once_the_download_completes(tmp_path):
+    audio = tmp_path / "stream.part"
+    driver = AudioDriver()
+    driver.player_cmd = "ffplay"
+    driver.file_path, driver.growing, driver.is_loaded = audio, threading.Event(), True
+    restarts = []
+    driver._restart_at = lambda pos: restarts.append(driver._source_args())
+
+    assert "-follow" in driver._source_args()
+    assert driver.is_busy() and restarts == []
+
+    driver.growing.set()
+    driver.is_busy()
+    driver.is_busy()
+    assert restarts == [[str(audio)]] and not driver.following
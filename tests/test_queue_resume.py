@@ -0,0 +1,48 @@
+"""
+Unit Tests for Download Batches & Resuming Interrupted Runs
+"""
+
+from groovegrab.core.models import DownloadOptions, DownloadStatus, TrackInfo
+from groovegrab.queue.storage import TaskStorage
+from groovegrab.queue.task_queue import TaskQueueManager
+
+
+def make_batch(tmp_path, statuses):
+    storage = TaskStorage(tmp_path / "history.db")
+    queue_mgr = TaskQueueManager(storage=storage)
+    batch_id = storage.create_batch("Mix", source="https://example.com/playlist")
+    options = DownloadOptions(output_dir=str(tmp_path / "library"), fetch_lyrics=False, embed_cover=False)
+    tracks = [TrackInfo(title=f"Song {i}", artist="Band") for i in range(len(statuses))]
+    tasks = queue_mgr.create_tasks(tracks, options, batch_id=batch_id)
+    for task, status in zip(tasks, statuses):
+        task.status = status
+        storage.save_task(task)
+    return storage, queue_mgr, batch_id
+
+
+def test_batches_count_progress_and_load_unfinished_tasks_in_order(tmp_path):
+    storage, _, batch_id = make_batch(tmp_path, [
+        DownloadStatus.COMPLETED, DownloadStatus.FAILED, DownloadStatus.DOWNLOADING,
+        DownloadStatus.SKIPPED, DownloadStatus.PENDING,
+    ])
+
+    batch = storage.find_batch()
+    assert batch.id == batch_id and storage.find_batch(batch_id[:6]) == batch
+    assert (batch.total, batch.done, batch.failed, batch.unfinished) == (5, 2, 1, 2)
+
+    tasks = storage.load_resumable_tasks(batch_id)
+    assert [t.track.title for t in tasks] == ["Song 1", "Song 2", "Song 4"]
+    assert all(t.batch_id == batch_id for t in tasks)
+
+
+def test_resume_reschedules_only_unfinished_tasks(tmp_path):
+    storage, queue_mgr, batch_id = make_batch(tmp_path, [DownloadStatus.COMPLETED, DownloadStatus.FAILED])
+    library = tmp_path / "library"
+    library.mkdir()
+    (library / "Band - Song 1.mp3").write_bytes(b"\0" * 2048)
+
+    results = queue_mgr.resume_batch(batch_id)
+
+    assert [(t.track.title, t.status) for t in results] == [("Song 1", DownloadStatus.SKIPPED)]
+    assert not storage.find_batch(batch_id).resumable
+    assert storage.find_batch() is None
@@ -0,0 +1,46 @@
+"""
+Unit Tests for the Projection of Provider Payloads in TrackInfo.raw_metadata
+"""
+
+from groovegrab.core.models import DownloadOptions, DownloadStatus, DownloadTask, TrackInfo
+from groovegrab.providers.registry import ProviderRegistry
+from groovegrab.queue.identity import track_keys
+from groovegrab.queue.storage import TaskStorage
+
+INFO = {
+    "id": "dQw4w9WgXcQ",
+    "title": "Rick Astley - Never Gonna Give You Up",
+    "webpage_url": "https://www.youtube.com/watch?v=dQw4w9WgXcQ",
+    "duration": 213,
+    "formats": [{"format_id": str(i), "url": "https://rr1.googlevideo.com/videoplayback?" + "x" * 400} for i in range(20)],
+    "thumbnails": [{"url": "https://i.ytimg.com/vi/dQw4w9WgXcQ/hq.jpg"}],
+}
+
+
+def test_providers_keep_only_the_used_fields_unless_asked(tmp_path):
+    provider = ProviderRegistry(keep_raw_metadata=False).find_provider(INFO["webpage_url"])
+    track = provider._parse_track_info(INFO)
+    assert track.raw_metadata == {"id": "dQw4w9WgXcQ"}
+    assert track.title == "Never Gonna Give You Up" and track.duration == 213
+
+    provider = ProviderRegistry(keep_raw_metadata=True).find_provider(INFO["webpage_url"])
+    assert provider._parse_track_info(INFO).raw_metadata["formats"] == INFO["formats"]
+
+
+def test_history_rows_store_the_projection_and_keep_identity(tmp_path):
+    track = TrackInfo(title="Never Gonna Give You Up", artist="Rick Astley", provider_name="YouTube Music", raw_metadata=INFO)
+    task = DownloadTask(id="task-1", track=track, options=DownloadOptions(output_dir="/music"), status=DownloadStatus.PENDING)
+
+    slim = TaskStorage(tmp_path / "slim.db", compress=False, keep_raw_metadata=False)
+    full = TaskStorage(tmp_path / "full.db", compress=False, keep_raw_metadata=True)
+    for storage in (slim, full):
+        storage.save_task(task)
+
+    def row_bytes(storage):
+        with storage._get_connection() as conn:
+            return conn.execute("SELECT length(task_json) FROM download_tasks").fetchone()[0]
+
+    assert row_bytes(slim) * 10 < row_bytes(full)
+    loaded = slim.get_task("task-1")
+    assert loaded.track.raw_metadata == {"id": "dQw4w9WgXcQ"}
+    assert track_keys(loaded.track) == track_keys(track)
@@ -0,0 +1,44 @@
+"""
+Headless Render Benchmarks: every visualizer mode and theme, plus full player screens at several terminal sizes.
+Fails when a case gets markedly slower or emits more bytes per frame than tests/data/render_baseline.json.
+Refresh the baseline with `groovegrab bench render ... --save-baseline tests/data/render_baseline.json`
+using the same options as below.
+"""
+
+from pathlib import Path
+
+from groovegrab.bench.render import find_regressions, load_baseline, run_render_bench
+from groovegrab.player.themes import THEME_ORDER
+from groovegrab.player.visualizer import VISUALIZER_MODES
+
+BASELINE_PATH = Path(__file__).parent / "data" / "render_baseline.json"
+FRAMES = 5
+WARMUP = 1
+
+
+def test_visualizer_render_every_mode_and_theme_against_baseline():
+    results = run_render_bench(
+        targets=("visualizer",), sizes=[(60, 16)], frames=FRAMES, warmup=WARMUP, track_alloc=False
+    )
+    assert {(r.mode, r.theme) for r in results} == {(m.value, t) for m in VISUALIZER_MODES for t in THEME_ORDER}
+    assert all(r.output_bytes > 0 for r in results)
+    assert find_regressions(results, load_baseline(BASELINE_PATH)) == []
+
+
+def test_player_screen_render_sizes_against_baseline():
+    results = run_render_bench(
+        targets=("screen",), themes=["cava"], sizes=[(80, 24), (120, 40)], frames=FRAMES, warmup=WARMUP, track_alloc=False
+    )
+    baseline = load_baseline(BASELINE_PATH)
+    assert all(r.key in baseline for r in results)
+    assert find_regressions(results, baseline) == []
+
+
+def test_find_regressions_flags_slower_and_larger_frames():
+    baseline = {r.key: r for r in run_render_bench(targets=("visualizer",), themes=["cava"], sizes=[(40, 8)], frames=2, warmup=0, track_alloc=False)}
+    slower = [r.model_copy(update={"p50_ms": r.p50_ms * 10 + 50.0}) for r in baseline.values()]
+    larger = [r.model_copy(update={"output_bytes": r.output_bytes * 2}) for r in baseline.values()]
+
+    assert find_regressions(list(baseline.values()), baseline) == []
+    assert len(find_regressions(slower, baseline)) == len(slower) + 1
+    assert len(find_regressions(larger, baseline)) == len(larger)
@@ -1,7 +1,8 @@
+import sqlite3
 from pathlib import Path
 
 from groovegrab.core.models import DownloadOptions, DownloadStatus, DownloadTask, TrackInfo
-from groovegrab.queue.storage import TaskStorage
+from groovegrab.queue.storage import SCHEMA_VERSION, TaskStorage, since_timestamp
 
 
 def make_task(task_id: str = "task-1") -> DownloadTask:
@@ -35,3 +36,54 @@ def test_storage_ignores_corrupt_history_rows(tmp_path: Path):
 
     assert storage.list_tasks() == []
     assert storage.list_tasks(0) == []
+
+
+def test_storage_migrates_legacy_database_and_backfills_columns(tmp_path: Path):
+    db_path = tmp_path / "groovegrab.db"
+    conn = sqlite3.connect(db_path)
+    conn.execute("""
+        CREATE TABLE download_tasks (
+            id TEXT PRIMARY KEY, title TEXT NOT NULL, artist TEXT NOT NULL, provider TEXT NOT NULL,
+            status TEXT NOT NULL, output_path TEXT, error_message TEXT,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP, task_json TEXT NOT NULL
+        )
+    """)
+    task = make_task("legacy")
+    task.track.webpage_url = "https://example.com/watch?v=1"
+    task.status = DownloadStatus.COMPLETED
+    conn.execute(
+        "INSERT INTO download_tasks (id, title, artist, provider, status, task_json) VALUES (?, ?, ?, ?, ?, ?)",
+        (task.id, "Track", "Artist", "Test", "completed", task.model_dump_json()),
+    )
+    conn.commit()
+    conn.close()
+
+    storage = TaskStorage(db_path)
+    with storage._get_connection() as conn:
+        assert conn.execute("PRAGMA user_version").fetchone()[0] == SCHEMA_VERSION
+
+    (row,) = storage.query_rows()
+    assert row.webpage_url == "https://example.com/watch?v=1"
+    assert row.audio_format == "mp3"
+    assert row.finished_at == row.created_at
+    # Reopening an up-to-date database is a no-op
+    assert TaskStorage(db_path).query_rows() == [row]
+
+
+def test_storage_filters_rows_in_sql_without_decoding_json(tmp_path: Path):
+    storage = TaskStorage(tmp_path / "groovegrab.db")
+    done = make_task("done")
+    done.status = DownloadStatus.COMPLETED
+    storage.save_task(done)
+    other = make_task("other")
+    other.track.provider_name = "Elsewhere"
+    storage.save_task(other)
+    with storage._get_connection() as conn:
+        conn.execute("UPDATE download_tasks SET task_json = 'not json'")
+        conn.execute("UPDATE download_tasks SET created_at = '2020-01-01 00:00:00' WHERE id = 'other'")
+
+    assert [r.id for r in storage.query_rows(status=DownloadStatus.COMPLETED)] == ["done"]
+    assert [r.id for r in storage.query_rows(provider="elsewhere")] == ["other"]
+    assert [r.id for r in storage.query_rows(since=since_timestamp("7d"))] == ["done"]
+    assert storage.query_rows(status=DownloadStatus.COMPLETED)[0].finished_at is not None
+    assert storage.get_task("do") is None  # unreadable JSON
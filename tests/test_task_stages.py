@@ -0,0 +1,61 @@
+"""
+Unit Tests for Per-Stage Task Timings & History Stats
+"""
+
+from groovegrab.core.models import DownloadOptions, DownloadStatus, DownloadTask, Stage, StageTiming, TrackInfo
+from groovegrab.queue.storage import TaskStorage
+from groovegrab.queue.task_queue import TaskQueueManager
+
+
+def timed_task(i: int, provider: str, status: DownloadStatus, download_ms: float) -> DownloadTask:
+    return DownloadTask(
+        id=f"task-{i:02d}",
+        track=TrackInfo(title=f"Song {i}", artist="Band", provider_name=provider),
+        options=DownloadOptions(output_dir="/tmp/downloads"),
+        status=status,
+        stages=[
+            StageTiming(stage=Stage.EXTRACT, start_ms=0, end_ms=100),
+            StageTiming(stage=Stage.DOWNLOAD, start_ms=100, end_ms=100 + download_ms, bytes=1000,
+                        ok=status != DownloadStatus.FAILED),
+        ],
+    )
+
+
+def test_stats_aggregate_percentiles_throughput_and_failure_rates(tmp_path):
+    storage = TaskStorage(tmp_path / "history.db")
+    storage.save_tasks(
+        [timed_task(i, "YouTube", DownloadStatus.COMPLETED, download_ms=100 * (i + 1)) for i in range(19)]
+        + [timed_task(19, "YouTube", DownloadStatus.FAILED, download_ms=5000)]
+        + [timed_task(20, "Spotify", DownloadStatus.COMPLETED, download_ms=1000)]
+    )
+
+    stages = {row.stage: row for row in storage.stage_stats(provider="youtube")}
+    assert list(stages) == ["extract", "download"]
+    download = stages["download"]
+    assert (download.count, download.failed, download.p50_ms, download.p95_ms) == (20, 1, 1000, 1900)
+    assert download.bytes == 20_000
+
+    providers = {row.key: row for row in storage.group_stats(by="provider")}
+    assert providers["YouTube"].failure_rate == 1 / 20 and providers["Spotify"].failure_rate == 0
+    assert providers["Spotify"].p50_ms == 1100 and providers["Spotify"].download_bytes_per_sec == 1000
+    (mp3,) = storage.group_stats(by="audio_format")
+    assert mp3.key == "mp3" and mp3.tasks == 21
+
+
+def test_skip_check_is_timed_and_rerun_replaces_old_timings(tmp_path):
+    library = tmp_path / "library"
+    library.mkdir()
+    (library / "Band - Song.mp3").write_bytes(b"\0" * 2048)
+    storage = TaskStorage(tmp_path / "history.db")
+    queue_mgr = TaskQueueManager(storage=storage)
+    options = DownloadOptions(output_dir=str(library), fetch_lyrics=False, embed_cover=False)
+
+    (task,) = queue_mgr.create_tasks([TrackInfo(title="Song", artist="Band")], options)
+    task.stages = [StageTiming(stage=Stage.DOWNLOAD, start_ms=0, end_ms=1)]
+    storage.save_task(task)
+    queue_mgr.run_task(task)
+
+    stored = storage.get_task(task.id)
+    assert stored.status == DownloadStatus.SKIPPED
+    assert [timing.stage for timing in stored.stages] == [Stage.SKIP_CHECK]
+    assert stored.stages[0].end_ms >= stored.stages[0].start_ms
@@ -0,0 +1,48 @@
+"""
+Unit Tests for Canonical Track Keys & the Global Downloaded-Track Index
+"""
+
+from groovegrab.core.models import DownloadOptions, DownloadStatus, DownloadTask, TrackInfo
+from groovegrab.queue.identity import track_keys
+from groovegrab.queue.storage import TaskStorage
+from groovegrab.queue.task_queue import TaskQueueManager
+
+
+def test_track_keys_ignore_upload_decorations_but_not_versions():
+    plain = TrackInfo(title="Café del Mar", artist="Energy 52")
+    decorated = TrackInfo(
+        title="Cafe Del Mar (Official Video) feat. Someone", artist="Energy 52 & Friends",
+        webpage_url="https://www.youtube.com/watch?v=dQw4w9WgXcQ&list=PL123",
+        provider_name="YouTube Music", raw_metadata={"id": "dQw4w9WgXcQ"},
+    )
+    remix = TrackInfo(title="Café del Mar (Three 'N One Remix)", artist="Energy 52")
+
+    assert track_keys(plain) == ["meta:energy 52|cafe del mar"]
+    assert track_keys(decorated) == ["youtube_music:dQw4w9WgXcQ", "youtube:dQw4w9WgXcQ", "meta:energy 52|cafe del mar"]
+    assert track_keys(remix) == ["meta:energy 52|cafe del mar three n one remix"]
+
+
+def test_index_skips_the_same_song_from_another_playlist_folder(tmp_path):
+    storage = TaskStorage(tmp_path / "history.db")
+    first_folder = tmp_path / "Road Trip"
+    first_folder.mkdir()
+    audio = first_folder / "Energy 52 - Café del Mar.mp3"
+    audio.write_bytes(b"\0" * 4096)
+    storage.save_task(DownloadTask(
+        id="done", track=TrackInfo(title="Café del Mar", artist="Energy 52", duration=230),
+        options=DownloadOptions(output_dir=str(first_folder)), status=DownloadStatus.COMPLETED,
+        output_path=str(audio),
+    ))
+
+    queue_mgr = TaskQueueManager(storage=storage)
+    options = DownloadOptions(output_dir=str(tmp_path / "Chill Mix"), fetch_lyrics=False, embed_cover=False)
+    (task,) = queue_mgr.create_tasks([TrackInfo(title="Cafe Del Mar (Official Audio)", artist="ENERGY 52", duration=232)], options)
+    task = queue_mgr.run_task(task)
+
+    assert task.status == DownloadStatus.SKIPPED and task.output_path == str(audio)
+    assert storage.find_indexed_track(TrackInfo(title="Café del Mar", artist="Energy 52", duration=400)) is None
+
+    audio.unlink()
+    assert storage.find_indexed_track(TrackInfo(title="Café del Mar", artist="Energy 52")) is None
+    with storage._get_connection() as conn:
+        assert conn.execute("SELECT COUNT(*) FROM track_index").fetchone()[0] == 0
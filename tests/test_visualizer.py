@@ -4,6 +4,7 @@ Unit Tests for CAVA Audio Spectrum Visualizer & Themes
 
 import numpy as np
 from groovegrab.player.visualizer import AudioSpectrumVisualizer, VisualizerMode, SpectrumDataEngine, next_visualizer_mode
+from groovegrab.player.particles import ParticleSystem
 from groovegrab.player.themes import get_theme, next_theme_name, Theme
 
 
@@ -60,3 +61,59 @@ def test_visualizer_render_modes():
         assert rendered is not None
         assert len(rendered) > 0
         assert "\n" in rendered
+
+
+def test_waveform_uses_pcm_min_max_per_column():
+    viz = AudioSpectrumVisualizer(num_bars=32)
+    pcm = np.zeros(22050 * 2, dtype=np.float32)
+    pcm[22050 + 5] = 0.9  # single-sample transient right after the 1.0s mark
+    viz.engine.pcm_data = pcm
+    viz.engine.audio_loaded = True
+
+    rendered = viz.render(current_time_sec=1.0, width=40, height=9, mode=VisualizerMode.WAVE)
+    rows = rendered.plain.split("\n")
+
+    assert len(rows) == 9
+    assert all(len(row) == 40 for row in rows)
+    # The transient survives decimation: exactly one column reaches the top row
+    assert rows[0].count(" ") == 39
+    # Silence elsewhere is a flat trace on the center row
+    assert rows[4].count("━") == 39
+
+
+def test_particle_system_respects_capacity_and_culls():
+    system = ParticleSystem(capacity=512, seed=7)
+    energies = np.full(32, 0.7, dtype=np.float32)
+
+    for _ in range(60):
+        system.step(energies, dt=0.033, num_colors=5)
+        assert 0 < system.count <= 512
+    alive = system.count
+    assert np.all(system.life[:alive] > 0.0)
+    assert np.all((system.pos_y[:alive] >= 0.0) & (system.pos_y[:alive] < 1.0))
+
+    codes, colors = system.rasterize(width=50, height=12)
+    assert codes.shape == colors.shape == (12, 50)
+    assert np.count_nonzero(colors >= 0) > 0
+    assert colors.max() <= 4
+
+    # Without energy nothing spawns and every particle eventually expires
+    for _ in range(120):
+        system.step(np.zeros(32, dtype=np.float32), dt=0.05, num_colors=5)
+    assert system.count == 0
+
+
+def test_theme_tables_are_cached_and_drive_row_styles():
+    from groovegrab.player.themes import get_theme_tables
+
+    theme = get_theme("fire")
+    tables = get_theme_tables(theme, 12)
+    assert get_theme_tables(theme, 12) is tables
+    assert tables.row_colors == [theme.get_row_color(row, 12) for row in range(12)]
+    # Truecolor gradient runs from the first to the last theme stop
+    assert tables.gradient_styles[0].color.get_truecolor() == tables.palette_styles[0].color.get_truecolor()
+    assert tables.gradient_styles[-1].color.get_truecolor() == tables.palette_styles[-1].color.get_truecolor()
+
+    viz = AudioSpectrumVisualizer(num_bars=32)
+    rendered = viz.render(current_time_sec=5.0, width=60, height=12, mode=VisualizerMode.BARS, theme_name="fire")
+    assert [span.style for span in rendered.spans] == tables.row_styles[::-1]
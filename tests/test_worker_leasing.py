@@ -0,0 +1,135 @@
+"""
+Unit Tests for Multi-Process Job Leasing on the Task Queue
+"""
+
+import threading
+import time
+
+from groovegrab.core.models import DownloadOptions, DownloadStatus, TrackInfo
+from groovegrab.queue.storage import MAX_CLAIM_ATTEMPTS, TaskStorage
+from groovegrab.queue.task_queue import TaskQueueManager
+
+
+def enqueue(storage, tmp_path, titles, batch_title="Mix"):
+    batch_id = storage.create_batch(batch_title, source="https://example.com/playlist")
+    options = DownloadOptions(output_dir=str(tmp_path / "library"), fetch_lyrics=False, embed_cover=False)
+    tracks = [TrackInfo(title=title, artist="Band") for title in titles]
+    return batch_id, TaskQueueManager(storage=storage).create_tasks(tracks, options, batch_id=batch_id, leased=False)
+
+
+def test_concurrent_claims_never_hand_out_a_task_twice(tmp_path):
+    storage = TaskStorage(tmp_path / "history.db")
+    _, tasks = enqueue(storage, tmp_path, [f"Song {i}" for i in range(40)])
+    claimed = {}
+
+    def claim_all(owner):
+        claimed[owner] = []
+        while True:
+            batch = storage.claim_tasks(owner, limit=3)
+            if not batch:
+                return
+            claimed[owner] += [task.id for task in batch]
+
+    threads = [threading.Thread(target=claim_all, args=(f"worker-{i}",)) for i in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    ids = [task_id for owned in claimed.values() for task_id in owned]
+    assert sorted(ids) == sorted(task.id for task in tasks)
+
+
+def test_expired_leases_are_reclaimed_and_heartbeats_keep_them(tmp_path):
+    storage = TaskStorage(tmp_path / "history.db")
+    enqueue(storage, tmp_path, ["Song 0", "Song 1"])
+
+    assert len(storage.claim_tasks("alive", limit=1, lease_sec=0.2)) == 1
+    assert len(storage.claim_tasks("crashed", limit=1, lease_sec=0.2)) == 1
+    assert storage.claim_tasks("other", limit=5) == []
+
+    time.sleep(0.1)
+    assert storage.heartbeat("alive", lease_sec=30) == 1
+    time.sleep(0.2)
+    reclaimed = storage.claim_tasks("other", limit=5)
+    assert [task.track.title for task in reclaimed] == ["Song 1"]
+
+    # Finishing a task releases its lease; releasing hands unfinished ones back
+    reclaimed[0].status = DownloadStatus.COMPLETED
+    storage.save_task(reclaimed[0])
+    assert storage.heartbeat("other") == 0
+    assert storage.release_leases("alive") == 1
+    assert storage.count_unfinished() == 1
+
+
+def test_overlapping_batches_download_a_shared_track_once(tmp_path):
+    storage = TaskStorage(tmp_path / "history.db")
+    first, _ = enqueue(storage, tmp_path, ["Shared", "Only A"], "A")
+    second, _ = enqueue(storage, tmp_path, ["Shared", "Only B"], "B")
+
+    # The second batch's copy waits while the first batch's copy is unfinished
+    held = storage.claim_tasks("worker-a", limit=1, batch_id=first)
+    assert [task.track.title for task in held] == ["Shared"]
+    assert [task.track.title for task in storage.claim_tasks("worker-b", limit=5, batch_id=second)] == ["Only B"]
+
+    # Once downloaded, it is claimable and skipped through the track index
+    library = tmp_path / "library"
+    library.mkdir()
+    for title in ("Shared", "Only B"):
+        (library / f"Band - {title}.mp3").write_bytes(b"\0" * 2048)
+    held[0].status = DownloadStatus.COMPLETED
+    held[0].output_path = str(library / "Band - Shared.mp3")
+    storage.save_task(held[0])
+    storage.release_leases("worker-b")
+
+    results = TaskQueueManager(storage=storage).drain(2, batch_id=second)
+    assert sorted((t.track.title, t.status) for t in results) == [
+        ("Only B", DownloadStatus.SKIPPED), ("Shared", DownloadStatus.SKIPPED),
+    ]
+    assert storage.count_unfinished(second) == 0
+
+
+def test_abandoned_copy_in_another_batch_does_not_block_a_scoped_drain(tmp_path):
+    storage = TaskStorage(tmp_path / "history.db")
+    enqueue(storage, tmp_path, ["Shared"], "Interrupted")  # never claimed again
+    second, _ = enqueue(storage, tmp_path, ["Shared", "Only B"], "B")
+
+    # One copy per key per claim, even with no batch scope
+    assert [task.track.title for task in storage.claim_tasks("probe", limit=5)] == ["Shared", "Only B"]
+    assert storage.release_leases("probe") == 2
+
+    library = tmp_path / "library"
+    library.mkdir()
+    for title in ("Shared", "Only B"):
+        (library / f"Band - {title}.mp3").write_bytes(b"\0" * 2048)
+
+    results = TaskQueueManager(storage=storage).drain(2, batch_id=second, poll_interval=0.05)
+    assert sorted(t.track.title for t in results) == ["Only B", "Shared"]
+    assert storage.count_unfinished(second) == 0
+
+
+def test_lease_keeper_renews_leases_taken_after_it_went_idle(tmp_path):
+    storage = TaskStorage(tmp_path / "history.db")
+    queue_mgr = TaskQueueManager(storage=storage, lease_sec=0.3)
+    options = DownloadOptions(output_dir=str(tmp_path / "library"))
+
+    first = queue_mgr.create_tasks([TrackInfo(title="Song 0", artist="Band")], options)[0]
+    first.status = DownloadStatus.COMPLETED
+    storage.save_task(first)
+    time.sleep(0.25)  # the keeper finds nothing to renew and exits
+
+    queue_mgr.create_tasks([TrackInfo(title="Song 1", artist="Band")], options)
+    time.sleep(0.6)  # two lease lengths: only a running keeper keeps the task away from others
+    assert storage.claim_tasks("other", limit=5) == []
+
+
+def test_gracefully_released_claims_do_not_use_up_attempts(tmp_path):
+    storage = TaskStorage(tmp_path / "history.db")
+    batch_id, (task,) = enqueue(storage, tmp_path, ["Song"])
+
+    for run in range(MAX_CLAIM_ATTEMPTS * 2):
+        assert [t.id for t in storage.claim_tasks(f"worker-{run}", limit=1)] == [task.id]
+        assert storage.release_leases(f"worker-{run}") == 1
+
+    assert storage.count_unfinished(batch_id) == 1
+    assert storage.get_task(task.id).status == DownloadStatus.PENDING